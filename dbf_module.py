@@ -3,10 +3,11 @@ Python implementation of the Pascal DBF.PAS module.
 This module provides functionality for working with dBase (.DBF) files.
 """
 
+import mmap
 import os
 import struct
 from dataclasses import dataclass
-from typing import List, Dict, Any, Optional, Union, BinaryIO, Tuple
+from typing import List, Dict, Any, Optional, Union, BinaryIO, Tuple, Iterator
 
 
 # Constants
@@ -18,6 +19,9 @@ DBF_LANG_WESTERN_EUROPE = 0x02
 DBF_LANG_JAPAN = 0x7B
 DBF_MEMO_BLOCK_SIZE = 512
 
+# Raw file descriptors need binary mode on DOS/Windows
+_O_BINARY = getattr(os, 'O_BINARY', 0)
+
 
 # Data structures
 @dataclass
@@ -56,6 +60,7 @@ class DBFFile:
         self.file = None
         self.header = DBFHeader()
         self.is_open = False
+        self.row_packer = None  # Generated record packer, built on first row write
 
 
 # Helper functions
@@ -239,12 +244,15 @@ def dbf_memo_create(filename: str) -> None:
 
 
 # Main DBF functions
-def dbf_file_open(filename: str) -> DBFFile:
+def dbf_file_open(filename: str, use_mmap: bool = False) -> DBFFile:
     """
     Open an existing DBF file.
     
     Args:
         filename: The path to the DBF file (with or without extension)
+        use_mmap: Map the file read-only instead of opening it for
+                  read/write. Seeks and row reads then come straight from
+                  the mapping without a syscall each; writes are not allowed.
         
     Returns:
         A DBFFile object representing the opened file
@@ -257,8 +265,13 @@ def dbf_file_open(filename: str) -> DBFFile:
     dbf = DBFFile()
     
     try:
-        # Open the file for reading and writing
-        dbf.file = open(filename, "rb+")
+        if use_mmap:
+            # The mapping keeps its own handle, so the file can be closed
+            with open(filename, "rb") as f:
+                dbf.file = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            # Open the file for reading and writing
+            dbf.file = open(filename, "rb+")
         
         # Read the header
         dbf.header = read_dbf_header(dbf.file)
@@ -328,13 +341,83 @@ def dbf_file_close(dbf: DBFFile) -> None:
         dbf.is_open = False
 
 
+def _build_record_struct(header: DBFHeader) -> struct.Struct:
+    """
+    Build the fixed-width record layout for a header.
+    
+    One 's' item for the delete flag followed by one per field, so a whole
+    record is packed with a single call instead of per-field byte copies.
+    """
+    fmt = '<1s' + ''.join(f"{field.length}s" for field in header.fields[:header.field_count])
+    return struct.Struct(fmt)
+
+
+def _format_int_field(value: int, length: int, name: str) -> bytes:
+    """
+    Format an int for an N or M field, right-justified to the field length.
+    
+    Raises ValueError for bools and for numbers wider than the field
+    (truncating would store a different number).
+    """
+    if isinstance(value, bool):
+        raise ValueError(f"Field {name}: bool value {value!r} is not a number")
+    formatted = b'%*d' % (length, value)
+    if len(formatted) > length:
+        raise ValueError(f"Field {name}: {value} does not fit in {length} characters")
+    return formatted
+
+
+def _build_row_packer(header: DBFHeader):
+    """
+    Generate a row packer specialised to a header's field layout.
+    
+    Field positions and lengths are spliced into the generated source as
+    constants, so packing a row is one expression per field with no loop
+    over header.fields. String values are truncated or space-padded;
+    in N and M fields, integer values (e.g. numbers or memo block numbers)
+    are formatted right-justified straight to bytes.
+    """
+    lines = ['def pack_row(values):', '    count = len(values)']
+    args = ['b" "']  # Delete flag (space = not deleted)
+    for i, field in enumerate(header.fields[:header.field_count], 1):
+        n = field.length
+        lines.append(f'    v = values[{i}] if count > {i} else ""')
+        if field.field_type.upper() in ('N', 'M'):
+            lines.append(f'    f{i} = format_int(v, {n}, {field.name!r}) if isinstance(v, int) '
+                         f'else v[:{n}].ljust({n}).encode("latin-1")')
+        else:
+            lines.append(f'    f{i} = v[:{n}].ljust({n}).encode("latin-1")')
+        args.append(f'f{i}')
+    lines.append(f'    return record_pack({", ".join(args)})')
+    
+    namespace = {'record_pack': _build_record_struct(header).pack,
+                 'format_int': _format_int_field}
+    exec('\n'.join(lines), namespace)
+    return namespace['pack_row']
+
+
+def _pack_row(dbf: DBFFile, values: list) -> bytes:
+    """
+    Pack a values list (1-indexed, values[0] is ignored) into a record.
+    
+    The packer is generated from the header on first use and cached on
+    the DBFFile.
+    """
+    if dbf.row_packer is None:
+        dbf.row_packer = _build_row_packer(dbf.header)
+    
+    return dbf.row_packer(values)
+
+
 def dbf_file_append_row(dbf: DBFFile, values: list) -> None:
     """
     Append a row to the DBF file.
     
     Args:
         dbf: The DBF file object
-        values: List of field values as strings (1-indexed, so values[0] is ignored)
+        values: List of field values (1-indexed, so values[0] is ignored).
+                Strings are padded; ints in N/M fields are right-justified
+                (ValueError if too wide for the field, or a bool).
     """
     if not dbf or not dbf.is_open or not dbf.file:
         return
@@ -348,29 +431,7 @@ def dbf_file_append_row(dbf: DBFFile, values: list) -> None:
         dbf.file.seek(file_size - 1)
     
     # Build the row buffer
-    row_buffer = bytearray(dbf.header.record_size)
-    
-    # First byte is delete flag (space = not deleted)
-    row_buffer[0] = ord(' ')
-    
-    # Fill in each field
-    for i in range(1, dbf.header.field_count + 1):
-        field = dbf.header.fields[i - 1]
-        value = values[i] if i < len(values) else ''
-        
-        # Get field offset and length
-        offset = field.offset
-        length = field.length
-        
-        # Truncate or pad value to field length
-        if len(value) > length:
-            value = value[:length]
-        else:
-            value = value.ljust(length, ' ')
-        
-        # Write value to buffer
-        for j in range(length):
-            row_buffer[offset + j] = ord(value[j])
+    row_buffer = _pack_row(dbf, values)
     
     # Write the row
     dbf.file.write(row_buffer)
@@ -391,6 +452,41 @@ def dbf_file_append_row(dbf: DBFFile, values: list) -> None:
     dbf.file.flush()
 
 
+def dbf_file_append_rows(dbf: DBFFile, rows: list) -> None:
+    """
+    Append several rows to the DBF file with a single write.
+    
+    All records are packed into one buffer, written together with the EOF
+    marker, and the header record count is updated once at the end.
+    
+    Args:
+        dbf: The DBF file object
+        rows: List of values lists, each as for dbf_file_append_row
+    """
+    if not dbf or not dbf.is_open or not dbf.file or not rows:
+        return
+    
+    # Seek to end of file (before EOF marker)
+    dbf.file.seek(0, 2)  # Seek to end
+    file_size = dbf.file.tell()
+    
+    # Back up 1 byte to overwrite the EOF marker
+    if file_size > 0:
+        dbf.file.seek(file_size - 1)
+    
+    # Build all rows plus the EOF marker, then write them at once
+    buf = b''.join([_pack_row(dbf, values) for values in rows]) + b'\x1A'
+    dbf.file.write(buf)
+    
+    # Update record count in header
+    dbf.header.record_count += len(rows)
+    dbf.file.seek(4)
+    dbf.file.write(struct.pack("<L", dbf.header.record_count))
+    
+    # Flush to disk
+    dbf.file.flush()
+
+
 def dbf_file_read_row(dbf: DBFFile) -> list:
     """
     Read a row from the current position in the DBF file.
@@ -410,6 +506,20 @@ def dbf_file_read_row(dbf: DBFFile) -> list:
     if len(row_data) < dbf.header.record_size:
         return []
     
+    return _parse_row(dbf, row_data)
+
+
+def _parse_row(dbf: DBFFile, row_data) -> list:
+    """
+    Split one raw record into its field strings.
+    
+    Args:
+        dbf: The DBF file object
+        row_data: Raw record bytes (record_size long)
+        
+    Returns:
+        List of field values as strings (1-indexed, so result[0] is delete flag)
+    """
     # Parse fields
     result = [''] * (dbf.header.field_count + 1)
     
@@ -431,6 +541,49 @@ def dbf_file_read_row(dbf: DBFFile) -> list:
     return result
 
 
+def dbf_file_iter_rows(dbf: DBFFile, raw: bool = False) -> Iterator:
+    """
+    Iterate over all rows from the first one in a single forward scan.
+    
+    Rows are read in chunks of about 4KB instead of one seek and read per
+    row. Each row is returned in the same form as dbf_file_read_row, or as
+    the undecoded record when raw is set.
+    
+    Args:
+        dbf: The DBF file object
+        raw: Yield raw record memoryviews (for dbf_file_get_field_raw)
+        
+    Yields:
+        List of field values as strings (1-indexed, so row[0] is delete flag),
+        or a memoryview of the record bytes when raw is set
+    """
+    if not dbf or not dbf.is_open or not dbf.file:
+        return
+    
+    record_size = dbf.header.record_size
+    remaining = dbf_file_get_actual_row_count(dbf)
+    rows_per_chunk = max(1, 4096 // record_size)
+    
+    dbf_file_seek_to_first_row(dbf)
+    while remaining > 0:
+        count = min(rows_per_chunk, remaining)
+        chunk = dbf.file.read(record_size * count)
+        
+        # Stop on a short read (truncated file)
+        count = len(chunk) // record_size
+        if count == 0:
+            return
+        
+        if raw:
+            view = memoryview(chunk)
+            for start in range(0, count * record_size, record_size):
+                yield view[start:start + record_size]
+        else:
+            for start in range(0, count * record_size, record_size):
+                yield _parse_row(dbf, chunk[start:start + record_size])
+        remaining -= count
+
+
 def dbf_file_seek_to_row(dbf: DBFFile, row_index: int) -> None:
     """
     Seek to a specific row in the DBF file.
@@ -503,35 +656,15 @@ def dbf_file_write_row(dbf: DBFFile, values: list) -> None:
     
     Args:
         dbf: The DBF file object
-        values: List of field values as strings (1-indexed, so values[0] is ignored)
+        values: List of field values (1-indexed, so values[0] is ignored).
+                Strings are padded; ints in N/M fields are right-justified
+                (ValueError if too wide for the field, or a bool).
     """
     if not dbf or not dbf.is_open or not dbf.file:
         return
     
     # Build the row buffer
-    row_buffer = bytearray(dbf.header.record_size)
-    
-    # First byte is delete flag (space = not deleted)
-    row_buffer[0] = ord(' ')
-    
-    # Fill in each field
-    for i in range(1, dbf.header.field_count + 1):
-        field = dbf.header.fields[i - 1]
-        value = values[i] if i < len(values) else ''
-        
-        # Get field offset and length
-        offset = field.offset
-        length = field.length
-        
-        # Truncate or pad value to field length
-        if len(value) > length:
-            value = value[:length]
-        else:
-            value = value.ljust(length, ' ')
-        
-        # Write value to buffer
-        for j in range(length):
-            row_buffer[offset + j] = ord(value[j])
+    row_buffer = _pack_row(dbf, values)
     
     # Write the row at current position
     dbf.file.write(row_buffer)
@@ -558,6 +691,25 @@ def dbf_file_get_field_str(row: list, dbf: DBFFile, field_index: int) -> str:
     return row[field_index]
 
 
+def dbf_file_get_field_raw(row, dbf: DBFFile, field_index: int) -> memoryview:
+    """
+    Get the undecoded bytes of a field from a raw record.
+    
+    Args:
+        row: The raw record (from dbf_file_iter_rows with raw=True)
+        dbf: The DBF file object
+        field_index: 1-based field index
+        
+    Returns:
+        Field bytes as a memoryview (no copy, no decoding)
+    """
+    if not dbf or not row or field_index < 1 or field_index > dbf.header.field_count:
+        return memoryview(b'')
+    
+    field = dbf.header.fields[field_index - 1]
+    return memoryview(row)[field.offset:field.offset + field.length]
+
+
 def dbf_file_set_field_str(row: list, dbf: DBFFile, field_index: int, value: str) -> None:
     """
     Set a field value in a row buffer.
@@ -900,6 +1052,9 @@ def dbf_memo_write_buffer(memo_filename: str, memo_type: int, data: bytes) -> in
     - dBase III (0x03): Just data + 0x1A terminator (no header)
     - dBase IV+ (0x04, 0x05): Type (4 bytes) + Length (4 bytes) + data + 0x1A
     
+    The memo blocks are assembled in memory and written with a single
+    unbuffered write, followed by the next-free-block update.
+    
     Args:
         memo_filename: Path to the memo file (with .DBT extension)
         memo_type: Memo type (1 for text, 2 for binary, etc.) - ignored for dBase III
@@ -919,68 +1074,47 @@ def dbf_memo_write_buffer(memo_filename: str, memo_type: int, data: bytes) -> in
     dbf_version = _get_dbf_version(memo_filename)
     is_dbase3 = (dbf_version == 0x03)
     
+    if is_dbase3:
+        # dBase III format: just data + 0x1A terminator (no header)
+        payload = data + b'\x1A'
+    else:
+        # dBase IV+ format: type + length + data + 0x1A (little endian)
+        payload = struct.pack("<LL", memo_type, len(data)) + data + b'\x1A'
+    
+    # Pad to a whole number of blocks
+    blocks_needed = (len(payload) + DBF_MEMO_BLOCK_SIZE - 1) // DBF_MEMO_BLOCK_SIZE
+    block_buf = bytearray(blocks_needed * DBF_MEMO_BLOCK_SIZE)
+    block_buf[:len(payload)] = payload
+    
     # Open or create the memo file
+    fd = os.open(memo_filename, os.O_RDWR | os.O_CREAT | _O_BINARY)
     try:
-        with open(memo_filename, 'rb+') as f:
-            # Read next free block from header
-            f.seek(0)
-            next_free_bytes = f.read(4)
-            next_free = struct.unpack("<L", next_free_bytes)[0]
-            if next_free < 1:
-                next_free = 1
-    except FileNotFoundError:
-        # Create new memo file
-        with open(memo_filename, 'wb') as f:
+        # Read next free block from header
+        next_free_bytes = os.read(fd, 4)
+        if len(next_free_bytes) < 4:
+            # New memo file: write the header block
             buf = bytearray(DBF_MEMO_BLOCK_SIZE)
             next_free = 1
             buf[0:4] = struct.pack("<L", next_free)
             buf[4:6] = struct.pack("<H", DBF_MEMO_BLOCK_SIZE)
-            f.write(buf)
-    
-    # Write the memo data
-    with open(memo_filename, 'rb+') as f:
-        start_block = next_free
-        start_pos = start_block * DBF_MEMO_BLOCK_SIZE
-        
-        # Seek to start position
-        f.seek(start_pos)
-        
-        if is_dbase3:
-            # dBase III format: just data + 0x1A terminator (no header)
-            f.write(data)
-            f.write(b'\x1A')
-            
-            # Calculate total length and blocks needed
-            total_len = len(data) + 1  # data + EOF
-            blocks_needed = (total_len + DBF_MEMO_BLOCK_SIZE - 1) // DBF_MEMO_BLOCK_SIZE
-            pad_len = (blocks_needed * DBF_MEMO_BLOCK_SIZE) - total_len
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.write(fd, buf)
         else:
-            # dBase IV+ format: type + length + data + 0x1A
-            # Write memo type (4 bytes, little endian)
-            f.write(struct.pack("<L", memo_type))
-            
-            # Write memo length (4 bytes, little endian)
-            f.write(struct.pack("<L", len(data)))
-            
-            # Write data
-            f.write(data)
-            
-            # Write EOF marker (0x1A)
-            f.write(b'\x1A')
-            
-            # Calculate total length and blocks needed
-            total_len = 8 + len(data) + 1  # header + data + EOF
-            blocks_needed = (total_len + DBF_MEMO_BLOCK_SIZE - 1) // DBF_MEMO_BLOCK_SIZE
-            pad_len = (blocks_needed * DBF_MEMO_BLOCK_SIZE) - total_len
+            next_free = struct.unpack("<L", next_free_bytes)[0]
+            if next_free < 1:
+                next_free = 1
         
-        # Write padding
-        if pad_len > 0:
-            f.write(b'\x00' * pad_len)
+        # Write the memo data
+        start_block = next_free
+        os.lseek(fd, start_block * DBF_MEMO_BLOCK_SIZE, os.SEEK_SET)
+        os.write(fd, block_buf)
         
         # Update next free block in header
         next_free = start_block + blocks_needed
-        f.seek(0)
-        f.write(struct.pack("<L", next_free))
+        os.lseek(fd, 0, os.SEEK_SET)
+        os.write(fd, struct.pack("<L", next_free))
+    finally:
+        os.close(fd)
     
     return start_block
 
@@ -1582,9 +1716,11 @@ __all__ = [
     'dbf_file_create', 'dbf_file_create_dbase3', 'dbf_file_close', 'dbf_file_open',
     'dbf_file_get_date', 'dbf_file_set_date',
     'dbf_file_get_language_driver', 'dbf_file_set_language_driver',
-    'dbf_file_append_row', 'dbf_file_read_row', 'dbf_file_write_row',
+    'dbf_file_append_row', 'dbf_file_append_rows', 'dbf_file_read_row', 'dbf_file_write_row',
+    'dbf_file_iter_rows',
     'dbf_file_seek_to_row', 'dbf_file_seek_to_first_row', 'dbf_file_get_actual_row_count',
-    'dbf_file_set_row_deleted', 'dbf_file_get_field_str', 'dbf_file_set_field_str',
+    'dbf_file_set_row_deleted', 'dbf_file_get_field_str', 'dbf_file_get_field_raw',
+    'dbf_file_set_field_str',
     'dbf_file_clear_memo_fields',
     'export_dbf_to_text', 'import_dbf_from_text',
     'export_dbf_memos_to_text', 'import_dbf_memos_from_text', 'import_dbf_memos_from_text_ex',
@@ -7,14 +7,21 @@ NDX files are B-tree indexes used by dBase III/IV/V.
 
 import struct
 import os
-from dataclasses import dataclass
-from typing import List, Tuple, Optional
+import bisect
+import contextlib
+import functools
+import mmap
+from dataclasses import dataclass, replace
+from typing import Callable, List, Tuple, Optional, Union
 
 # Constants
 NDX_BLOCK_SIZE = 512
 NDX_MAX_KEYS = 64
 NDX_MAX_KEY_LEN = 80
 
+# Entry prefix in a node page: child block pointer + record number
+_S_CHILD_RECNO = struct.Struct('<II')
+
 
 @dataclass
 class NDXHeader:
@@ -45,6 +52,50 @@ class NDXNode:
             self.recnos = []
 
 
+@dataclass
+class NDXFile:
+    """
+    An NDX file held open for repeated lookups (see ndx_file_open).
+    
+    The ndx_find_* and ndx_dump_first_entries functions accept it in place
+    of a filename and then reuse its header and mapping instead of
+    re-checking the header and re-mapping the file per call. The file must
+    not be rewritten (e.g. by ndx_create_index) while it is open.
+    """
+    filename: str = ''
+    header: NDXHeader = None
+    map: Optional[mmap.mmap] = None
+
+
+def ndx_file_open(filename: str) -> Optional[NDXFile]:
+    """
+    Open an NDX file for repeated lookups.
+    
+    Args:
+        filename: Path to the NDX file
+        
+    Returns:
+        NDXFile (close with ndx_file_close) or None if invalid
+    """
+    header = ndx_read_header(filename)
+    if not header:
+        return None
+    
+    try:
+        ndx = _open_ndx(filename)
+    except (FileNotFoundError, ValueError):
+        return None
+    
+    return NDXFile(filename=filename, header=header, map=ndx)
+
+
+def ndx_file_close(ndx_file: NDXFile) -> None:
+    """Close an NDX file opened with ndx_file_open."""
+    if ndx_file and ndx_file.map is not None:
+        ndx_file.map.close()
+        ndx_file.map = None
+
+
 def _get_word_le(buf: bytes, pos: int) -> int:
     """Get a 16-bit little-endian word from buffer."""
     return struct.unpack_from('<H', buf, pos)[0]
@@ -86,6 +137,9 @@ def ndx_read_header(filename: str) -> Optional[NDXHeader]:
     - V1: 16-bit block pointers at offset 1, layout at offset 7
     - V2: 32-bit block pointers at offset 1, layout at offset 13
     
+    Parsed headers are cached per file; the cache entry is only reused while
+    the file's modification time and size are unchanged.
+    
     Args:
         filename: Path to the NDX file
         
@@ -93,61 +147,80 @@ def ndx_read_header(filename: str) -> Optional[NDXHeader]:
         NDXHeader object or None if invalid
     """
     try:
-        with open(filename, 'rb') as f:
-            buf = f.read(NDX_BLOCK_SIZE)
-            if len(buf) < NDX_BLOCK_SIZE:
-                return None
-            
-            # Try V1 format (dBase III)
-            v1_key_len = _get_word_le(buf, 6)      # Offset 7 in Pascal (1-based)
-            v1_keys_max = _get_word_le(buf, 8)     # Offset 9
-            v1_group_len = _get_word_le(buf, 10)   # Offset 11
-            v1_ok = _valid_layout(v1_key_len, v1_keys_max, v1_group_len)
-            
-            # Try V2 format (dBase IV)
-            v2_key_len = _get_word_le(buf, 12)     # Offset 13
-            v2_keys_max = _get_word_le(buf, 14)    # Offset 15
-            v2_group_len = _get_word_le(buf, 18)   # Offset 19
-            v2_ok = _valid_layout(v2_key_len, v2_keys_max, v2_group_len)
-            
-            header = NDXHeader()
-            
-            # Prefer V2 if both are valid but V1 is not
-            if v2_ok and not v1_ok:
-                # V2 format (dBase IV)
-                header.root_block = _get_long_le(buf, 0)    # Offset 1
-                header.eof_block = _get_long_le(buf, 4)     # Offset 5
-                header.key_len = v2_key_len
-                header.keys_max = v2_keys_max
-                header.group_len = v2_group_len
-                expr_off = 24  # Offset 25 in Pascal
-            elif v1_ok:
-                # V1 format (dBase III)
-                header.root_block = _get_word_le(buf, 0)    # Offset 1
-                header.eof_block = _get_word_le(buf, 4)     # Offset 5
-                header.key_len = v1_key_len
-                header.keys_max = v1_keys_max
-                header.group_len = v1_group_len
-                expr_off = 16  # Offset 17 in Pascal
-            else:
-                return None
-            
-            # Read expression (null-terminated string)
-            expr_bytes = []
-            i = expr_off
-            while i < NDX_BLOCK_SIZE and len(expr_bytes) < 80:
-                b = buf[i]
-                if b == 0:
-                    break
-                expr_bytes.append(b)
-                i += 1
-            
-            header.expr = bytes(expr_bytes).decode('latin-1', errors='replace')
-            
-            return header
-            
+        st = os.stat(filename)
+    except OSError:
+        return None
+    
+    header = _read_header_cached(os.path.abspath(filename), st.st_mtime_ns, st.st_size)
+    if header is None:
+        return None
+    return replace(header)  # Callers get their own copy
+
+
+@functools.lru_cache(maxsize=32)
+def _read_header_cached(path: str, mtime_ns: int, size: int) -> Optional[NDXHeader]:
+    """Parse the header of path (cached on path + modification time + size)."""
+    try:
+        # Raw fd read: one 512-byte read without setting up a buffered file
+        # (O_BINARY keeps Windows from translating line endings)
+        fd = os.open(path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+        try:
+            buf = os.read(fd, NDX_BLOCK_SIZE)
+        finally:
+            os.close(fd)
     except FileNotFoundError:
         return None
+    
+    if len(buf) < NDX_BLOCK_SIZE:
+        return None
+    
+    # Try V1 format (dBase III)
+    v1_key_len = _get_word_le(buf, 6)      # Offset 7 in Pascal (1-based)
+    v1_keys_max = _get_word_le(buf, 8)     # Offset 9
+    v1_group_len = _get_word_le(buf, 10)   # Offset 11
+    v1_ok = _valid_layout(v1_key_len, v1_keys_max, v1_group_len)
+    
+    # Try V2 format (dBase IV)
+    v2_key_len = _get_word_le(buf, 12)     # Offset 13
+    v2_keys_max = _get_word_le(buf, 14)    # Offset 15
+    v2_group_len = _get_word_le(buf, 18)   # Offset 19
+    v2_ok = _valid_layout(v2_key_len, v2_keys_max, v2_group_len)
+    
+    header = NDXHeader()
+    
+    # Prefer V2 if both are valid but V1 is not
+    if v2_ok and not v1_ok:
+        # V2 format (dBase IV)
+        header.root_block = _get_long_le(buf, 0)    # Offset 1
+        header.eof_block = _get_long_le(buf, 4)     # Offset 5
+        header.key_len = v2_key_len
+        header.keys_max = v2_keys_max
+        header.group_len = v2_group_len
+        expr_off = 24  # Offset 25 in Pascal
+    elif v1_ok:
+        # V1 format (dBase III)
+        header.root_block = _get_word_le(buf, 0)    # Offset 1
+        header.eof_block = _get_word_le(buf, 4)     # Offset 5
+        header.key_len = v1_key_len
+        header.keys_max = v1_keys_max
+        header.group_len = v1_group_len
+        expr_off = 16  # Offset 17 in Pascal
+    else:
+        return None
+    
+    # Read expression (null-terminated string)
+    expr_bytes = []
+    i = expr_off
+    while i < NDX_BLOCK_SIZE and len(expr_bytes) < 80:
+        b = buf[i]
+        if b == 0:
+            break
+        expr_bytes.append(b)
+        i += 1
+    
+    header.expr = bytes(expr_bytes).decode('latin-1', errors='replace')
+    
+    return header
 
 
 def ndx_read_node(filename: str, block: int, header: NDXHeader) -> Optional[NDXNode]:
@@ -163,41 +236,89 @@ def ndx_read_node(filename: str, block: int, header: NDXHeader) -> Optional[NDXN
         NDXNode object or None if error
     """
     try:
-        with open(filename, 'rb') as f:
-            f.seek(block * NDX_BLOCK_SIZE)
-            buf = f.read(NDX_BLOCK_SIZE)
-            if len(buf) < NDX_BLOCK_SIZE:
-                return None
-            
-            node = NDXNode()
-            node.num_keys = _get_word_le(buf, 0)  # Offset 1 in Pascal
-            
-            if node.num_keys > header.keys_max:
-                node.num_keys = header.keys_max
-            
-            # Read keys, child pointers, and record numbers
-            for i in range(node.num_keys):
-                offs = 4 + (i * header.group_len)  # Offset 5 in Pascal
-                
-                child = _get_long_le(buf, offs)
-                recno = _get_long_le(buf, offs + 4)
-                
-                # Read key string
-                key_bytes = buf[offs + 8 : offs + 8 + header.key_len]
-                key = key_bytes.decode('latin-1', errors='replace')
-                
-                node.childs.append(child)
-                node.recnos.append(recno)
-                node.keys.append(key)
-            
-            # Read last child pointer
-            offs = 4 + (node.num_keys * header.group_len)
-            node.last_child = _get_long_le(buf, offs)
-            
-            return node
-            
-    except FileNotFoundError:
+        with _open_ndx(filename) as ndx:
+            node = _read_node(ndx, block, header)
+    except (FileNotFoundError, ValueError):  # ValueError: empty file (cannot be mapped)
+        return None
+    
+    if node is None:
         return None
+    # Callers get their own copy of the cached node
+    return replace(node, keys=list(node.keys), childs=list(node.childs), recnos=list(node.recnos))
+
+
+def _open_ndx(filename: Union[str, NDXFile]):
+    """
+    Map an NDX file read-only. Pages are then read by slicing the map (the OS
+    page cache) instead of a seek + read per node.
+    
+    Returns a context manager yielding the map; for an open NDXFile its map
+    is yielded and left open.
+    """
+    if isinstance(filename, NDXFile):
+        if filename.map is None:
+            raise ValueError("NDX file is closed")
+        return contextlib.nullcontext(filename.map)
+    
+    with open(filename, 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _source_header(filename: Union[str, NDXFile]) -> Optional[NDXHeader]:
+    """Header of an NDX filename or open NDXFile."""
+    if isinstance(filename, NDXFile):
+        return filename.header
+    return ndx_read_header(filename)
+
+
+def _read_node(ndx: mmap.mmap, block: int, header: NDXHeader) -> Optional[NDXNode]:
+    """
+    Decode the node at block from a mapped NDX file (None if past the end).
+    
+    The returned node is shared through the page cache and must not be mutated.
+    """
+    base = block * NDX_BLOCK_SIZE
+    if block < 0 or base + NDX_BLOCK_SIZE > len(ndx):
+        return None
+    
+    return _decode_node(ndx[base:base + NDX_BLOCK_SIZE],
+                        header.key_len, header.keys_max, header.group_len)
+
+
+@functools.lru_cache(maxsize=1024)
+def _decode_node(page: bytes, key_len: int, keys_max: int, group_len: int) -> NDXNode:
+    """
+    Decode one 512-byte NDX page.
+    
+    Cached on the page contents and layout, so hot pages (the root and upper
+    internal nodes) are decoded once, and a rewritten file can never be
+    served a stale node.
+    """
+    node = NDXNode()
+    node.num_keys = _get_word_le(page, 0)  # Offset 1 in Pascal
+    
+    if node.num_keys > keys_max:
+        node.num_keys = keys_max
+    
+    # Read keys, child pointers, and record numbers (entries start at offset 5
+    # in Pascal), unpacking all entries of the page in one pass
+    entries = page[4:4 + node.num_keys * group_len]
+    for child, recno, key_bytes in _entry_struct(key_len, group_len).iter_unpack(entries):
+        node.childs.append(child)
+        node.recnos.append(recno)
+        node.keys.append(key_bytes.decode('latin-1', errors='replace'))
+    
+    # Read last child pointer
+    offs = 4 + (node.num_keys * group_len)
+    node.last_child = _get_long_le(page, offs)
+    
+    return node
+
+
+@functools.lru_cache(maxsize=None)
+def _entry_struct(key_len: int, group_len: int) -> struct.Struct:
+    """Node entry layout: child pointer, record number, key, padding to group_len."""
+    return struct.Struct(f'<II{key_len}s{group_len - 8 - key_len}x')
 
 
 def ndx_is_leaf_node(node: NDXNode) -> bool:
@@ -229,20 +350,20 @@ def ndx_clean_key(key: str) -> str:
     return key.replace('\x00', ' ').rstrip()
 
 
-def ndx_dump_first_entries(filename: str, count: int = 10) -> List[Tuple[int, str]]:
+def ndx_dump_first_entries(filename: Union[str, NDXFile], count: int = 10) -> List[Tuple[int, str]]:
     """
     Dump the first N entries from an NDX index file.
     
     Navigates to the leftmost leaf node and returns the first entries.
     
     Args:
-        filename: Path to the NDX file
+        filename: Path to the NDX file, or an NDXFile from ndx_file_open
         count: Number of entries to return
         
     Returns:
         List of (record_number, key) tuples
     """
-    header = ndx_read_header(filename)
+    header = _source_header(filename)
     if not header:
         return []
     
@@ -252,24 +373,36 @@ def ndx_dump_first_entries(filename: str, count: int = 10) -> List[Tuple[int, st
         return []
     
     # Navigate to leftmost leaf
-    node = ndx_read_node(filename, block, header)
-    if not node:
+    try:
+        mapped = _open_ndx(filename)
+    except (FileNotFoundError, ValueError):
         return []
     
-    while block > 0 and not ndx_is_leaf_node(node):
-        block = node.childs[0]
-        node = ndx_read_node(filename, block, header)
+    with mapped as ndx:
+        node = _read_node(ndx, block, header)
         if not node:
             return []
+        
+        while block > 0 and not ndx_is_leaf_node(node):
+            block = node.childs[0]
+            node = _read_node(ndx, block, header)
+            if not node:
+                return []
     
     # Collect first N entries
-    entries = []
-    for i in range(min(node.num_keys, count)):
-        recno = node.recnos[i]
-        key = ndx_clean_key(node.keys[i])
-        entries.append((recno, key))
-    
-    return entries
+    return [(recno, ndx_clean_key(key))
+            for recno, key in zip(node.recnos[:count], node.keys[:count])]
+
+
+def _key_text(key: Union[str, bytes, bytearray, memoryview]) -> str:
+    """
+    Search key as text. Raw key bytes (e.g. a field from dbf_file_get_field_raw)
+    are decoded as latin-1, the same way node keys are decoded, so every byte
+    compares as itself.
+    """
+    if isinstance(key, str):
+        return key
+    return bytes(key).decode('latin-1')
 
 
 def _normalize_key(key: str, key_len: int) -> str:
@@ -283,45 +416,11 @@ def _normalize_key(key: str, key_len: int) -> str:
     Returns:
         Normalized key string
     """
-    # Truncate if too long
-    if len(key) > key_len:
-        key = key[:key_len]
-    
-    # Replace null bytes with spaces
-    key = key.replace('\x00', ' ')
-    
-    # Pad with spaces to key_len
-    while len(key) < key_len:
-        key += ' '
-    
-    return key
+    # Truncate, replace null bytes with spaces, pad with spaces to key_len
+    return key[:key_len].replace('\x00', ' ').ljust(key_len)
 
 
-def _compare_keys(a: str, b: str, key_len: int) -> int:
-    """
-    Compare two keys byte by byte.
-    
-    Args:
-        a: First key
-        b: Second key
-        key_len: Key length
-        
-    Returns:
-        -1 if a < b, 0 if a == b, 1 if a > b
-    """
-    a_norm = _normalize_key(a, key_len)
-    b_norm = _normalize_key(b, key_len)
-    
-    for i in range(key_len):
-        if a_norm[i] < b_norm[i]:
-            return -1
-        elif a_norm[i] > b_norm[i]:
-            return 1
-    
-    return 0
-
-
-def _descend_to_first_ge(filename: str, header: NDXHeader, key_norm: str) -> Tuple[List[int], List[int], int]:
+def _descend_to_first_ge(ndx: mmap.mmap, header: NDXHeader, key_norm: str) -> Tuple[List[int], List[int], int]:
     """
     Descend the B-tree to find the first entry >= key_norm.
     
@@ -337,30 +436,27 @@ def _descend_to_first_ge(filename: str, header: NDXHeader, key_norm: str) -> Tup
     block = header.root_block
     
     while block > 0 and depth < 20:  # Max depth 20
-        node = ndx_read_node(filename, block, header)
+        node = _read_node(ndx, block, header)
         if not node:
             break
         
+        # Keys within a node are sorted, so the first key >= key_norm is a
+        # binary search over the normalized keys (decoded keys are already
+        # key_len long; only nulls need replacing)
+        keys = [key.replace('\x00', ' ') for key in node.keys]
+        i = bisect.bisect_left(keys, key_norm)
+        
         if ndx_is_leaf_node(node):
-            # Leaf node - find first key >= key_norm
+            # Leaf node - first key >= key_norm
             stack.append(block)
-            i = 0
-            while i < node.num_keys and _compare_keys(node.keys[i], key_norm, header.key_len) < 0:
-                i += 1
             stack_idx.append(i)
             depth += 1
             break
         
-        # Internal node - find child to descend to
-        next_block = node.last_child
-        next_idx = node.num_keys  # Default to last child position
-        i = 0
-        while i < node.num_keys:
-            if _compare_keys(key_norm, node.keys[i], header.key_len) <= 0:
-                next_block = node.childs[i]
-                next_idx = i
-                break
-            i += 1
+        # Internal node - descend left of the first key >= key_norm,
+        # or to the last child if there is none
+        next_block = node.childs[i] if i < node.num_keys else node.last_child
+        next_idx = i
         
         stack.append(block)
         stack_idx.append(next_idx)
@@ -370,7 +466,7 @@ def _descend_to_first_ge(filename: str, header: NDXHeader, key_norm: str) -> Tup
     return stack, stack_idx, depth
 
 
-def _descend_leftmost(filename: str, header: NDXHeader, start_block: int, 
+def _descend_leftmost(ndx: mmap.mmap, header: NDXHeader, start_block: int, 
                       stack: List[int], stack_idx: List[int], depth: int) -> Tuple[List[int], List[int], int]:
     """
     Descend to the leftmost leaf from a given block.
@@ -381,7 +477,7 @@ def _descend_leftmost(filename: str, header: NDXHeader, start_block: int,
     block = start_block
     
     while block > 0 and depth < 20:
-        node = ndx_read_node(filename, block, header)
+        node = _read_node(ndx, block, header)
         if not node:
             break
         
@@ -400,7 +496,7 @@ def _descend_leftmost(filename: str, header: NDXHeader, start_block: int,
     return stack, stack_idx, depth
 
 
-def _advance_to_successor(filename: str, header: NDXHeader, 
+def _advance_to_successor(ndx: mmap.mmap, header: NDXHeader, 
                           stack: List[int], stack_idx: List[int], depth: int) -> Tuple[List[int], List[int], int]:
     """
     Advance to the next entry in the B-tree.
@@ -410,7 +506,7 @@ def _advance_to_successor(filename: str, header: NDXHeader,
     """
     while depth > 0:
         child_pos = stack_idx[depth - 1]
-        node = ndx_read_node(filename, stack[depth - 1], header)
+        node = _read_node(ndx, stack[depth - 1], header)
         if not node:
             break
         
@@ -423,7 +519,7 @@ def _advance_to_successor(filename: str, header: NDXHeader,
             
             stack_idx[depth - 1] = next_child_pos
             # Descend leftmost from the next block
-            new_stack, new_stack_idx, new_depth = _descend_leftmost(filename, header, next_block, stack[:depth], stack_idx[:depth], depth)
+            new_stack, new_stack_idx, new_depth = _descend_leftmost(ndx, header, next_block, stack[:depth], stack_idx[:depth], depth)
             return new_stack, new_stack_idx, new_depth
         
         depth -= 1
@@ -431,34 +527,49 @@ def _advance_to_successor(filename: str, header: NDXHeader,
     return stack, stack_idx, depth
 
 
-def _next_entry(filename: str, header: NDXHeader, 
-                stack: List[int], stack_idx: List[int], depth: int) -> Tuple[bool, str, int, List[int], List[int], int]:
+def _scan_leaves(ndx: mmap.mmap, header: NDXHeader, 
+                 stack: List[int], stack_idx: List[int], depth: int,
+                 matches: Callable[[str], bool], max_count: int) -> List[int]:
     """
-    Get the next entry from the B-tree.
+    Collect record numbers from the current position while keys match.
     
+    Each leaf is decoded once and its entries are tested in a tight loop;
+    the scan then steps to the next leaf through the descent stack.
+    
+    Args:
+        ndx: Mapped NDX file
+        header: NDX header
+        stack, stack_idx, depth: Position from one of the descend helpers
+        matches: Predicate on the raw key; the scan stops at the first miss
+        max_count: Maximum number of results to return
+        
     Returns:
-        Tuple of (success, key, recno, updated_stack, updated_stack_idx, updated_depth)
+        List of record numbers (zero recnos are skipped)
     """
-    while depth > 0:
-        idx = stack_idx[depth - 1]
-        node = ndx_read_node(filename, stack[depth - 1], header)
+    results = []
+    
+    while depth > 0 and len(results) < max_count:
+        node = _read_node(ndx, stack[depth - 1], header)
         if not node:
             break
         
         if ndx_is_leaf_node(node):
-            if idx < node.num_keys:
-                key_out = node.keys[idx]
-                recno_out = node.recnos[idx]
-                stack_idx[depth - 1] = idx + 1
-                return True, key_out, recno_out, stack, stack_idx, depth
-            else:
-                depth -= 1
-                stack, stack_idx, depth = _advance_to_successor(filename, header, stack, stack_idx, depth)
-        else:
-            depth -= 1
-            stack, stack_idx, depth = _advance_to_successor(filename, header, stack, stack_idx, depth)
+            recnos = node.recnos
+            for i in range(stack_idx[depth - 1], node.num_keys):
+                if not matches(node.keys[i]):
+                    return results
+                
+                if recnos[i] != 0:
+                    results.append(recnos[i])
+                    if len(results) >= max_count:
+                        return results
+            
+            stack_idx[depth - 1] = node.num_keys
+        
+        depth -= 1
+        stack, stack_idx, depth = _advance_to_successor(ndx, header, stack, stack_idx, depth)
     
-    return False, '', 0, stack, stack_idx, depth
+    return results
 
 
 def _normalize_prefix(prefix: str, key_len: int) -> str:
@@ -496,103 +607,83 @@ def _starts_with_key(key_str: str, prefix: str) -> bool:
     if len(prefix) == 0:
         return False
     
-    if len(key_str) < len(prefix):
-        return False
-    
-    for i in range(len(prefix)):
-        if key_str[i] != prefix[i]:
-            return False
-    
-    return True
+    return key_str.startswith(prefix)
 
 
-def ndx_find_exact(filename: str, search_key: str, max_count: int = 1000) -> List[int]:
+def ndx_find_exact(filename: Union[str, NDXFile], search_key: Union[str, bytes], max_count: int = 1000) -> List[int]:
     """
     Find all record numbers with exact key match.
     
     Args:
-        filename: Path to the NDX file
-        search_key: Key to search for
+        filename: Path to the NDX file, or an NDXFile from ndx_file_open
+        search_key: Key to search for (str, or raw key bytes)
         max_count: Maximum number of results to return
         
     Returns:
         List of record numbers matching the key
     """
-    header = ndx_read_header(filename)
+    header = _source_header(filename)
     if not header:
         return []
     
     # Normalize search key
-    key_norm = _normalize_key(search_key, header.key_len)
-    
-    # Descend to first entry >= search key
-    stack, stack_idx, depth = _descend_to_first_ge(filename, header, key_norm)
+    key_norm = _normalize_key(_key_text(search_key), header.key_len)
     
-    # Collect all matching entries
-    results = []
+    try:
+        mapped = _open_ndx(filename)
+    except (FileNotFoundError, ValueError):
+        return []
     
-    while len(results) < max_count:
-        success, key_out, recno_out, stack, stack_idx, depth = _next_entry(
-            filename, header, stack, stack_idx, depth)
-        
-        if not success:
-            break
-        
-        # Compare with search key
-        cmp = _compare_keys(key_out, key_norm, header.key_len)
-        if cmp != 0:
-            break  # No more matches
+    with mapped as ndx:
+        # Descend to first entry >= search key
+        stack, stack_idx, depth = _descend_to_first_ge(ndx, header, key_norm)
         
-        if recno_out != 0:
-            results.append(recno_out)
+        # Collect all matching entries
+        key_len = header.key_len
+        results = _scan_leaves(ndx, header, stack, stack_idx, depth,
+                               lambda key: _normalize_key(key, key_len) == key_norm,
+                               max_count)
     
     return results
 
 
-def ndx_find_prefix(filename: str, prefix: str, max_count: int = 1000) -> List[int]:
+def ndx_find_prefix(filename: Union[str, NDXFile], prefix: Union[str, bytes], max_count: int = 1000) -> List[int]:
     """
     Find all record numbers where key starts with prefix.
     
     Args:
-        filename: Path to the NDX file
-        prefix: Prefix to search for
+        filename: Path to the NDX file, or an NDXFile from ndx_file_open
+        prefix: Prefix to search for (str, or raw key bytes)
         max_count: Maximum number of results to return
         
     Returns:
         List of record numbers where key starts with prefix
     """
-    header = ndx_read_header(filename)
+    header = _source_header(filename)
     if not header:
         return []
     
     # Normalize prefix (don't pad)
-    prefix_norm = _normalize_prefix(prefix, header.key_len)
+    prefix_norm = _normalize_prefix(_key_text(prefix), header.key_len)
     
     # Create search key by padding prefix to full key length
     key_norm = _normalize_key(prefix_norm, header.key_len)
     
-    # Descend to first entry >= search key
-    stack, stack_idx, depth = _descend_to_first_ge(filename, header, key_norm)
-    
-    # Collect all matching entries
-    results = []
+    try:
+        mapped = _open_ndx(filename)
+    except (FileNotFoundError, ValueError):
+        return []
     
-    while len(results) < max_count:
-        success, key_out, recno_out, stack, stack_idx, depth = _next_entry(
-            filename, header, stack, stack_idx, depth)
-        
-        if not success:
-            break
-        
-        # Normalize key_out as prefix (don't pad) for comparison
-        key_out_prefix = _normalize_prefix(key_out, header.key_len)
-        
-        # Check if key starts with prefix
-        if not _starts_with_key(key_out_prefix, prefix_norm):
-            break  # No more matches
+    with mapped as ndx:
+        # Descend to first entry >= search key
+        stack, stack_idx, depth = _descend_to_first_ge(ndx, header, key_norm)
         
-        if recno_out != 0:
-            results.append(recno_out)
+        # Collect all entries whose key (normalized as a prefix, unpadded)
+        # starts with the prefix
+        key_len = header.key_len
+        results = _scan_leaves(ndx, header, stack, stack_idx, depth,
+                               lambda key: _starts_with_key(_normalize_prefix(key, key_len), prefix_norm),
+                               max_count)
     
     return results
 
@@ -611,50 +702,33 @@ def _make_key8_from_int(value: int) -> bytes:
     return struct.pack('<d', float(value))  # Little-endian double
 
 
-def _key_str_to_key8(key_str: str) -> bytes:
+def _key8_rank(key) -> int:
     """
-    Extract first 8 bytes from a key string.
+    Map an 8-byte key to an integer with the same ordering.
     
-    Args:
-        key_str: Key string from NDX
-        
-    Returns:
-        8-byte array
-    """
-    result = bytearray(8)
-    for i in range(min(8, len(key_str))):
-        result[i] = ord(key_str[i])
-    return bytes(result)
-
-
-def _compare_key8(a: bytes, b: bytes) -> int:
-    """
-    Compare two 8-byte keys (byte by byte, from high to low).
+    Keys compare byte by byte from byte 7 down to byte 0, which is exactly
+    the order of their unsigned little-endian value, so one integer compare
+    replaces the byte loop. Shorter keys are zero-padded.
     
     Args:
-        a: First 8-byte key
-        b: Second 8-byte key
+        key: Key string from NDX (latin-1 decoded) or 8-byte key
         
     Returns:
-        -1 if a < b, 0 if a == b, 1 if a > b
+        Unsigned integer rank of the first 8 bytes
     """
-    # Compare from byte 7 down to byte 0 (high to low)
-    for i in range(7, -1, -1):
-        if a[i] < b[i]:
-            return -1
-        elif a[i] > b[i]:
-            return 1
-    return 0
+    if isinstance(key, str):
+        key = key[:8].encode('latin-1')
+    return int.from_bytes(key[:8], 'little')
 
 
-def _descend_to_first_ge_number(filename: str, header: NDXHeader, target: bytes) -> Tuple[List[int], List[int], int]:
+def _descend_to_first_ge_number(ndx: mmap.mmap, header: NDXHeader, target: int) -> Tuple[List[int], List[int], int]:
     """
     Descend the B-tree to find the first numeric entry >= target.
     
     Args:
-        filename: NDX filename
+        ndx: Mapped NDX file
         header: NDX header
-        target: 8-byte target value
+        target: Target key rank (see _key8_rank)
         
     Returns:
         Tuple of (stack, stack_idx, depth)
@@ -665,7 +739,7 @@ def _descend_to_first_ge_number(filename: str, header: NDXHeader, target: bytes)
     block = header.root_block
     
     while block > 0 and depth < 20:
-        node = ndx_read_node(filename, block, header)
+        node = _read_node(ndx, block, header)
         if not node:
             break
         
@@ -674,8 +748,7 @@ def _descend_to_first_ge_number(filename: str, header: NDXHeader, target: bytes)
             stack.append(block)
             idx = node.num_keys  # Default to end
             for i in range(node.num_keys):
-                key_val = _key_str_to_key8(node.keys[i])
-                if _compare_key8(key_val, target) >= 0:
+                if _key8_rank(node.keys[i]) >= target:
                     idx = i
                     break
             stack_idx.append(idx)
@@ -686,8 +759,7 @@ def _descend_to_first_ge_number(filename: str, header: NDXHeader, target: bytes)
         next_block = node.last_child
         next_idx = node.num_keys
         for i in range(node.num_keys):
-            key_val = _key_str_to_key8(node.keys[i])
-            if _compare_key8(target, key_val) <= 0:
+            if target <= _key8_rank(node.keys[i]):
                 next_block = node.childs[i]
                 next_idx = i
                 break
@@ -700,58 +772,51 @@ def _descend_to_first_ge_number(filename: str, header: NDXHeader, target: bytes)
     return stack, stack_idx, depth
 
 
-def ndx_find_number_exact(filename: str, value: int, max_count: int = 1000) -> List[int]:
+def ndx_find_number_exact(filename: Union[str, NDXFile], value: int, max_count: int = 1000) -> List[int]:
     """
     Find all record numbers with exact numeric value match.
     
     Args:
-        filename: Path to the NDX file
+        filename: Path to the NDX file, or an NDXFile from ndx_file_open
         value: Integer value to search for
         max_count: Maximum number of results to return
         
     Returns:
         List of record numbers matching the value
     """
-    header = ndx_read_header(filename)
+    header = _source_header(filename)
     if not header:
         return []
     
     if header.key_len < 8:
         return []  # Not a numeric index
     
-    # Convert value to 8-byte key
-    target = _make_key8_from_int(value)
+    # Convert value to an 8-byte key and rank it for integer compares
+    target = _key8_rank(_make_key8_from_int(value))
     
-    # Descend to first entry >= target
-    stack, stack_idx, depth = _descend_to_first_ge_number(filename, header, target)
-    
-    # Collect all matching entries
-    results = []
+    try:
+        mapped = _open_ndx(filename)
+    except (FileNotFoundError, ValueError):
+        return []
     
-    while len(results) < max_count:
-        success, key_out, recno_out, stack, stack_idx, depth = _next_entry(
-            filename, header, stack, stack_idx, depth)
-        
-        if not success:
-            break
+    with mapped as ndx:
+        # Descend to first entry >= target
+        stack, stack_idx, depth = _descend_to_first_ge_number(ndx, header, target)
         
-        # Compare with target
-        key_val = _key_str_to_key8(key_out)
-        if _compare_key8(key_val, target) != 0:
-            break  # No more matches
-        
-        if recno_out != 0:
-            results.append(recno_out)
+        # Collect all matching entries
+        results = _scan_leaves(ndx, header, stack, stack_idx, depth,
+                               lambda key: _key8_rank(key) == target,
+                               max_count)
     
     return results
 
 
-def ndx_find_number_range(filename: str, min_value: int, max_value: int, max_count: int = 10000) -> List[int]:
+def ndx_find_number_range(filename: Union[str, NDXFile], min_value: int, max_value: int, max_count: int = 10000) -> List[int]:
     """
     Find all record numbers with numeric values in range [min_value, max_value].
     
     Args:
-        filename: Path to the NDX file
+        filename: Path to the NDX file, or an NDXFile from ndx_file_open
         min_value: Minimum value (inclusive)
         max_value: Maximum value (inclusive)
         max_count: Maximum number of results to return
@@ -759,7 +824,7 @@ def ndx_find_number_range(filename: str, min_value: int, max_value: int, max_cou
     Returns:
         List of record numbers in the range
     """
-    header = ndx_read_header(filename)
+    header = _source_header(filename)
     if not header:
         return []
     
@@ -769,30 +834,23 @@ def ndx_find_number_range(filename: str, min_value: int, max_value: int, max_cou
     if min_value > max_value:
         return []
     
-    # Convert values to 8-byte keys
-    min_key = _make_key8_from_int(min_value)
-    max_key = _make_key8_from_int(max_value)
+    # Convert values to 8-byte keys and rank them for integer compares
+    min_key = _key8_rank(_make_key8_from_int(min_value))
+    max_key = _key8_rank(_make_key8_from_int(max_value))
     
-    # Descend to first entry >= min_value
-    stack, stack_idx, depth = _descend_to_first_ge_number(filename, header, min_key)
-    
-    # Collect all entries in range
-    results = []
+    try:
+        mapped = _open_ndx(filename)
+    except (FileNotFoundError, ValueError):
+        return []
     
-    while len(results) < max_count:
-        success, key_out, recno_out, stack, stack_idx, depth = _next_entry(
-            filename, header, stack, stack_idx, depth)
-        
-        if not success:
-            break
+    with mapped as ndx:
+        # Descend to first entry >= min_value
+        stack, stack_idx, depth = _descend_to_first_ge_number(ndx, header, min_key)
         
-        # Check if still in range
-        key_val = _key_str_to_key8(key_out)
-        if _compare_key8(key_val, max_key) > 0:
-            break  # Beyond max value
-        
-        if recno_out != 0:
-            results.append(recno_out)
+        # Collect all entries up to max_value
+        results = _scan_leaves(ndx, header, stack, stack_idx, depth,
+                               lambda key: _key8_rank(key) <= max_key,
+                               max_count)
     
     return results
 
@@ -860,12 +918,12 @@ def _date_str_to_jdn(date_str: str) -> int:
     return _gregorian_to_jdn(year, month, day)
 
 
-def ndx_find_date_exact(filename: str, date_str: str, max_count: int = 1000) -> List[int]:
+def ndx_find_date_exact(filename: Union[str, NDXFile], date_str: str, max_count: int = 1000) -> List[int]:
     """
     Find all record numbers with exact date match.
     
     Args:
-        filename: Path to the NDX file
+        filename: Path to the NDX file, or an NDXFile from ndx_file_open
         date_str: Date string in format 'YYYY-MM-DD' or 'YYYYMMDD'
         max_count: Maximum number of results to return
         
@@ -880,12 +938,12 @@ def ndx_find_date_exact(filename: str, date_str: str, max_count: int = 1000) ->
     return ndx_find_number_exact(filename, jdn, max_count)
 
 
-def ndx_find_date_range(filename: str, start_date_str: str, end_date_str: str, max_count: int = 10000) -> List[int]:
+def ndx_find_date_range(filename: Union[str, NDXFile], start_date_str: str, end_date_str: str, max_count: int = 10000) -> List[int]:
     """
     Find all record numbers with dates in range [start_date, end_date].
     
     Args:
-        filename: Path to the NDX file
+        filename: Path to the NDX file, or an NDXFile from ndx_file_open
         start_date_str: Start date string in format 'YYYY-MM-DD' or 'YYYYMMDD'
         end_date_str: End date string in format 'YYYY-MM-DD' or 'YYYYMMDD'
         max_count: Maximum number of results to return
@@ -914,10 +972,11 @@ def ndx_create_index(dbf_filename: str, field_name: str, output_filename: str =
     Returns:
         True if successful, False otherwise
     """
-    from dbf_module import dbf_file_open, dbf_file_close, dbf_file_seek_to_first_row, dbf_file_read_row
+    from dbf_module import dbf_file_open, dbf_file_close, dbf_file_iter_rows, dbf_file_get_field_raw
     
-    # Open DBF file
-    dbf = dbf_file_open(dbf_filename)
+    # Open DBF file read-only through a mapping: rows come from the OS page
+    # cache, so repeated builds over the same DBF do not re-read it from disk
+    dbf = dbf_file_open(dbf_filename, use_mmap=True)
     if not dbf:
         return False
     
@@ -957,30 +1016,17 @@ def ndx_create_index(dbf_filename: str, field_name: str, output_filename: str =
         if keys_max <= 0 or keys_max > NDX_MAX_KEYS:
             return False
         
-        # Read all rows and extract keys
+        # Read all rows and extract keys; only the indexed field is decoded
         entries = []
-        row_count = dbf.header.record_count
         
-        dbf_file_seek_to_first_row(dbf)
-        
-        for row_idx in range(row_count):
-            row = dbf_file_read_row(dbf)
-            
-            # Check if deleted (first element is '*')
-            if len(row) > 0 and row[0] == '*':
+        for row_idx, row in enumerate(dbf_file_iter_rows(dbf, raw=True)):
+            # Check if deleted (first byte is '*')
+            if row[0] == 0x2A:
                 continue
             
-            # Get field value (skip deletion marker at index 0)
-            # Field indices are offset by 1 because row[0] is the deletion marker
-            actual_field_idx = field_idx + 1
-            if actual_field_idx < len(row):
-                value = row[actual_field_idx]
-                if isinstance(value, str):
-                    key_str = value.strip()
-                else:
-                    key_str = str(value).strip()
-            else:
-                key_str = ''
+            # Field indices are 1-based because byte 0 is the deletion marker
+            value = dbf_file_get_field_raw(row, dbf, field_idx + 1)
+            key_str = bytes(value).decode('utf-8', errors='replace').strip()
             
             # For date fields, convert to Julian Day Number
             if field_type == 'D' and key_str:
@@ -1026,7 +1072,12 @@ def ndx_create_index(dbf_filename: str, field_name: str, output_filename: str =
             output_filename = f"{base_name}.NDX"
         
         # Create the index
-        _write_ndx_file(output_filename, entries, key_len, keys_max, group_len, field_name.lower())
+        try:
+            _write_ndx_file(output_filename, entries, key_len, keys_max, group_len, field_name.lower())
+        finally:
+            # A rewrite can keep the old size and (on coarse-mtime filesystems
+            # such as FAT) the old mtime, so drop any cached header
+            _read_header_cached.cache_clear()
         
         return True
         
@@ -1178,11 +1229,8 @@ def _write_leaf_node(f, block: int, entries: List[dict], key_len: int, group_len
     # Each entry is group_len bytes total
     pos = 4
     for entry in entries:
-        # Child pointer (4 bytes, always 0 for leaf)
-        _set_long_le(buf, pos, 0)
-        
-        # Record number (4 bytes, little-endian)
-        _set_long_le(buf, pos + 4, entry['recno'])
+        # Child pointer (4 bytes, always 0 for leaf) and record number
+        _S_CHILD_RECNO.pack_into(buf, pos, 0, entry['recno'] & 0xFFFFFFFF)
         
         # Key (key_len bytes)
         key_str = entry['key']
@@ -1215,11 +1263,8 @@ def _write_internal_node(f, block: int, entries: List[dict], child_blocks: List[
     # Each entry is group_len bytes total
     pos = 4
     for i, entry in enumerate(entries):
-        # Child pointer
-        _set_long_le(buf, pos, child_blocks[i])
-        
-        # Record number (always 0 for internal nodes)
-        _set_long_le(buf, pos + 4, 0)
+        # Child pointer and record number (always 0 for internal nodes)
+        _S_CHILD_RECNO.pack_into(buf, pos, child_blocks[i] & 0xFFFFFFFF, 0)
         
         # Key (key_len bytes)
         key_str = entry['key']
@@ -1241,20 +1286,17 @@ def _write_internal_node(f, block: int, entries: List[dict], child_blocks: List[
 
 def _set_word_le(buf: bytearray, offset: int, value: int):
     """Set a 16-bit little-endian word."""
-    buf[offset] = value & 0xFF
-    buf[offset + 1] = (value >> 8) & 0xFF
+    struct.pack_into('<H', buf, offset, value & 0xFFFF)
 
 
 def _set_long_le(buf: bytearray, offset: int, value: int):
     """Set a 32-bit little-endian long."""
-    buf[offset] = value & 0xFF
-    buf[offset + 1] = (value >> 8) & 0xFF
-    buf[offset + 2] = (value >> 16) & 0xFF
-    buf[offset + 3] = (value >> 24) & 0xFF
+    struct.pack_into('<I', buf, offset, value & 0xFFFFFFFF)
 
 
 __all__ = [
-    'NDXHeader', 'NDXNode',
+    'NDXHeader', 'NDXNode', 'NDXFile',
+    'ndx_file_open', 'ndx_file_close',
     'ndx_read_header', 'ndx_read_node',
     'ndx_is_leaf_node', 'ndx_clean_key',
     'ndx_dump_first_entries',
@@ -4,11 +4,14 @@ Tests all field types: Character, Number, Decimal, Logical, Date, and Memo.
 """
 
 import os
+import shutil
+import tempfile
 import unittest
 from dbf_module import (
     DBFColumn, DBFHeader, DBFFile,
     dbf_file_create, dbf_file_close, dbf_file_open,
-    dbf_file_append_row, dbf_file_read_row, dbf_file_write_row, dbf_file_seek_to_row,
+    dbf_file_append_row, dbf_file_append_rows, dbf_file_iter_rows, dbf_file_read_row,
+    dbf_file_get_field_raw, dbf_file_write_row, dbf_file_seek_to_row,
     dbf_file_seek_to_first_row, dbf_file_get_actual_row_count,
     dbf_file_set_row_deleted, dbf_file_get_field_str, dbf_file_set_field_str,
     dbf_memo_write, dbf_memo_read_small, trim_string,
@@ -53,26 +56,14 @@ class TestDBFRowOperations(unittest.TestCase):
     
     def setUp(self):
         """Set up test environment."""
-        self.test_files = []
-        self.test_filename = "test_rows"
+        # Unique per-test directory and name so tests can run in parallel
+        self.test_dir = tempfile.mkdtemp()
+        self.test_filename = os.path.join(
+            self.test_dir, f"rows_{self._testMethodName}_{os.getpid()}")
         
     def tearDown(self):
         """Clean up test files."""
-        for filename in self.test_files:
-            # Remove DBF file
-            if os.path.exists(filename):
-                try:
-                    os.remove(filename)
-                except:
-                    pass
-            
-            # Remove DBT file
-            dbt_file = filename.replace('.DBF', '.DBT')
-            if os.path.exists(dbt_file):
-                try:
-                    os.remove(dbt_file)
-                except:
-                    pass
+        shutil.rmtree(self.test_dir, ignore_errors=True)
     
     def test_row_append_one(self):
         """Test appending one row with all field types (matches TestRowAppendOne)."""
@@ -80,9 +71,6 @@ class TestDBFRowOperations(unittest.TestCase):
         header = init_test_header()
         dbf = dbf_file_create(self.test_filename, header)
         
-        # Add to cleanup
-        self.test_files.append(self.test_filename + ".DBF")
-        
         # Write memo
         memo_text = "Memo alpha"
         memo_block = dbf_memo_write(self.test_filename + ".DBT", 1, memo_text)
@@ -129,9 +117,6 @@ class TestDBFRowOperations(unittest.TestCase):
         header = init_test_header()
         dbf = dbf_file_create(self.test_filename, header)
         
-        # Add to cleanup
-        self.test_files.append(self.test_filename + ".DBF")
-        
         # Row 1: ALPHA with memo
         memo1_text = "Memo alpha"
         memo1_block = dbf_memo_write(self.test_filename + ".DBT", 1, memo1_text)
@@ -212,266 +197,244 @@ class TestDBFRowOperations(unittest.TestCase):
         # Close file
         dbf_file_close(dbf)
     
-    def test_row_seek(self):
-        """Test seeking to rows in random order (matches TestRowSeek)."""
-        # Create database and add 4 rows
-        header = init_test_header()
-        dbf = dbf_file_create(self.test_filename, header)
-        
-        # Add to cleanup
-        self.test_files.append(self.test_filename + ".DBF")
+    def _append_fixture_rows(self, dbf):
+        """
+        Append the shared 4-row fixture (ALPHA, BRAVO, CHARLIE, DELTA).
         
-        # Add the same 4 rows as in test_row_append_multiple
+        Returns:
+            Tuple of memo block numbers for rows 1-3 (row 4 has no memo)
+        """
         # Row 1: ALPHA with memo
-        memo1_text = "Memo alpha"
-        memo1_block = dbf_memo_write(self.test_filename + ".DBT", 1, memo1_text)
-        values1 = ['', 'ALPHA', '1', '2.2', 'T', '20240115', str(memo1_block)]
+        memo1_block = dbf_memo_write(self.test_filename + ".DBT", 1, "Memo alpha")
+        values1 = ['', 'ALPHA', 1, '2.2', 'T', '20240115', memo1_block]
         dbf_file_append_row(dbf, values1)
         
         # Row 2: BRAVO with memo
-        memo2_text = "Memo bravo"
-        memo2_block = dbf_memo_write(self.test_filename + ".DBT", 1, memo2_text)
-        values2 = ['', 'BRAVO', '33', '4.4', 'F', '20240216', str(memo2_block)]
+        memo2_block = dbf_memo_write(self.test_filename + ".DBT", 1, "Memo bravo")
+        values2 = ['', 'BRAVO', 33, '4.4', 'F', '20240216', memo2_block]
         dbf_file_append_row(dbf, values2)
         
         # Row 3: CHARLIE with memo
-        memo3_text = "Memo charlie"
-        memo3_block = dbf_memo_write(self.test_filename + ".DBT", 1, memo3_text)
-        values3 = ['', 'CHARLIE', '555', '16.6', 'T', '20240317', str(memo3_block)]
+        memo3_block = dbf_memo_write(self.test_filename + ".DBT", 1, "Memo charlie")
+        values3 = ['', 'CHARLIE', 555, '16.6', 'T', '20240317', memo3_block]
         dbf_file_append_row(dbf, values3)
         
         # Row 4: DELTA without memo
-        values4 = ['', 'DELTA', '7', '0.7', 'F', '20240418', '0']
+        values4 = ['', 'DELTA', 7, '0.7', 'F', '20240418', 0]
         dbf_file_append_row(dbf, values4)
         
-        # Test 1: Seek to first row
-        dbf_file_seek_to_first_row(dbf)
-        row = dbf_file_read_row(dbf)
-        self.assertEqual(row[1].strip(), 'ALPHA')
-        self.assertEqual(row[2].strip(), '1')
-        self.assertEqual(row[3].strip(), '2.2')
-        self.assertEqual(row[4].strip(), 'T')
-        self.assertEqual(row[5].strip(), '20240115')
-        self.assertEqual(row[6].strip(), str(memo1_block))
-        
-        # Verify first row memo
-        _, memo1 = dbf_memo_read_small(self.test_filename + ".DBT", memo1_block)
-        self.assertEqual(memo1, memo1_text)
-        
-        # Test 2: Get row count and seek to last row
-        row_count = dbf_file_get_actual_row_count(dbf)
-        self.assertGreater(row_count, 0)
-        self.assertEqual(row_count, 4)
-        
-        # Seek to last row (row_count - 1)
-        dbf_file_seek_to_row(dbf, row_count - 1)
-        last_row = dbf_file_read_row(dbf)
-        self.assertEqual(last_row[1].strip(), 'DELTA')
-        self.assertEqual(last_row[2].strip(), '7')
-        self.assertEqual(last_row[3].strip(), '0.7')
-        self.assertEqual(last_row[4].strip(), 'F')
-        self.assertEqual(last_row[5].strip(), '20240418')
-        self.assertEqual(last_row[6].strip(), '0')  # No memo
-        
-        # Test 3: Seek to row 2 (CHARLIE - index 2)
-        dbf_file_seek_to_row(dbf, 2)
-        row3 = dbf_file_read_row(dbf)
-        self.assertEqual(row3[1].strip(), 'CHARLIE')
-        self.assertEqual(row3[2].strip(), '555')
-        self.assertEqual(row3[3].strip(), '16.6')
-        self.assertEqual(row3[4].strip(), 'T')
-        self.assertEqual(row3[5].strip(), '20240317')
-        self.assertEqual(row3[6].strip(), str(memo3_block))
-        
-        # Verify row 3 memo
-        _, memo3 = dbf_memo_read_small(self.test_filename + ".DBT", memo3_block)
-        self.assertEqual(memo3, memo3_text)
-        
-        # Close file
-        dbf_file_close(dbf)
+        return memo1_block, memo2_block, memo3_block
     
-    def test_row_delete(self):
-        """Test deleting and undeleting rows (matches TestRowDelete)."""
+    def test_row_operations_on_fixture(self):
+        """
+        Test seek, delete, update and update-by-field on one 4-row fixture.
+        
+        Matches TestRowSeek, TestRowDelete, TestRowUpdate and TestRowUpdateByField.
+        The fixture is built once; each operation runs as its own subTest in an
+        order where earlier steps leave the rows later steps read unchanged.
+        """
         # Create database and add 4 rows
         header = init_test_header()
         dbf = dbf_file_create(self.test_filename, header)
         
-        # Add to cleanup
-        self.test_files.append(self.test_filename + ".DBF")
-        
-        # Add the same 4 rows
-        # Row 1: ALPHA with memo
-        memo1_text = "Memo alpha"
-        memo1_block = dbf_memo_write(self.test_filename + ".DBT", 1, memo1_text)
-        values1 = ['', 'ALPHA', '1', '2.2', 'T', '20240115', str(memo1_block)]
-        dbf_file_append_row(dbf, values1)
-        
-        # Row 2: BRAVO with memo
-        memo2_text = "Memo bravo"
-        memo2_block = dbf_memo_write(self.test_filename + ".DBT", 1, memo2_text)
-        values2 = ['', 'BRAVO', '33', '4.4', 'F', '20240216', str(memo2_block)]
-        dbf_file_append_row(dbf, values2)
-        
-        # Row 3: CHARLIE with memo
-        memo3_text = "Memo charlie"
-        memo3_block = dbf_memo_write(self.test_filename + ".DBT", 1, memo3_text)
-        values3 = ['', 'CHARLIE', '555', '16.6', 'T', '20240317', str(memo3_block)]
-        dbf_file_append_row(dbf, values3)
-        
-        # Row 4: DELTA without memo
-        values4 = ['', 'DELTA', '7', '0.7', 'F', '20240418', '0']
-        dbf_file_append_row(dbf, values4)
-        
-        # Test 1: Delete row 1 (BRAVO - index 1)
-        dbf_file_set_row_deleted(dbf, 1, True)
-        
-        # Read row 1 and verify delete flag
-        dbf_file_seek_to_row(dbf, 1)
-        row = dbf_file_read_row(dbf)
-        self.assertEqual(row[0], '*', "Row should be marked as deleted")
-        self.assertEqual(row[1].strip(), 'BRAVO')  # Data still there
-        
-        # Test 2: Undelete row 1
-        dbf_file_set_row_deleted(dbf, 1, False)
-        
-        # Read row 1 and verify delete flag is cleared
-        dbf_file_seek_to_row(dbf, 1)
-        row = dbf_file_read_row(dbf)
-        self.assertEqual(row[0], ' ', "Row should not be marked as deleted")
-        self.assertEqual(row[1].strip(), 'BRAVO')
+        memo1_block, memo2_block, memo3_block = self._append_fixture_rows(dbf)
+        
+        with self.subTest("seek"):
+            # Seek to first row
+            dbf_file_seek_to_first_row(dbf)
+            row = dbf_file_read_row(dbf)
+            self.assertEqual(row[1].strip(), 'ALPHA')
+            self.assertEqual(row[2].strip(), '1')
+            self.assertEqual(row[3].strip(), '2.2')
+            self.assertEqual(row[4].strip(), 'T')
+            self.assertEqual(row[5].strip(), '20240115')
+            self.assertEqual(row[6].strip(), str(memo1_block))
+            
+            # Verify first row memo
+            _, memo1 = dbf_memo_read_small(self.test_filename + ".DBT", memo1_block)
+            self.assertEqual(memo1, "Memo alpha")
+            
+            # Get row count and seek to last row
+            row_count = dbf_file_get_actual_row_count(dbf)
+            self.assertGreater(row_count, 0)
+            self.assertEqual(row_count, 4)
+            
+            # Seek to last row (row_count - 1)
+            dbf_file_seek_to_row(dbf, row_count - 1)
+            last_row = dbf_file_read_row(dbf)
+            self.assertEqual(last_row[1].strip(), 'DELTA')
+            self.assertEqual(last_row[2].strip(), '7')
+            self.assertEqual(last_row[3].strip(), '0.7')
+            self.assertEqual(last_row[4].strip(), 'F')
+            self.assertEqual(last_row[5].strip(), '20240418')
+            self.assertEqual(last_row[6].strip(), '0')  # No memo
+            
+            # Seek to row 2 (CHARLIE - index 2)
+            dbf_file_seek_to_row(dbf, 2)
+            row3 = dbf_file_read_row(dbf)
+            self.assertEqual(row3[1].strip(), 'CHARLIE')
+            self.assertEqual(row3[2].strip(), '555')
+            self.assertEqual(row3[3].strip(), '16.6')
+            self.assertEqual(row3[4].strip(), 'T')
+            self.assertEqual(row3[5].strip(), '20240317')
+            self.assertEqual(row3[6].strip(), str(memo3_block))
+            
+            # Verify row 3 memo
+            _, memo3 = dbf_memo_read_small(self.test_filename + ".DBT", memo3_block)
+            self.assertEqual(memo3, "Memo charlie")
         
-        # Test 3: Verify row count
-        row_count = dbf_file_get_actual_row_count(dbf)
-        self.assertEqual(row_count, 4, "Row count should be 4")
+        with self.subTest("delete"):
+            # Delete row 1 (BRAVO - index 1)
+            dbf_file_set_row_deleted(dbf, 1, True)
+            
+            # Read row 1 and verify delete flag
+            dbf_file_seek_to_row(dbf, 1)
+            row = dbf_file_read_row(dbf)
+            self.assertEqual(row[0], '*', "Row should be marked as deleted")
+            self.assertEqual(row[1].strip(), 'BRAVO')  # Data still there
+            
+            # Undelete row 1
+            dbf_file_set_row_deleted(dbf, 1, False)
+            
+            # Read row 1 and verify delete flag is cleared
+            dbf_file_seek_to_row(dbf, 1)
+            row = dbf_file_read_row(dbf)
+            self.assertEqual(row[0], ' ', "Row should not be marked as deleted")
+            self.assertEqual(row[1].strip(), 'BRAVO')
+            
+            # Verify row count
+            row_count = dbf_file_get_actual_row_count(dbf)
+            self.assertEqual(row_count, 4, "Row count should be 4")
+        
+        with self.subTest("update"):
+            # Update row 2 (CHARLIE - index 2) with new values
+            dbf_file_seek_to_row(dbf, 2)
+            memo_lambda = dbf_memo_write(self.test_filename + ".DBT", 1, "Memo lambda")
+            self.assertGreater(memo_lambda, 0)
+            
+            new_values = ['', 'LAMBDA', '909', '28.8', 'F', '20200103', str(memo_lambda)]
+            dbf_file_write_row(dbf, new_values)
+            
+            # Read back and verify
+            dbf_file_seek_to_row(dbf, 2)
+            row = dbf_file_read_row(dbf)
+            self.assertEqual(row[1].strip(), 'LAMBDA')
+            self.assertEqual(row[2].strip(), '909')
+            self.assertEqual(row[3].strip(), '28.8')
+            self.assertEqual(row[4].strip(), 'F')
+            self.assertEqual(row[5].strip(), '20200103')
+            self.assertEqual(row[6].strip(), str(memo_lambda))
+            
+            # Verify memo
+            _, memo = dbf_memo_read_small(self.test_filename + ".DBT", memo_lambda)
+            self.assertEqual(memo, "Memo lambda")
+        
+        with self.subTest("update_by_field"):
+            # Read row 1 (BRAVO - index 1)
+            dbf_file_seek_to_row(dbf, 1)
+            row = dbf_file_read_row(dbf)
+            
+            # Update specific fields
+            dbf_file_set_field_str(row, dbf, 1, 'BRAVO2')     # Field 1: TEXT
+            dbf_file_set_field_str(row, dbf, 3, '7.7')        # Field 3: DECIMAL
+            dbf_file_set_field_str(row, dbf, 4, 'T')          # Field 4: FLAG
+            
+            # Write new memo
+            memo_updated = dbf_memo_write(self.test_filename + ".DBT", 1, "Memo bravo updated")
+            self.assertGreater(memo_updated, 0)
+            dbf_file_set_field_str(row, dbf, 6, str(memo_updated))  # Field 6: MEMO
+            
+            # Build values array from updated row
+            values = ['']  # Index 0 is ignored
+            for i in range(1, 7):
+                values.append(trim_string(dbf_file_get_field_str(row, dbf, i)))
+            
+            # Write the updated row back
+            dbf_file_seek_to_row(dbf, 1)
+            dbf_file_write_row(dbf, values)
+            
+            # Read back and verify
+            dbf_file_seek_to_row(dbf, 1)
+            row = dbf_file_read_row(dbf)
+            self.assertEqual(row[1].strip(), 'BRAVO2')
+            self.assertEqual(row[2].strip(), '33')  # Unchanged
+            self.assertEqual(row[3].strip(), '7.7')
+            self.assertEqual(row[4].strip(), 'T')
+            self.assertEqual(row[5].strip(), '20240216')  # Unchanged
+            self.assertEqual(row[6].strip(), str(memo_updated))
+            
+            # Verify memo
+            _, memo = dbf_memo_read_small(self.test_filename + ".DBT", memo_updated)
+            self.assertEqual(memo, "Memo bravo updated")
         
         # Close file
         dbf_file_close(dbf)
     
-    def test_row_update(self):
-        """Test updating an entire row (matches TestRowUpdate)."""
-        # Create database and add 4 rows
+    def test_append_rows_bulk(self):
+        """Test appending several rows with one bulk write."""
+        # Create database
         header = init_test_header()
         dbf = dbf_file_create(self.test_filename, header)
         
-        # Add to cleanup
-        self.test_files.append(self.test_filename + ".DBF")
-        
-        # Add the same 4 rows
-        # Row 1: ALPHA with memo
-        memo1_text = "Memo alpha"
-        memo1_block = dbf_memo_write(self.test_filename + ".DBT", 1, memo1_text)
-        values1 = ['', 'ALPHA', '1', '2.2', 'T', '20240115', str(memo1_block)]
-        dbf_file_append_row(dbf, values1)
-        
-        # Row 2: BRAVO with memo
-        memo2_text = "Memo bravo"
-        memo2_block = dbf_memo_write(self.test_filename + ".DBT", 1, memo2_text)
-        values2 = ['', 'BRAVO', '33', '4.4', 'F', '20240216', str(memo2_block)]
-        dbf_file_append_row(dbf, values2)
-        
-        # Row 3: CHARLIE with memo
-        memo3_text = "Memo charlie"
-        memo3_block = dbf_memo_write(self.test_filename + ".DBT", 1, memo3_text)
-        values3 = ['', 'CHARLIE', '555', '16.6', 'T', '20240317', str(memo3_block)]
-        dbf_file_append_row(dbf, values3)
+        rows = [
+            ['', 'ALPHA', '1', '2.2', 'T', '20240115', '0'],
+            ['', 'BRAVO', 33, '4.4', 'F', '20240216', 0],
+            ['', 'CHARLIE', '555', '16.6', 'T', '20240317', '0'],
+        ]
+        dbf_file_append_rows(dbf, rows)
         
-        # Row 4: DELTA without memo
-        values4 = ['', 'DELTA', '7', '0.7', 'F', '20240418', '0']
-        dbf_file_append_row(dbf, values4)
+        # Record count is updated in memory and on disk
+        self.assertEqual(dbf_file_get_actual_row_count(dbf), 3)
+        dbf_file_close(dbf)
         
-        # Update row 2 (CHARLIE - index 2) with new values
-        dbf_file_seek_to_row(dbf, 2)
-        memo_lambda = dbf_memo_write(self.test_filename + ".DBT", 1, "Memo lambda")
-        self.assertGreater(memo_lambda, 0)
+        dbf = dbf_file_open(self.test_filename + ".DBF")
+        self.assertEqual(dbf.header.record_count, 3)
         
-        new_values = ['', 'LAMBDA', '909', '28.8', 'F', '20200103', str(memo_lambda)]
-        dbf_file_write_row(dbf, new_values)
+        # Rows read back in order
+        dbf_file_seek_to_row(dbf, 1)
+        row = dbf_file_read_row(dbf)
+        self.assertEqual(row[1].strip(), 'BRAVO')
+        self.assertEqual(row[2].strip(), '33')
         
-        # Read back and verify
-        dbf_file_seek_to_row(dbf, 2)
+        # A single-row append after the bulk append still lands at the end
+        dbf_file_append_row(dbf, ['', 'DELTA', '7', '0.7', 'F', '20240418', '0'])
+        dbf_file_seek_to_row(dbf, 3)
         row = dbf_file_read_row(dbf)
-        self.assertEqual(row[1].strip(), 'LAMBDA')
-        self.assertEqual(row[2].strip(), '909')
-        self.assertEqual(row[3].strip(), '28.8')
-        self.assertEqual(row[4].strip(), 'F')
-        self.assertEqual(row[5].strip(), '20200103')
-        self.assertEqual(row[6].strip(), str(memo_lambda))
+        self.assertEqual(row[1].strip(), 'DELTA')
         
-        # Verify memo
-        _, memo = dbf_memo_read_small(self.test_filename + ".DBT", memo_lambda)
-        self.assertEqual(memo, "Memo lambda")
+        # File ends with the EOF marker right after the last record
+        dbf.file.seek(0, 2)
+        self.assertEqual(dbf.file.tell(), dbf.header.header_size + 4 * dbf.header.record_size + 1)
         
         # Close file
         dbf_file_close(dbf)
     
-    def test_row_update_by_field(self):
-        """Test updating specific fields in a row (matches TestRowUpdateByField)."""
-        # Create database and add 4 rows
+    def test_iter_rows(self):
+        """Test the buffered forward scan matches per-row reads."""
+        # Create database with more rows than fit in one 4KB chunk
         header = init_test_header()
         dbf = dbf_file_create(self.test_filename, header)
-        
-        # Add to cleanup
-        self.test_files.append(self.test_filename + ".DBF")
-        
-        # Add the same 4 rows
-        # Row 1: ALPHA with memo
-        memo1_text = "Memo alpha"
-        memo1_block = dbf_memo_write(self.test_filename + ".DBT", 1, memo1_text)
-        values1 = ['', 'ALPHA', '1', '2.2', 'T', '20240115', str(memo1_block)]
-        dbf_file_append_row(dbf, values1)
-        
-        # Row 2: BRAVO with memo
-        memo2_text = "Memo bravo"
-        memo2_block = dbf_memo_write(self.test_filename + ".DBT", 1, memo2_text)
-        values2 = ['', 'BRAVO', '33', '4.4', 'F', '20240216', str(memo2_block)]
-        dbf_file_append_row(dbf, values2)
-        
-        # Row 3: CHARLIE with memo
-        memo3_text = "Memo charlie"
-        memo3_block = dbf_memo_write(self.test_filename + ".DBT", 1, memo3_text)
-        values3 = ['', 'CHARLIE', '555', '16.6', 'T', '20240317', str(memo3_block)]
-        dbf_file_append_row(dbf, values3)
-        
-        # Row 4: DELTA without memo
-        values4 = ['', 'DELTA', '7', '0.7', 'F', '20240418', '0']
-        dbf_file_append_row(dbf, values4)
-        
-        # Read row 1 (BRAVO - index 1)
-        dbf_file_seek_to_row(dbf, 1)
-        row = dbf_file_read_row(dbf)
-        
-        # Update specific fields
-        dbf_file_set_field_str(row, dbf, 1, 'BRAVO2')     # Field 1: TEXT
-        dbf_file_set_field_str(row, dbf, 3, '7.7')        # Field 3: DECIMAL
-        dbf_file_set_field_str(row, dbf, 4, 'T')          # Field 4: FLAG
-        
-        # Write new memo
-        memo_updated = dbf_memo_write(self.test_filename + ".DBT", 1, "Memo bravo updated")
-        self.assertGreater(memo_updated, 0)
-        dbf_file_set_field_str(row, dbf, 6, str(memo_updated))  # Field 6: MEMO
-        
-        # Build values array from updated row
-        values = ['']  # Index 0 is ignored
-        for i in range(1, 7):
-            values.append(trim_string(dbf_file_get_field_str(row, dbf, i)))
-        
-        # Write the updated row back
-        dbf_file_seek_to_row(dbf, 1)
-        dbf_file_write_row(dbf, values)
-        
-        # Read back and verify
-        dbf_file_seek_to_row(dbf, 1)
-        row = dbf_file_read_row(dbf)
-        self.assertEqual(row[1].strip(), 'BRAVO2')
-        self.assertEqual(row[2].strip(), '33')  # Unchanged
-        self.assertEqual(row[3].strip(), '7.7')
-        self.assertEqual(row[4].strip(), 'T')
-        self.assertEqual(row[5].strip(), '20240216')  # Unchanged
-        self.assertEqual(row[6].strip(), str(memo_updated))
-        
-        # Verify memo
-        _, memo = dbf_memo_read_small(self.test_filename + ".DBT", memo_updated)
-        self.assertEqual(memo, "Memo bravo updated")
+        row_count = 4096 // header.record_size + 5
+        dbf_file_append_rows(dbf, [
+            ['', f'NAME{i}', i, '1.0', 'T', '20240101', 0] for i in range(row_count)
+        ])
+        
+        # Every row matches what seek + read returns
+        rows = list(dbf_file_iter_rows(dbf))
+        self.assertEqual(len(rows), row_count)
+        for i, row in enumerate(rows):
+            dbf_file_seek_to_row(dbf, i)
+            self.assertEqual(row, dbf_file_read_row(dbf))
+        
+        # Raw scan yields undecoded records; fields are sliced without decoding
+        raw_rows = list(dbf_file_iter_rows(dbf, raw=True))
+        self.assertEqual(len(raw_rows), row_count)
+        for row, raw in zip(rows, raw_rows):
+            self.assertEqual(len(raw), header.record_size)
+            for field_index in range(1, header.field_count + 1):
+                self.assertEqual(dbf_file_get_field_raw(raw, dbf, field_index).tobytes().decode('utf-8'),
+                                 row[field_index])
+        self.assertEqual(dbf_file_get_field_raw(raw_rows[0], dbf, 0).tobytes(), b'')
         
         # Close file
         dbf_file_close(dbf)
@@ -482,9 +445,6 @@ class TestDBFRowOperations(unittest.TestCase):
         header = init_test_header()
         dbf = dbf_file_create(self.test_filename, header)
         
-        # Add to cleanup
-        self.test_files.append(self.test_filename + ".DBF")
-        
         # Add two rows
         memo1_block = dbf_memo_write(self.test_filename + ".DBT", 1, "First memo")
         values1 = ['', 'FIRST', '10', '1.5', 'T', '20240101', str(memo1_block)]
@@ -497,8 +457,8 @@ class TestDBFRowOperations(unittest.TestCase):
         # Close file
         dbf_file_close(dbf)
         
-        # Reopen file
-        dbf2 = dbf_file_open(self.test_filename + ".DBF")
+        # Reopen file (read-only mapping)
+        dbf2 = dbf_file_open(self.test_filename + ".DBF", use_mmap=True)
         
         # Verify header was read correctly
         self.assertEqual(dbf2.header.field_count, 6)
@@ -525,9 +485,6 @@ class TestDBFRowOperations(unittest.TestCase):
         header = init_test_header()
         dbf = dbf_file_create(self.test_filename, header)
         
-        # Add to cleanup
-        self.test_files.append(self.test_filename + ".DBF")
-        
         # Try to write value longer than field length
         # TEXT field is 10 characters
         values = ['', 'VERYLONGTEXT', '1', '1.0', 'T', '20240101', '0']
@@ -543,15 +500,74 @@ class TestDBFRowOperations(unittest.TestCase):
         # Close file
         dbf_file_close(dbf)
     
+    def test_int_values(self):
+        """Test that int values are written right-justified without str()."""
+        # Create database
+        header = init_test_header()
+        dbf = dbf_file_create(self.test_filename, header)
+        
+        # NUMBER and MEMO given as ints
+        values = ['', 'AB', 7, '1.0', 'T', '20240101', 12]
+        dbf_file_append_row(dbf, values)
+        
+        # Read back
+        dbf_file_seek_to_row(dbf, 0)
+        row = dbf_file_read_row(dbf)
+        
+        self.assertEqual(row[2], '  7')
+        self.assertEqual(row[6], '12')
+        
+        # Close file
+        dbf_file_close(dbf)
+    
+    def test_int_values_too_wide(self):
+        """Test that ints wider than their field are rejected, not truncated."""
+        # Create database
+        header = init_test_header()
+        dbf = dbf_file_create(self.test_filename, header)
+        
+        # NUMBER is N(3): neither 12345 nor -1234 fits
+        with self.assertRaises(ValueError):
+            dbf_file_append_row(dbf, ['', 'AB', 12345, '1.0', 'T', '20240101', 0])
+        with self.assertRaises(ValueError):
+            dbf_file_append_row(dbf, ['', 'AB', -1234, '1.0', 'T', '20240101', 0])
+        
+        # Widest values that fit are written whole
+        dbf_file_append_row(dbf, ['', 'AB', 999, '1.0', 'T', '20240101', 0])
+        dbf_file_append_row(dbf, ['', 'AB', -99, '1.0', 'T', '20240101', 0])
+        self.assertEqual(dbf.header.record_count, 2)
+        
+        dbf_file_seek_to_row(dbf, 0)
+        self.assertEqual(dbf_file_read_row(dbf)[2], '999')
+        self.assertEqual(dbf_file_read_row(dbf)[2], '-99')
+        
+        # Close file
+        dbf_file_close(dbf)
+    
+    def test_bool_values_rejected(self):
+        """Test that bools are not written as numbers."""
+        # Create database
+        header = init_test_header()
+        dbf = dbf_file_create(self.test_filename, header)
+        
+        # True in the N field is not 1
+        with self.assertRaises(ValueError):
+            dbf_file_append_row(dbf, ['', 'AB', True, '1.0', 'T', '20240101', 0])
+        
+        # The L field takes 'T'/'F' strings only
+        with self.assertRaises(TypeError):
+            dbf_file_append_row(dbf, ['', 'AB', 1, '1.0', True, '20240101', 0])
+        self.assertEqual(dbf.header.record_count, 0)
+        
+        # Close file
+        dbf_file_close(dbf)
+    
     def test_field_padding(self):
         """Test that short field values are padded with spaces."""
         # Create database
         header = init_test_header()
         dbf = dbf_file_create(self.test_filename, header)
         
-        # Add to cleanup
-        self.test_files.append(self.test_filename + ".DBF")
-        
         # Write short values
         values = ['', 'AB', '1', '1.0', 'T', '20240101', '0']
         dbf_file_append_row(dbf, values)
@@ -645,11 +661,13 @@ def demo_row_operations():
 
 
 if __name__ == "__main__":
-    # Run the demo
-    demo_row_operations()
+    # Run the demo only when asked for (set DBF_RUN_DEMO=1)
+    if os.environ.get('DBF_RUN_DEMO'):
+        demo_row_operations()
+        
+        print("\n" + "=" * 60)
+        print("Running unit tests...")
+        print("=" * 60)
     
     # Run the tests
-    print("\n" + "=" * 60)
-    print("Running unit tests...")
-    print("=" * 60)
     unittest.main()
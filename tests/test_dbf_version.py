@@ -5,6 +5,8 @@ This verifies that the version byte is set correctly based on memo field presenc
 
 import os
 import datetime
+import shutil
+import tempfile
 import unittest
 from dbf_module import (
     DBFColumn, DBFHeader, DBFFile,
@@ -12,273 +14,131 @@ from dbf_module import (
 )
 
 
+def _read_version_byte(path):
+    """Read the version byte (offset 0) of a DBF file without buffered IO."""
+    fd = os.open(path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+    try:
+        return os.read(fd, 1)[0]
+    finally:
+        os.close(fd)
+
+
 class TestDBFVersion(unittest.TestCase):
     """Test cases for DBF version byte validation."""
     
     def setUp(self):
         """Set up test environment."""
-        self.test_files = []
+        # Run each test inside its own scratch directory
+        self.test_dir = tempfile.mkdtemp()
+        self.old_cwd = os.getcwd()
+        os.chdir(self.test_dir)
         
     def tearDown(self):
         """Clean up test files."""
-        for filename in self.test_files:
-            if os.path.exists(filename):
-                try:
-                    os.remove(filename)
-                except:
-                    pass
-            
-            # Also try to remove memo file if it exists
-            memo_file = filename.replace('.DBF', '.DBT')
-            if os.path.exists(memo_file):
-                try:
-                    os.remove(memo_file)
-                except:
-                    pass
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.test_dir, ignore_errors=True)
     
-    def test_dbase4_without_memo(self):
-        """Test that dBase IV without memo fields has version 0x04."""
-        # Define fields without memo
-        fields = [
-            DBFColumn(name="ID", field_type="N", length=5, decimals=0),
-            DBFColumn(name="NAME", field_type="C", length=30, decimals=0),
-            DBFColumn(name="ACTIVE", field_type="L", length=1, decimals=0)
-        ]
-        
+    def _check_version(self, fields, requested_version, expected_version, expect_memo,
+                       use_dbase3=False, reopen=False):
+        """Create a DBF with the given fields and verify its version byte and memo file."""
         # Create header
         header = DBFHeader()
         header.fields = fields
         header.field_count = len(fields)
-        header.version = 0x04  # Force dBase IV
+        if requested_version is not None:
+            header.version = requested_version
         
         # Create the file
-        filename = "test_v4_no_memo"
-        dbf = dbf_file_create(filename, header)
+        filename = f"test_{self._testMethodName}"
+        if use_dbase3:
+            dbf = dbf_file_create_dbase3(filename, header)
+        else:
+            dbf = dbf_file_create(filename, header)
         
         # Verify version in memory
-        self.assertEqual(dbf.header.version, 0x04, "Version should be 0x04 for dBase IV without memo")
+        self.assertEqual(dbf.header.version, expected_version,
+                         f"Version should be 0x{expected_version:02X}")
         
         # Close the file
         dbf_file_close(dbf)
         
-        # Add to cleanup list
-        self.test_files.append(filename + ".DBF")
-        
         # Read binary file and check version byte
-        with open(filename + ".DBF", "rb") as f:
-            version_byte = f.read(1)[0]
-        
-        self.assertEqual(version_byte, 0x04, "Version byte should be 0x04 in file")
+        version_byte = _read_version_byte(filename + ".DBF")
+        self.assertEqual(version_byte, expected_version,
+                         f"Version byte should be 0x{expected_version:02X} in file")
         
-        # Verify no memo file was created
-        self.assertFalse(os.path.exists(filename + ".DBT"), "No memo file should be created")
+        # Verify memo file presence
+        self.assertEqual(os.path.exists(filename + ".DBT"), expect_memo,
+                         "Memo file should be created" if expect_memo else "No memo file should be created")
         
-        # Reopen and verify
-        dbf = dbf_file_open(filename)
-        self.assertEqual(dbf.header.version, 0x04, "Version should be 0x04 after reopen")
-        dbf_file_close(dbf)
+        # Reopen and verify (the raw byte check above already covers persistence)
+        if reopen:
+            dbf = dbf_file_open(filename)
+            self.assertEqual(dbf.header.version, expected_version,
+                             f"Version should be 0x{expected_version:02X} after reopen")
+            dbf_file_close(dbf)
+    
+    def test_dbase4_without_memo(self):
+        """Test that dBase IV without memo fields has version 0x04."""
+        fields = [
+            DBFColumn(name="ID", field_type="N", length=5, decimals=0),
+            DBFColumn(name="NAME", field_type="C", length=30, decimals=0),
+            DBFColumn(name="ACTIVE", field_type="L", length=1, decimals=0)
+        ]
+        self._check_version(fields, 0x04, 0x04, expect_memo=False)
     
     def test_dbase4_with_memo(self):
         """Test that dBase IV with memo fields has version 0x05."""
-        # Define fields with memo
         fields = [
             DBFColumn(name="ID", field_type="N", length=5, decimals=0),
             DBFColumn(name="NAME", field_type="C", length=30, decimals=0),
             DBFColumn(name="NOTES", field_type="M", length=10, decimals=0)  # Memo field
         ]
-        
-        # Create header - start with version 0x04
-        header = DBFHeader()
-        header.fields = fields
-        header.field_count = len(fields)
-        header.version = 0x04  # Start with dBase IV
-        
-        # Create the file - should automatically upgrade to 0x05
-        filename = "test_v4_with_memo"
-        dbf = dbf_file_create(filename, header)
-        
-        # Verify version was upgraded to 0x05
-        self.assertEqual(dbf.header.version, 0x05, "Version should be 0x05 for dBase IV with memo")
-        
-        # Close the file
-        dbf_file_close(dbf)
-        
-        # Add to cleanup list
-        self.test_files.append(filename + ".DBF")
-        
-        # Read binary file and check version byte
-        with open(filename + ".DBF", "rb") as f:
-            version_byte = f.read(1)[0]
-        
-        self.assertEqual(version_byte, 0x05, "Version byte should be 0x05 in file")
-        
-        # Verify memo file was created
-        self.assertTrue(os.path.exists(filename + ".DBT"), "Memo file should be created")
-        
-        # Reopen and verify
-        dbf = dbf_file_open(filename)
-        self.assertEqual(dbf.header.version, 0x05, "Version should be 0x05 after reopen")
-        dbf_file_close(dbf)
+        # Requested 0x04 is upgraded to 0x05
+        self._check_version(fields, 0x04, 0x05, expect_memo=True, reopen=True)
     
     def test_dbase5_without_memo_downgrade(self):
         """Test that dBase V without memo fields downgrades to 0x04."""
-        # Define fields without memo
         fields = [
             DBFColumn(name="ID", field_type="N", length=5, decimals=0),
             DBFColumn(name="NAME", field_type="C", length=30, decimals=0)
         ]
-        
-        # Create header with version 0x05
-        header = DBFHeader()
-        header.fields = fields
-        header.field_count = len(fields)
-        header.version = 0x05  # Start with dBase V
-        
-        # Create the file - should automatically downgrade to 0x04
-        filename = "test_v5_no_memo"
-        dbf = dbf_file_create(filename, header)
-        
-        # Verify version was downgraded to 0x04
-        self.assertEqual(dbf.header.version, 0x04, "Version should be 0x04 when no memo fields")
-        
-        # Close the file
-        dbf_file_close(dbf)
-        
-        # Add to cleanup list
-        self.test_files.append(filename + ".DBF")
-        
-        # Read binary file and check version byte
-        with open(filename + ".DBF", "rb") as f:
-            version_byte = f.read(1)[0]
-        
-        self.assertEqual(version_byte, 0x04, "Version byte should be 0x04 in file")
-        
-        # Verify no memo file was created
-        self.assertFalse(os.path.exists(filename + ".DBT"), "No memo file should be created")
+        # Requested 0x05 is downgraded to 0x04
+        self._check_version(fields, 0x05, 0x04, expect_memo=False)
     
     def test_auto_version_with_memo(self):
         """Test that version is auto-set to 0x05 when memo fields present and version is 0."""
-        # Define fields with memo
         fields = [
             DBFColumn(name="ID", field_type="N", length=5, decimals=0),
             DBFColumn(name="NOTES", field_type="M", length=10, decimals=0)
         ]
-        
-        # Create header with version 0 (auto-detect)
-        header = DBFHeader()
-        header.fields = fields
-        header.field_count = len(fields)
-        header.version = 0  # Auto-detect
-        
-        # Create the file
-        filename = "test_auto_memo"
-        dbf = dbf_file_create(filename, header)
-        
-        # Verify version was set to 0x05
-        self.assertEqual(dbf.header.version, 0x05, "Version should be auto-set to 0x05 with memo")
-        
-        # Close the file
-        dbf_file_close(dbf)
-        
-        # Add to cleanup list
-        self.test_files.append(filename + ".DBF")
-        
-        # Verify memo file was created
-        self.assertTrue(os.path.exists(filename + ".DBT"), "Memo file should be created")
+        self._check_version(fields, 0, 0x05, expect_memo=True)
     
     def test_auto_version_without_memo(self):
         """Test that version is auto-set to 0x04 when no memo fields and version is 0."""
-        # Define fields without memo
         fields = [
             DBFColumn(name="ID", field_type="N", length=5, decimals=0),
             DBFColumn(name="NAME", field_type="C", length=30, decimals=0)
         ]
-        
-        # Create header with version 0 (auto-detect)
-        header = DBFHeader()
-        header.fields = fields
-        header.field_count = len(fields)
-        header.version = 0  # Auto-detect
-        
-        # Create the file
-        filename = "test_auto_no_memo"
-        dbf = dbf_file_create(filename, header)
-        
-        # Verify version was set to 0x04
-        self.assertEqual(dbf.header.version, 0x04, "Version should be auto-set to 0x04 without memo")
-        
-        # Close the file
-        dbf_file_close(dbf)
-        
-        # Add to cleanup list
-        self.test_files.append(filename + ".DBF")
-        
-        # Verify no memo file was created
-        self.assertFalse(os.path.exists(filename + ".DBT"), "No memo file should be created")
+        self._check_version(fields, 0, 0x04, expect_memo=False)
     
     def test_dbase3_always_03(self):
         """Test that dBase III files always have version 0x03."""
-        # Define fields
         fields = [
             DBFColumn(name="ID", field_type="N", length=5, decimals=0),
             DBFColumn(name="NAME", field_type="C", length=30, decimals=0)
         ]
-        
-        # Create header
-        header = DBFHeader()
-        header.fields = fields
-        header.field_count = len(fields)
-        
-        # Create dBase III file
-        filename = "test_v3"
-        dbf = dbf_file_create_dbase3(filename, header)
-        
-        # Verify version is 0x03
-        self.assertEqual(dbf.header.version, 0x03, "Version should be 0x03 for dBase III")
-        
-        # Close the file
-        dbf_file_close(dbf)
-        
-        # Add to cleanup list
-        self.test_files.append(filename + ".DBF")
-        
-        # Read binary file and check version byte
-        with open(filename + ".DBF", "rb") as f:
-            version_byte = f.read(1)[0]
-        
-        self.assertEqual(version_byte, 0x03, "Version byte should be 0x03 in file")
+        self._check_version(fields, None, 0x03, expect_memo=False, use_dbase3=True)
     
     def test_multiple_memo_fields(self):
         """Test that multiple memo fields still result in version 0x05."""
-        # Define fields with multiple memo fields
         fields = [
             DBFColumn(name="ID", field_type="N", length=5, decimals=0),
             DBFColumn(name="NOTES", field_type="M", length=10, decimals=0),
             DBFColumn(name="COMMENTS", field_type="M", length=10, decimals=0),
             DBFColumn(name="DESC", field_type="M", length=10, decimals=0)
         ]
-        
-        # Create header
-        header = DBFHeader()
-        header.fields = fields
-        header.field_count = len(fields)
-        header.version = 0  # Auto-detect
-        
-        # Create the file
-        filename = "test_multi_memo"
-        dbf = dbf_file_create(filename, header)
-        
-        # Verify version is 0x05
-        self.assertEqual(dbf.header.version, 0x05, "Version should be 0x05 with multiple memo fields")
-        
-        # Close the file
-        dbf_file_close(dbf)
-        
-        # Add to cleanup list
-        self.test_files.append(filename + ".DBF")
-        
-        # Verify memo file was created
-        self.assertTrue(os.path.exists(filename + ".DBT"), "Memo file should be created")
+        self._check_version(fields, 0, 0x05, expect_memo=True)
 
 
 def demo_version_detection():
@@ -338,10 +198,11 @@ def demo_version_detection():
     
     # Cleanup
     for fname in ["demo_v4_no_memo", "demo_v4_with_memo", "demo_auto"]:
-        if os.path.exists(fname + ".DBF"):
-            os.remove(fname + ".DBF")
-        if os.path.exists(fname + ".DBT"):
-            os.remove(fname + ".DBT")
+        for path in (fname + ".DBF", fname + ".DBT"):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
     
     print("\nDemo completed successfully!")
 
@@ -10,9 +10,12 @@ This test demonstrates:
 """
 
 import os
+import shutil
 import sys
+import tempfile
 import unittest
-from datetime import datetime, timedelta
+from datetime import date, datetime
+from typing import NamedTuple
 
 # Add current directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -20,56 +23,102 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from dbf_module import (
     DBFColumn, DBFHeader, DBFFile,
     dbf_file_create, dbf_file_close, dbf_file_open,
-    dbf_file_append_row, dbf_file_read_row, dbf_file_seek_to_row,
-    dbf_file_get_actual_row_count, dbf_file_get_field_str,
+    dbf_file_append_rows, dbf_file_iter_rows,
+    dbf_file_get_actual_row_count, dbf_file_get_field_raw,
     DBF_LANG_US
 )
 
 from ndx_module import ndx_create_index
 from test_heap_builder import (
-    HeapMap, HeapFieldType, HeapFieldSpec, build_heap_map, DBFRecord,
-    heap_get_word, heap_get_longint, heap_get_bitflag, heap_get_nibble, heap_get_byte
+    HeapMap, HeapFieldType, HeapFieldSpec, build_heap_map,
+    heap_get_word, heap_get_longint, heap_get_bitflag, heap_get_nibble, heap_get_byte,
+    heap_get_column
 )
 from test_progressive_filtering import FilterKind, MatchMode, FilterSpec, MatchGroup
 
 
+class FilterRecord(NamedTuple):
+    """TESTFLTR row with typed fields; tuple index matches the DBF field index"""
+    rec_no: int
+    NAME: str
+    YEAR: int
+    RATING: int
+    DATEADD: str  # Kept as "YYYYMMDD" string for JDN conversion
+    ACTIVE: bool
+    DELETED: bool
+    FLAGS: int
+    
+    @property
+    def values(self):
+        """Positional view (values[0] = RecNo), same shape as DBFRecord.values"""
+        return self
+    
+    def get_field(self, field_idx: int):
+        """Get field by index (0 = RecNo, 1+ = actual fields)"""
+        return self[field_idx] if 0 <= field_idx < len(self) else None
+
+
 class TestFilterIntegration(unittest.TestCase):
     """Test NDX + Heap Map filtering integration"""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.test_filename = "TESTFLTR"
-        self.max_test_records = 100
-        self.created_files = []
+    @classmethod
+    def setUpClass(cls):
+        """Set up the shared DBF, NDX and heap map fixture once per class."""
+        cls.test_filename = "TESTFLTR"
+        cls.max_test_records = 100
+        
+        # Build the fixture inside a scratch directory
+        cls.test_dir = tempfile.mkdtemp()
+        cls.old_cwd = os.getcwd()
+        os.chdir(cls.test_dir)
         
         # Boolean bit definitions - packed into BoolFlags byte
-        self.BOOL_IS_ACTIVE = 0x01   # Bit 0: Active (from ACTIVE field)
-        self.BOOL_IS_DELETED = 0x02   # Bit 1: Deleted (from DELETED field)
+        cls.BOOL_IS_ACTIVE = 0x01   # Bit 0: Active (from ACTIVE field)
+        cls.BOOL_IS_DELETED = 0x02   # Bit 1: Deleted (from DELETED field)
         
         # Numeric flag bit definitions - stored in Flags byte
-        self.FLAG_FEATURED = 0x01      # Bit 0: Featured item
-        self.FLAG_VERIFIED = 0x02      # Bit 1: Verified/approved
-        self.FLAG_ARCHIVED = 0x04      # Bit 2: Archived
-        self.FLAG_FAVORITE = 0x08      # Bit 3: Favorite
+        cls.FLAG_FEATURED = 0x01      # Bit 0: Featured item
+        cls.FLAG_VERIFIED = 0x02      # Bit 1: Verified/approved
+        cls.FLAG_ARCHIVED = 0x04      # Bit 2: Archived
+        cls.FLAG_FAVORITE = 0x08      # Bit 3: Favorite
         
-    def tearDown(self):
+        print("TESTFLTR - Filter Integration Test")
+        print("=" * 50)
+        
+        try:
+            # Step 1: Create test DBF
+            cls.dbf_filename = cls.create_test_dbf()
+            print()
+            
+            # Step 2: Create NDX index
+            cls.ndx_filename = cls.create_ndx_index(cls.dbf_filename)
+            print()
+            
+            # Step 3: Build heap map
+            cls.heap_map = cls.build_heap_map(cls.dbf_filename)
+            print()
+        except Exception:
+            # tearDownClass is not called when setUpClass fails
+            cls.tearDownClass()
+            raise
+    
+    @classmethod
+    def tearDownClass(cls):
         """Clean up created test files (unless KEEP_TEST_FILES is set)."""
+        os.chdir(cls.old_cwd)
+        
         if os.environ.get('KEEP_TEST_FILES'):
-            print("\n📁 Keeping test files for inspection (KEEP_TEST_FILES is set)")
+            print(f"\n📁 Keeping test files for inspection in {cls.test_dir} (KEEP_TEST_FILES is set)")
             return
         
-        # Clean up created files
-        for filename in self.created_files:
-            if os.path.exists(filename):
-                try:
-                    os.remove(filename)
-                    print(f"🗑️  Cleaned up: {filename}")
-                except Exception as e:
-                    print(f"⚠️  Could not remove {filename}: {e}")
+        # Clean up the whole scratch directory
+        shutil.rmtree(cls.test_dir, ignore_errors=True)
+        print(f"🗑️  Cleaned up: {cls.test_dir}")
     
-    def create_test_dbf(self):
+    @classmethod
+    def create_test_dbf(cls):
         """Create test DBF file with sample data."""
-        print(f"Creating test DBF file: {self.test_filename}.DBF")
+        print(f"Creating test DBF file: {cls.test_filename}.DBF")
         
         # Define fields for our test database
         fields = [
@@ -95,68 +144,70 @@ class TestFilterIntegration(unittest.TestCase):
         header.day = now.day
         
         # Create DBF file
-        dbf = dbf_file_create(self.test_filename, header)
-        self.created_files.append(f"{self.test_filename}.DBF")
+        dbf = dbf_file_create(cls.test_filename, header)
         
         # Add sample records
-        print(f"Adding {self.max_test_records} test records...")
-        
-        for rec_no in range(1, self.max_test_records + 1):
-            # NAME field - pattern based on record number
-            if rec_no % 10 == 0:
-                name = "Alpha"
-            elif rec_no % 5 == 0:
-                name = "Beta"
-            elif rec_no % 3 == 0:
-                name = "Gamma"
+        print(f"Adding {cls.max_test_records} test records...")
+        
+        # Per-column value tables, built once so the loop only indexes them
+        # NAME field - pattern based on record number (repeats every 30 records)
+        names = []
+        for k in range(30):
+            if k % 10 == 0:
+                names.append("Alpha")
+            elif k % 5 == 0:
+                names.append("Beta")
+            elif k % 3 == 0:
+                names.append("Gamma")
             else:
-                name = "Delta"
-            
-            # YEAR field - 1980-2025
-            year = 1980 + (rec_no % 45)
-            
-            # RATING field - 1-10
-            rating = 1 + (rec_no % 10)
-            
-            # DATEADD field - dates in 2020s
-            dateadd = datetime(2020, 1, 1) + timedelta(days=rec_no)
-            
-            # ACTIVE field - alternating
-            active = rec_no % 2 == 0
-            
-            # DELETED field - every 4th record
-            deleted = rec_no % 4 == 0
-            
+                names.append("Delta")
+        years = [str(1980 + k) for k in range(45)]  # YEAR field - 1980-2025
+        ratings = [str(1 + k) for k in range(10)]  # RATING field - 1-10
+        flag_strs = [str(k) for k in range(16)]  # FLAGS field - all 4-bit patterns
+        bools = ('F', 'T')
+        
+        # DATEADD field - dates in 2020s, YYYYMMDD built from day ordinals (no strftime)
+        base_ordinal = date(2020, 1, 1).toordinal()
+        dates = [None]  # Indexed by rec_no, which starts at 1
+        for rec_no in range(1, cls.max_test_records + 1):
+            day = date.fromordinal(base_ordinal + rec_no)
+            dates.append(f"{day.year:04d}{day.month:02d}{day.day:02d}")
+        
+        rows = []
+        for rec_no in range(1, cls.max_test_records + 1):
             # FLAGS field - bit patterns based on record number
             flags = 0
             if rec_no % 10 == 0:
-                flags |= self.FLAG_FEATURED
+                flags |= cls.FLAG_FEATURED
             if rec_no % 7 == 0:
-                flags |= self.FLAG_VERIFIED
+                flags |= cls.FLAG_VERIFIED
             if rec_no % 5 == 0:
-                flags |= self.FLAG_ARCHIVED
+                flags |= cls.FLAG_ARCHIVED
             if rec_no % 3 == 0:
-                flags |= self.FLAG_FAVORITE
+                flags |= cls.FLAG_FAVORITE
             
             # Append row (values list is 1-indexed, so values[0] is ignored)
             row_data = [
                 '',  # values[0] is ignored
-                name,  # Field 1: NAME
-                str(year),  # Field 2: YEAR
-                str(rating),  # Field 3: RATING
-                dateadd.strftime('%Y%m%d'),  # Field 4: DATEADD as string
-                'T' if active else 'F',  # Field 5: ACTIVE
-                'T' if deleted else 'F',  # Field 6: DELETED
-                str(flags)  # Field 7: FLAGS
+                names[rec_no % 30],  # Field 1: NAME
+                years[rec_no % 45],  # Field 2: YEAR
+                ratings[rec_no % 10],  # Field 3: RATING
+                dates[rec_no],  # Field 4: DATEADD as string
+                bools[rec_no % 2 == 0],  # Field 5: ACTIVE - alternating
+                bools[rec_no % 4 == 0],  # Field 6: DELETED - every 4th record
+                flag_strs[flags]  # Field 7: FLAGS
             ]
-            dbf_file_append_row(dbf, row_data)
+            rows.append(row_data)
         
+        # Write all records with one bulk append
+        dbf_file_append_rows(dbf, rows)
         dbf_file_close(dbf)
-        print(f"Created {self.max_test_records} records")
+        print(f"Created {cls.max_test_records} records")
         
-        return self.test_filename + ".DBF"
+        return cls.test_filename + ".DBF"
     
-    def create_ndx_index(self, dbf_filename):
+    @classmethod
+    def create_ndx_index(cls, dbf_filename):
         """Create NDX index on NAME field."""
         print(f"Creating NDX index on NAME field...")
         
@@ -164,49 +215,50 @@ class TestFilterIntegration(unittest.TestCase):
         success = ndx_create_index(dbf_filename, 'name', ndx_filename)
         
         if success:
-            self.created_files.append(ndx_filename)
             print(f"NDX index created: {ndx_filename}")
             return ndx_filename
         else:
             raise Exception("Failed to create NDX index")
     
-    def build_heap_map(self, dbf_filename):
+    @classmethod
+    def build_heap_map(cls, dbf_filename):
         """Build heap map from DBF file."""
         print(f"Building heap map from {dbf_filename}...")
         
-        # Open DBF file and read records
+        # More robust string to int conversion of space-padded field bytes
+        def safe_int_convert(s, default=0):
+            s = s.strip()
+            if s.isdigit():
+                return int(s)  # Common case: plain ASCII digits, no exception path
+            try:
+                return int(s) if s else default
+            except (ValueError, TypeError):
+                return default
+        
+        # One forward scan over the raw records, reading only field bytes
         dbf = dbf_file_open(dbf_filename)
         records = []
-        
-        for i in range(dbf_file_get_actual_row_count(dbf)):
-            dbf_file_seek_to_row(dbf, i)
-            row = dbf_file_read_row(dbf)
-            
-            # Create DBFRecord object with proper type conversion
-            # Convert string fields to appropriate types for heap map
-            year_str = dbf_file_get_field_str(row, dbf, 2).strip()
-            rating_str = dbf_file_get_field_str(row, dbf, 3).strip()
-            flags_str = dbf_file_get_field_str(row, dbf, 7).strip()
-            
-            # More robust string to int conversion
-            def safe_int_convert(s, default=0):
-                try:
-                    return int(s) if s else default
-                except (ValueError, TypeError):
-                    return default
-            
-            record = DBFRecord(i, **{
-                'NAME': dbf_file_get_field_str(row, dbf, 1),
-                'YEAR': safe_int_convert(year_str, 0),
-                'RATING': safe_int_convert(rating_str, 0),
-                'DATEADD': dbf_file_get_field_str(row, dbf, 4),  # Keep as string for JDN conversion
-                'ACTIVE': dbf_file_get_field_str(row, dbf, 5) == 'T',
-                'DELETED': dbf_file_get_field_str(row, dbf, 6) == 'T',
-                'FLAGS': safe_int_convert(flags_str, 0),
-            })
-            records.append(record)
-        
-        dbf_file_close(dbf)
+        try:
+            for i, row in enumerate(dbf_file_iter_rows(dbf, raw=True)):
+                name, year, rating, dateadd, active, deleted, flags = (
+                    bytes(dbf_file_get_field_raw(row, dbf, field_index)) for field_index in range(1, 8))
+                
+                # Create record positionally with proper type conversion
+                records.append(FilterRecord(
+                    i,
+                    name.decode('utf-8', errors='replace'),
+                    safe_int_convert(year, 0),
+                    safe_int_convert(rating, 0),
+                    dateadd.decode('ascii', errors='replace'),
+                    active == b'T',
+                    deleted == b'T',
+                    safe_int_convert(flags, 0),
+                ))
+        finally:
+            dbf_file_close(dbf)
+        
+        # Keep NAME values for the NDX prefix simulation
+        cls.names = [record.NAME for record in records]
         
         # Define field specifications for heap map
         field_specs = [
@@ -226,173 +278,172 @@ class TestFilterIntegration(unittest.TestCase):
         
         return heap_map
     
-    def _test_streaming_filtering(self, dbf_filename):
-        """Test streaming mode filtering."""
-        print("\n=== Testing Streaming Mode ===")
-        
-        dbf = dbf_file_open(dbf_filename)
-        
-        # Test 1: Filter by YEAR = 1985
-        print("Test 1: YEAR = 1985")
-        year_matches = []
-        for i in range(dbf_file_get_actual_row_count(dbf)):
-            dbf_file_seek_to_row(dbf, i)
-            row = dbf_file_read_row(dbf)
-            year = int(dbf_file_get_field_str(row, dbf, 2))
-            if year == 1985:
+    def _scan_all_predicates(self, dbf):
+        """Scan the DBF once and collect matches for every streaming predicate."""
+        # One forward scan over raw records evaluates all predicates per row
+        matches = {'year': [], 'rating': [], 'alp': []}
+        year_matches = matches['year']
+        rating_matches = matches['rating']
+        alp_matches = matches['alp']
+        
+        # Fixed-width ASCII numerics compare as bytes; RATING (width 2) may be
+        # left-justified (written from str) or right-justified (written from int)
+        year_key = b'1985'
+        rating_keys = (b'5 ', b' 5')
+        for i, row in enumerate(dbf_file_iter_rows(dbf, raw=True)):
+            if dbf_file_get_field_raw(row, dbf, 2) == year_key:
                 year_matches.append(i)
-        print(f"  Found {len(year_matches)} matches")
-        self.assertGreater(len(year_matches), 0, "Should find records with year 1985")
-        
-        # Test 2: Filter by RATING = 5
-        print("Test 2: RATING = 5")
-        rating_matches = []
-        for i in range(dbf_file_get_actual_row_count(dbf)):
-            dbf_file_seek_to_row(dbf, i)
-            row = dbf_file_read_row(dbf)
-            rating = int(dbf_file_get_field_str(row, dbf, 3))
-            if rating == 5:
+            if dbf_file_get_field_raw(row, dbf, 3) in rating_keys:
                 rating_matches.append(i)
-        print(f"  Found {len(rating_matches)} matches")
-        self.assertGreater(len(rating_matches), 0, "Should find records with rating 5")
-        
-        # Test 3: Filter by NAME starts with "Alp"
-        print("Test 3: NAME starts with 'Alp'")
-        name_matches = []
-        for i in range(dbf_file_get_actual_row_count(dbf)):
-            dbf_file_seek_to_row(dbf, i)
-            row = dbf_file_read_row(dbf)
-            name = dbf_file_get_field_str(row, dbf, 1)
-            if name.startswith('Alp'):
-                name_matches.append(i)
-        print(f"  Found {len(name_matches)} matches")
-        self.assertGreater(len(name_matches), 0, "Should find records starting with Alp")
-        
-        dbf_file_close(dbf)
-        print("Streaming mode tests completed")
+            if dbf_file_get_field_raw(row, dbf, 1)[:3] == b'Alp':
+                alp_matches.append(i)
+        return matches
+    
+    def _test_streaming_filtering(self, matches):
+        """Test streaming mode filtering using the fused scan results."""
+        # Collect log lines and write them once at the end
+        log = []
+        out = log.append
+        try:
+            out("\n=== Testing Streaming Mode ===")
+            
+            year_matches = matches['year']
+            rating_matches = matches['rating']
+            name_matches = matches['alp']
+            
+            # Test 1: Filter by YEAR = 1985
+            out("Test 1: YEAR = 1985")
+            out(f"  Found {len(year_matches)} matches")
+            self.assertGreater(len(year_matches), 0, "Should find records with year 1985")
+            
+            # Test 2: Filter by RATING = 5
+            out("Test 2: RATING = 5")
+            out(f"  Found {len(rating_matches)} matches")
+            self.assertGreater(len(rating_matches), 0, "Should find records with rating 5")
+            
+            # Test 3: Filter by NAME starts with "Alp"
+            out("Test 3: NAME starts with 'Alp'")
+            out(f"  Found {len(name_matches)} matches")
+            self.assertGreater(len(name_matches), 0, "Should find records starting with Alp")
+            
+            out("Streaming mode tests completed")
+        finally:
+            sys.stdout.write('\n'.join(log) + '\n')
     
     def _test_heap_map_filtering(self, heap_map):
         """Test heap map mode filtering."""
-        print("\n=== Testing Heap Map Mode ===")
-        
-        # Test 1: Filter by YEAR >= 1985 using heap map
-        print("Test 1: YEAR >= 1985 (heap map)")
-        year_matches = []
-        for i in range(heap_map.record_count):
-            year = heap_get_word(heap_map, i, 2)  # Field 2 = YEAR (corrected index)
-            if year >= 1985:
-                year_matches.append(i)
-        print(f"  Found {len(year_matches)} matches")
-        self.assertGreater(len(year_matches), 0, "Should find records with year >= 1985")
-        
-        # Test 2: Filter by boolean flags
-        print("Test 2: Active AND NOT Deleted (heap map)")
-        bool_matches = []
-        for i in range(heap_map.record_count):
-            active = heap_get_bitflag(heap_map, i, 4)  # Field 4 = ACTIVE (corrected index)
-            deleted = heap_get_bitflag(heap_map, i, 5)  # Field 5 = DELETED (corrected index)
-            if active and not deleted:
-                bool_matches.append(i)
-        print(f"  Found {len(bool_matches)} matches")
-        
-        # Test 3: Filter by numeric flags
-        print("Test 3: Featured OR Verified (heap map)")
-        flag_matches = []
-        for i in range(heap_map.record_count):
-            flags = heap_get_word(heap_map, i, 6)  # Field 6 = FLAGS (corrected index)
-            if flags & self.FLAG_FEATURED or flags & self.FLAG_VERIFIED:
-                flag_matches.append(i)
-        print(f"  Found {len(flag_matches)} matches")
-        
-        print("Heap map mode tests completed")
+        # Collect log lines and write them once at the end
+        log = []
+        out = log.append
+        try:
+            out("\n=== Testing Heap Map Mode ===")
+            
+            # Read each needed column once with the bulk accessor
+            years = heap_get_column(heap_map, 2)  # Field 2 = YEAR (corrected index)
+            actives = heap_get_column(heap_map, 4)  # Field 4 = ACTIVE (corrected index)
+            deleteds = heap_get_column(heap_map, 5)  # Field 5 = DELETED (corrected index)
+            flags_column = heap_get_column(heap_map, 6)  # Field 6 = FLAGS (corrected index)
+            
+            # Test 1: Filter by YEAR >= 1985 using heap map
+            out("Test 1: YEAR >= 1985 (heap map)")
+            year_matches = [i for i, year in enumerate(years) if year >= 1985]
+            out(f"  Found {len(year_matches)} matches")
+            self.assertGreater(len(year_matches), 0, "Should find records with year >= 1985")
+            
+            # Test 2: Filter by boolean flags
+            out("Test 2: Active AND NOT Deleted (heap map)")
+            bool_matches = [i for i, (active, deleted) in enumerate(zip(actives, deleteds))
+                            if active and not deleted]
+            out(f"  Found {len(bool_matches)} matches")
+            
+            # Test 3: Filter by numeric flags
+            out("Test 3: Featured OR Verified (heap map)")
+            wanted = self.FLAG_FEATURED | self.FLAG_VERIFIED
+            flag_matches = [i for i, flags in enumerate(flags_column) if flags & wanted]
+            out(f"  Found {len(flag_matches)} matches")
+            
+            out("Heap map mode tests completed")
+        finally:
+            sys.stdout.write('\n'.join(log) + '\n')
     
-    def _test_ndx_heap_map_integration(self, dbf_filename, ndx_filename, heap_map):
-        """Test NDX + heap map integration."""
-        print("\n=== Testing NDX + Heap Map Integration ===")
-        
-        # Test 1: NDX search for "Alp" + heap map filter YEAR >= 1985
-        print("Test 1: NDX search for 'Alp' + heap map filter YEAR >= 1985")
-        
-        # Simulate NDX search (would normally use ndx_module search functions)
-        # For demo, we'll use direct DBF search to simulate NDX results
-        ndx_matches = []
-        dbf = dbf_file_open(dbf_filename)
-        for i in range(dbf_file_get_actual_row_count(dbf)):
-            dbf_file_seek_to_row(dbf, i)
-            row = dbf_file_read_row(dbf)
-            name = dbf_file_get_field_str(row, dbf, 1)
-            if name.startswith('Alp'):
-                ndx_matches.append(i)
-        dbf_file_close(dbf)
-        
-        print(f"  NDX found {len(ndx_matches)} records starting with 'Alp'")
-        
-        # Apply heap map filtering to those results
-        heap_matches = 0
-        for rec_no in ndx_matches:
-            if rec_no < heap_map.record_count:
-                year = heap_get_word(heap_map, rec_no, 2)  # Field 2 = YEAR (corrected index)
-                if year >= 1985:
-                    heap_matches += 1
-        
-        print(f"  Heap map filtered to {heap_matches} records with YEAR >= 1985")
-        print(f"  Combined result: {heap_matches} records match both criteria")
-        
-        # Test 2: NDX search for "Beta" + heap map boolean filtering
-        print("Test 2: NDX search for 'Beta' + heap map boolean filtering")
-        
-        # Simulate NDX search for "Beta"
-        ndx_matches = []
-        dbf = dbf_file_open(dbf_filename)
-        for i in range(dbf_file_get_actual_row_count(dbf)):
-            dbf_file_seek_to_row(dbf, i)
-            row = dbf_file_read_row(dbf)
-            name = dbf_file_get_field_str(row, dbf, 1)
-            if name.startswith('Beta'):
-                ndx_matches.append(i)
-        dbf_file_close(dbf)
-        
-        print(f"  NDX found {len(ndx_matches)} records starting with 'Beta'")
-        
-        # Apply heap map boolean filtering
-        heap_matches = 0
-        for rec_no in ndx_matches:
-            if rec_no < heap_map.record_count:
-                active = heap_get_bitflag(heap_map, rec_no, 4)  # Field 4 = ACTIVE (corrected index)
-                deleted = heap_get_bitflag(heap_map, rec_no, 5)  # Field 5 = DELETED (corrected index)
-                if active and not deleted:
-                    heap_matches += 1
-        
-        print(f"  Heap map filtered to {heap_matches} active, non-deleted records")
-        print(f"  Combined result: {heap_matches} records match all criteria")
-        
-        print("NDX + Heap Map integration tests completed")
+    def _simulate_ndx_prefix(self, prefix):
+        """Simulate an NDX prefix search over the NAME values kept at heap build."""
+        # Would normally use ndx_module search functions
+        return [i for i, name in enumerate(self.names) if name.startswith(prefix)]
+    
+    def _test_ndx_heap_map_integration(self, ndx_filename, heap_map):
+        """Test NDX + heap map integration using the NAME values kept at heap build."""
+        # Collect log lines and write them once at the end
+        log = []
+        out = log.append
+        try:
+            out("\n=== Testing NDX + Heap Map Integration ===")
+            
+            # Test 1: NDX search for "Alp" + heap map filter YEAR >= 1985
+            out("Test 1: NDX search for 'Alp' + heap map filter YEAR >= 1985")
+            
+            # Simulate NDX search
+            ndx_matches = self._simulate_ndx_prefix('Alp')
+            
+            out(f"  NDX found {len(ndx_matches)} records starting with 'Alp'")
+            
+            # Apply heap map filtering to those results
+            heap_matches = 0
+            for rec_no in ndx_matches:
+                if rec_no < heap_map.record_count:
+                    year = heap_get_word(heap_map, rec_no, 2)  # Field 2 = YEAR (corrected index)
+                    if year >= 1985:
+                        heap_matches += 1
+            
+            out(f"  Heap map filtered to {heap_matches} records with YEAR >= 1985")
+            out(f"  Combined result: {heap_matches} records match both criteria")
+            
+            # Test 2: NDX search for "Beta" + heap map boolean filtering
+            out("Test 2: NDX search for 'Beta' + heap map boolean filtering")
+            
+            # Simulate NDX search for "Beta"
+            ndx_matches = self._simulate_ndx_prefix('Beta')
+            
+            out(f"  NDX found {len(ndx_matches)} records starting with 'Beta'")
+            
+            # Apply heap map boolean filtering
+            heap_matches = 0
+            for rec_no in ndx_matches:
+                if rec_no < heap_map.record_count:
+                    active = heap_get_bitflag(heap_map, rec_no, 4)  # Field 4 = ACTIVE (corrected index)
+                    deleted = heap_get_bitflag(heap_map, rec_no, 5)  # Field 5 = DELETED (corrected index)
+                    if active and not deleted:
+                        heap_matches += 1
+            
+            out(f"  Heap map filtered to {heap_matches} active, non-deleted records")
+            out(f"  Combined result: {heap_matches} records match all criteria")
+            
+            out("NDX + Heap Map integration tests completed")
+        finally:
+            sys.stdout.write('\n'.join(log) + '\n')
     
     def test_filter_integration(self):
         """Main test method that runs the complete workflow."""
-        print("TESTFLTR - Filter Integration Test")
-        print("=" * 50)
-        
-        # Step 1: Create test DBF
-        dbf_filename = self.create_test_dbf()
-        print()
+        # Steps 1-3 (DBF, NDX index, heap map) are built once in setUpClass
+        dbf_filename = self.dbf_filename
+        ndx_filename = self.ndx_filename
+        heap_map = self.heap_map
         
-        # Step 2: Create NDX index
-        ndx_filename = self.create_ndx_index(dbf_filename)
-        print()
-        
-        # Step 3: Build heap map
-        heap_map = self.build_heap_map(dbf_filename)
-        print()
+        # Scan the DBF once for every streaming predicate
+        dbf = dbf_file_open(dbf_filename)
+        try:
+            matches = self._scan_all_predicates(dbf)
+        finally:
+            dbf_file_close(dbf)
         
         # Step 4: Test streaming mode
-        self._test_streaming_filtering(dbf_filename)
+        self._test_streaming_filtering(matches)
         
         # Step 5: Test heap map mode
         self._test_heap_map_filtering(heap_map)
         
         # Step 6: Test NDX + heap map integration
-        self._test_ndx_heap_map_integration(dbf_filename, ndx_filename, heap_map)
+        self._test_ndx_heap_map_integration(ndx_filename, heap_map)
         
         print("\nAll tests completed successfully!")
 
@@ -9,11 +9,24 @@ Key concepts:
 4. Type-safe accessors for reading heap data
 """
 
+import array
+import functools
+import operator
 import struct
-from typing import List, Dict, Any
+import sys
+from itertools import zip_longest
+from typing import List, Dict, Any, Callable, Sequence
 from enum import Enum
 
 
+# Precompiled little-endian Word/LongInt codecs (no format parse per call)
+_S_U16 = struct.Struct('<H')
+_S_I32 = struct.Struct('<i')
+_S_RECNO_YEAR = struct.Struct('<HH')  # Segmented tests: adjacent RecNo + Year Words
+
+CACHE_LINE_SIZE = 64  # Bytes; cache-aligned record sizes divide (or are multiples of) this
+
+
 class HeapFieldType(Enum):
     """Types of fields in heap map"""
     NONE = 0
@@ -27,39 +40,54 @@ class HeapFieldType(Enum):
 class HeapFieldSpec:
     """Specification for one field in heap map"""
     def __init__(self, dbf_field_idx: int, heap_field_type: HeapFieldType, 
-                 convert_to_jdn: bool = False, bit_mask: int = 0, nibble_shift: int = 0):
+                 convert_to_jdn: bool = False, bit_mask: int = 0, nibble_shift: int = 0,
+                 range_hint: tuple = None):
         self.dbf_field_idx = dbf_field_idx  # Source field index (0 = RecNo)
         self.heap_field_type = heap_field_type
         self.heap_offset = 0  # Calculated by layout function
+        self.range_hint = range_hint  # For WORD/LONGINT: (min, max) of the data, lets layout narrow storage
+        self.storage_type = heap_field_type  # Physical type in the record (narrowed by layout function)
+        self.bias = 0  # Stored value = value - bias (range_hint minimum when narrowed)
         self.convert_to_jdn = convert_to_jdn  # Auto-convert date string to JDN
-        self.bit_mask = bit_mask  # For BITFLAGS: which bit(s) to use (e.g., 0x01, 0x02, 0x04)
+        self.bit_mask = bit_mask  # For BITFLAGS: which bit(s) to use (e.g., 0x01, 0x02, 0x04); 0 = auto-assign
         self.nibble_shift = nibble_shift  # For NIBBLE: 0 (low nibble) or 4 (high nibble)
 
 
 class HeapMap:
     """Memory-packed heap map for fast filtering"""
-    def __init__(self, record_size: int = 16):
+    def __init__(self, record_size: int = 16, layout: str = 'aos', max_records: int = 0):
         self.record_count = 0
         self.record_size = record_size  # 16, 24, or 32 bytes
+        self.layout = layout  # 'aos' = packed record buffer only, 'soa' = typed columns only
         self.field_count = 0
         self.field_specs: List[HeapFieldSpec] = []
-        self.records: List[bytearray] = []  # Each record is a bytearray
+        self.buffer = bytearray(max_records * record_size)  # All records back to back, record_size bytes each
+        self.columns: List[array.array] = []  # SoA only: one typed array per field spec
+    
+    def reset(self):
+        """
+        Empty the map so its buffer can be reused for the next segment.
+        The used bytes are zeroed (bit flags are OR'ed in); nothing is reallocated.
+        """
+        used = self.record_count * self.record_size
+        self.buffer[:used] = bytes(used)
+        self.record_count = 0
+        self.columns = []
 
 
 class DBFRecord:
     """Simulated DBF record"""
+    __slots__ = ('rec_no', 'fields', 'values')
+    
     def __init__(self, rec_no: int, **fields):
         self.rec_no = rec_no
         self.fields = fields
+        self.values = (rec_no, *fields.values())  # Positional view, values[0] = RecNo
     
     def get_field(self, field_idx: int):
         """Get field by index (0 = RecNo, 1+ = actual fields)"""
-        if field_idx == 0:
-            return self.rec_no
-        # Convert 1-based index to field name
-        field_names = list(self.fields.keys())
-        if 0 < field_idx <= len(field_names):
-            return self.fields[field_names[field_idx - 1]]
+        if 0 <= field_idx < len(self.values):
+            return self.values[field_idx]
         return None
 
 
@@ -71,10 +99,11 @@ def date_to_jdn(year: int, month: int, day: int) -> int:
     return day + ((153 * m + 2) // 5) + (365 * y) + (y // 4) - (y // 100) + (y // 400) - 32045
 
 
+@functools.lru_cache(maxsize=1 << 16)
 def dbf_date_str_to_jdn(date_str: str) -> int:
     """
     Convert dBASE date string "YYYYMMDD" to JDN.
-    Returns 0 if invalid.
+    Returns 0 if invalid. Results are cached: DBF dates repeat a lot.
     """
     if not date_str or len(date_str) != 8:
         return 0
@@ -93,80 +122,193 @@ def dbf_date_str_to_jdn(date_str: str) -> int:
         return 0
 
 
+def dbf_date_strs_to_jdn(values: list) -> list:
+    """
+    Convert a whole column of dBASE date strings to JDN in one call.
+    Each distinct string is parsed once; repeats reuse the cached JDN.
+    Non-string values are passed through unchanged. Invalid dates become 0.
+    """
+    cache: Dict[str, int] = {}
+    result = []
+    for value in values:
+        if isinstance(value, str):
+            jdn = cache.get(value)
+            if jdn is None:
+                jdn = cache[value] = dbf_date_str_to_jdn(value)
+            value = jdn
+        result.append(value)
+    return result
+
+
 def calculate_heap_layout(field_specs: List[HeapFieldSpec], target_record_size: int) -> bool:
     """
     Calculate field offsets with proper alignment.
     BITFLAGS fields can share the same byte if they have different bit masks.
+    BITFLAGS fields with bit_mask 0 get the next free bit of the shared byte.
     NIBBLE fields can share the same byte (2 nibbles per byte).
-    Returns True if all fields fit within target size.
+    WORD/LONGINT fields with a range_hint are stored as BYTE (or LONGINT as WORD)
+    offset from the hint's minimum when the range fits.
+    Fields keep their given order; if that doesn't fit, they are laid out
+    widest first (LongInt, Word, then one-byte fields) to drop alignment padding.
+    Returns True if all fields fit within target size; specs are only updated then.
+    """
+    schema = tuple((spec.heap_field_type, spec.bit_mask, spec.range_hint) for spec in field_specs)
+    plan = _compute_heap_layout(schema, target_record_size)
+    if plan is None:
+        return False
+    
+    offsets, nibble_shifts, bit_masks, storage_types, biases = plan
+    for spec, heap_offset, nibble_shift, bit_mask, storage_type, bias in zip(
+            field_specs, offsets, nibble_shifts, bit_masks, storage_types, biases):
+        spec.heap_offset = heap_offset
+        spec.storage_type = storage_type
+        spec.bias = bias
+        if nibble_shift is not None:
+            spec.nibble_shift = nibble_shift
+        if bit_mask is not None:
+            spec.bit_mask = bit_mask
+    return True
+
+
+def _narrow_storage(field_type: HeapFieldType, range_hint) -> tuple:
+    """Pick (storage type, bias): the smallest type holding a range-hinted WORD/LONGINT span"""
+    if range_hint is not None and field_type in (HeapFieldType.WORD, HeapFieldType.LONGINT):
+        low, high = range_hint
+        if high - low <= 0xFF:
+            return HeapFieldType.BYTE, low
+        if field_type == HeapFieldType.LONGINT and high - low <= 0xFFFF:
+            return HeapFieldType.WORD, low
+    return field_type, 0
+
+
+_STORAGE_ALIGNMENT = {HeapFieldType.LONGINT: 4, HeapFieldType.WORD: 2}  # Everything else: 1
+
+
+@functools.lru_cache(maxsize=64)
+def _compute_heap_layout(schema: tuple, target_record_size: int):
+    """
+    Layout over (HeapFieldType, bit_mask, range_hint) tuples (cached per schema).
+    Tries the given order first, then widest-first; results are in schema order.
+    Returns (offsets, nibble_shifts, bit_masks, storage_types, biases) tuples,
+    or None if the fields don't fit.
+    """
+    plan = _heap_layout_pass(schema, target_record_size)
+    if plan is not None:
+        return plan
+    
+    # Stable widest-first order removes padding between mixed-width fields
+    order = sorted(range(len(schema)),
+                   key=lambda i: -_STORAGE_ALIGNMENT.get(_narrow_storage(schema[i][0], schema[i][2])[0], 1))
+    plan = _heap_layout_pass(tuple(schema[i] for i in order), target_record_size)
+    if plan is None:
+        return None
+    
+    # Map physical order back to the caller's (logical) field order
+    logical = [None] * len(schema)
+    for position, i in enumerate(order):
+        logical[i] = position
+    return tuple(tuple(part[position] for position in logical) for part in plan)
+
+
+def _heap_layout_pass(schema: tuple, target_record_size: int):
+    """
+    One layout pass, assigning offsets in schema order.
+    Returns the same tuples as _compute_heap_layout, or None if the fields don't fit.
     """
     current_offset = 0
     last_bitflags_offset = -1  # Track last BITFLAGS byte offset
     last_nibble_offset = -1    # Track last NIBBLE byte offset
-    
-    for spec in field_specs:
-        if spec.heap_field_type == HeapFieldType.WORD:
+    used_bits = 0              # Bits taken in the current BITFLAGS byte
+    
+    offsets = []
+    nibble_shifts = []  # None = not a NIBBLE field
+    bit_masks = []      # None = keep the caller's bit_mask
+    storage_types = []
+    biases = []
+    for field_type, requested_mask, range_hint in schema:
+        nibble_shift = None
+        bit_mask = None
+        
+        # Narrow range-hinted numbers: store value - min in the smallest type that holds the span
+        field_type, bias = _narrow_storage(field_type, range_hint)
+        
+        if field_type == HeapFieldType.WORD:
             # Word: 2 bytes, must be 2-byte aligned
             if current_offset % 2 != 0:
                 current_offset += 1  # Align to 2-byte boundary
-            spec.heap_offset = current_offset
+            heap_offset = current_offset
             field_size = 2
             last_bitflags_offset = -1  # Reset BITFLAGS tracking
             last_nibble_offset = -1    # Reset NIBBLE tracking
         
-        elif spec.heap_field_type == HeapFieldType.LONGINT:
+        elif field_type == HeapFieldType.LONGINT:
             # LongInt: 4 bytes, must be 4-byte aligned
             while current_offset % 4 != 0:
                 current_offset += 1  # Align to 4-byte boundary
-            spec.heap_offset = current_offset
+            heap_offset = current_offset
             field_size = 4
             last_bitflags_offset = -1  # Reset BITFLAGS tracking
             last_nibble_offset = -1    # Reset NIBBLE tracking
         
-        elif spec.heap_field_type == HeapFieldType.BITFLAGS:
+        elif field_type == HeapFieldType.BITFLAGS:
             # BITFLAGS: 1 byte, can share with previous BITFLAGS if different bit mask
+            if requested_mask == 0:
+                # Auto-assign: lowest free bit, or bit 0 of a new byte when full
+                free_bits = ~used_bits & 0xFF
+                bit_mask = free_bits & -free_bits if last_bitflags_offset >= 0 else 0
+                if not bit_mask:
+                    last_bitflags_offset = -1
+                    bit_mask = 0x01
+                requested_mask = bit_mask
             if last_bitflags_offset >= 0:
                 # Reuse the same byte as previous BITFLAGS
-                spec.heap_offset = last_bitflags_offset
+                heap_offset = last_bitflags_offset
                 field_size = 0  # Don't advance offset
+                used_bits |= requested_mask
             else:
                 # New BITFLAGS byte
-                spec.heap_offset = current_offset
+                heap_offset = current_offset
                 field_size = 1
                 last_bitflags_offset = current_offset
+                used_bits = requested_mask
             last_nibble_offset = -1  # Reset NIBBLE tracking
         
-        elif spec.heap_field_type == HeapFieldType.NIBBLE:
+        elif field_type == HeapFieldType.NIBBLE:
             # NIBBLE: 4 bits, can share byte with another nibble
             if last_nibble_offset >= 0:
                 # Reuse same byte, use high nibble
-                spec.heap_offset = last_nibble_offset
-                spec.nibble_shift = 4  # High nibble
+                heap_offset = last_nibble_offset
+                nibble_shift = 4  # High nibble
                 field_size = 0  # Don't advance offset
                 last_nibble_offset = -1  # Byte is now full
             else:
                 # New nibble byte, use low nibble
-                spec.heap_offset = current_offset
-                spec.nibble_shift = 0  # Low nibble
+                heap_offset = current_offset
+                nibble_shift = 0  # Low nibble
                 field_size = 1
                 last_nibble_offset = current_offset
             last_bitflags_offset = -1  # Reset BITFLAGS tracking
         
-        elif spec.heap_field_type == HeapFieldType.BYTE:
+        elif field_type == HeapFieldType.BYTE:
             # BYTE: 1 byte, no alignment required
-            spec.heap_offset = current_offset
+            heap_offset = current_offset
             field_size = 1
             last_bitflags_offset = -1  # Reset BITFLAGS tracking
             last_nibble_offset = -1    # Reset NIBBLE tracking
         
         else:
-            return False  # Unknown type
+            return None  # Unknown type
         
+        offsets.append(heap_offset)
+        nibble_shifts.append(nibble_shift)
+        bit_masks.append(bit_mask)
+        storage_types.append(field_type)
+        biases.append(bias)
         current_offset += field_size
         
         # Check if we exceeded target size
         if current_offset > target_record_size:
-            return False
+            return None
     
     # Pad to next multiple of 8 bytes
     if current_offset % 8 != 0:
@@ -174,26 +316,140 @@ def calculate_heap_layout(field_specs: List[HeapFieldSpec], target_record_size:
     
     # Check if padded size exceeds target
     if current_offset > target_record_size:
-        return False
+        return None
     
-    return True
+    return tuple(offsets), tuple(nibble_shifts), tuple(bit_masks), tuple(storage_types), tuple(biases)
 
 
-def build_heap_map(records: List[DBFRecord], field_specs: List[HeapFieldSpec], 
-                   target_record_size: int) -> HeapMap:
+def _heap_int(value) -> int:
+    """Coerce a field value to int for WORD/LONGINT packing (bad strings become 0)"""
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except (ValueError, TypeError):
+            return 0
+    return value
+
+
+def _heap_bit(value) -> int:
+    """Coerce a field value to a 0/1 bit for BITFLAGS packing"""
+    if isinstance(value, bool):
+        return 1 if value else 0
+    elif isinstance(value, str):
+        # dBASE logical: 'T', 't', 'Y', 'y' = True
+        return 1 if value.upper() in ('T', 'Y') else 0
+    elif isinstance(value, int):
+        return 1 if value != 0 else 0
+    return 0
+
+
+def _build_heap_column(values: Sequence, spec: HeapFieldSpec) -> array.array:
     """
-    Build heap map from DBF records based on field specifications.
+    Convert one source column (DBF field values for all records) to a typed array.
+    Holds decoded values: Word/LongInt ints, 0/1 for BITFLAGS, 0-15 for NIBBLE.
     """
-    heap_map = HeapMap(target_record_size)
-    heap_map.field_specs = field_specs
-    heap_map.field_count = len(field_specs)
-    
-    # Calculate layout
-    if not calculate_heap_layout(field_specs, target_record_size):
-        print("ERROR: Fields don't fit in target record size")
-        return heap_map
-    
-    # Print layout
+    if spec.dbf_field_idx != 0:
+        # Missing fields read as 0 (RecNo, field 0, is always present)
+        values = [0 if value is None else value for value in values]
+        
+        # Convert date strings to JDN if requested (whole column at once)
+        if spec.convert_to_jdn:
+            values = dbf_date_strs_to_jdn(values)
+    
+    # Fast path: an all-int column that already fits converts in C, with no
+    # per-value coercion; strings, floats or out-of-range values fall through
+    fast_code = {HeapFieldType.WORD: 'H', HeapFieldType.LONGINT: 'i',
+                 HeapFieldType.NIBBLE: 'B', HeapFieldType.BYTE: 'B'}.get(spec.heap_field_type)
+    if fast_code:
+        try:
+            column = array.array(fast_code, values)
+            if spec.heap_field_type != HeapFieldType.NIBBLE or max(column, default=0) <= 15:
+                return column
+        except (TypeError, OverflowError):
+            pass
+    
+    if spec.heap_field_type == HeapFieldType.WORD:
+        # Unsigned short (2 bytes)
+        return array.array('H', [_heap_int(value) & 0xFFFF for value in values])
+    elif spec.heap_field_type == HeapFieldType.LONGINT:
+        # Signed int (4 bytes)
+        return array.array('i', [_heap_int(value) for value in values])
+    elif spec.heap_field_type == HeapFieldType.BITFLAGS:
+        return array.array('B', [_heap_bit(value) for value in values])
+    elif spec.heap_field_type == HeapFieldType.NIBBLE:
+        # Nibble (4 bits, value 0-15)
+        return array.array('B', [max(0, min(15, int(value))) if isinstance(value, (int, float)) else 0
+                                 for value in values])
+    elif spec.heap_field_type == HeapFieldType.BYTE:
+        # Byte (8 bits, value 0-255)
+        return array.array('B', [max(0, min(255, int(value))) if isinstance(value, (int, float)) else 0
+                                 for value in values])
+    return array.array('B', bytes(len(values)))
+
+
+def _build_record_packer(field_specs: List[HeapFieldSpec], columns: List[array.array],
+                         record_size: int):
+    """
+    Build one Struct for a whole heap record plus the column feeding each slot.
+    BITFLAGS and NIBBLE fields sharing a byte are combined into one byte column.
+    Returns (struct.Struct, list of slot columns in offset order).
+    """
+    slots = {}  # offset -> (format code, column)
+    for spec, column in zip(field_specs, columns):
+        if spec.storage_type != spec.heap_field_type:
+            # Range-hinted Word/LongInt stored narrower, relative to the hint minimum
+            code, limit = ('H', 0xFFFF) if spec.storage_type == HeapFieldType.WORD else ('B', 0xFF)
+            column = array.array(code, [min(max(value - spec.bias, 0), limit) for value in column])
+        
+        if spec.storage_type == HeapFieldType.WORD:
+            slots[spec.heap_offset] = ('H', column)
+        elif spec.storage_type == HeapFieldType.LONGINT:
+            slots[spec.heap_offset] = ('i', column)
+        else:
+            if spec.heap_field_type == HeapFieldType.BITFLAGS:
+                # 0/1 column -> 0/mask bytes in one C-level translate
+                part = column.tobytes().translate(bytes([0, spec.bit_mask]) + bytes(254))
+            elif spec.heap_field_type == HeapFieldType.NIBBLE:
+                # Column already holds 0-15: low nibble as-is, high nibble via one translate
+                part = column.tobytes()
+                if spec.nibble_shift:
+                    part = part.translate(bytes(((value & 0x0F) << spec.nibble_shift) & 0xFF
+                                                for value in range(256)))
+            else:
+                part = column.tobytes()
+            
+            # OR into the byte shared with earlier BITFLAGS/NIBBLE fields:
+            # the whole column as one big int, no per-record branch or loop
+            if spec.heap_offset in slots:
+                shared = slots[spec.heap_offset][1]
+                part = (int.from_bytes(shared, 'little') |
+                        int.from_bytes(part, 'little')).to_bytes(len(part), 'little')
+            slots[spec.heap_offset] = ('B', part)
+    
+    slot_layout = tuple((offset, slots[offset][0]) for offset in sorted(slots))
+    slot_columns = [slots[offset][1] for offset in sorted(slots)]
+    return _compile_record_struct(slot_layout, record_size), slot_columns
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_record_struct(slot_layout: tuple, record_size: int) -> struct.Struct:
+    """
+    Compile the record Struct for one schema, once.
+    slot_layout is ((offset, format code), ...) in offset order; repeated
+    builds with the same schema reuse the cached Struct.
+    """
+    # Little-endian, no implicit alignment: explicit pad bytes between slots
+    fmt = '<'
+    position = 0
+    for offset, code in slot_layout:
+        fmt += f'{offset - position}x{code}'
+        position = offset + struct.calcsize('<' + code)
+    fmt += f'{record_size - position}x'
+    return struct.Struct(fmt)
+
+
+def _print_heap_layout(field_specs: List[HeapFieldSpec], target_record_size: int):
+    """Print the computed heap layout (one line per field spec)"""
     print(f"\nHeap Layout (target size: {target_record_size} bytes):")
     for i, spec in enumerate(field_specs, 1):
         if spec.heap_field_type == HeapFieldType.WORD:
@@ -209,83 +465,75 @@ def build_heap_map(records: List[DBFRecord], field_specs: List[HeapFieldSpec],
             type_name, size = "Byte", 1
         else:
             type_name, size = "Unknown", 0
+        if spec.storage_type != spec.heap_field_type:
+            # Range-hinted narrowing: show the physical type and bias
+            stored_name, size = ("Word", 2) if spec.storage_type == HeapFieldType.WORD else ("Byte", 1)
+            type_name += f" as {stored_name}+{spec.bias}"
         print(f"  Field {i}: offset {spec.heap_offset:2d}, size {size}, type {type_name}")
+
+
+def cache_line_record_size(record_size: int) -> int:
+    """
+    Round a record size up so records never straddle a cache line:
+    the next power of two up to CACHE_LINE_SIZE, then whole cache lines (24 -> 32).
+    """
+    if record_size > CACHE_LINE_SIZE:
+        return -(-record_size // CACHE_LINE_SIZE) * CACHE_LINE_SIZE
+    size = 8
+    while size < record_size:
+        size *= 2
+    return size
+
+
+def build_heap_map(records: List[DBFRecord], field_specs: List[HeapFieldSpec], 
+                   target_record_size: int, layout: str = 'aos', *, verbose: bool = False,
+                   cache_align: bool = False) -> HeapMap:
+    """
+    Build heap map from DBF records based on field specifications.
+    layout='aos' keeps only the packed record buffer; layout='soa' keeps only
+    the typed columns and skips the buffer.
+    verbose=True prints the computed layout (and layout errors).
+    cache_align=True rounds the record size up with cache_line_record_size().
+    """
+    if cache_align:
+        target_record_size = cache_line_record_size(target_record_size)
     
-    # Load records
-    for record in records:
-        # Create empty record buffer
-        record_buffer = bytearray(target_record_size)
-        
-        # Pack each field
-        for spec in field_specs:
-            # Get field value
-            if spec.dbf_field_idx == 0:
-                # Special: RecNo
-                value = record.rec_no
-            else:
-                value = record.get_field(spec.dbf_field_idx)
-                if value is None:
-                    value = 0
-                
-                # Convert date string to JDN if requested
-                if spec.convert_to_jdn and isinstance(value, str):
-                    value = dbf_date_str_to_jdn(value)
-            
-            # Pack into buffer at calculated offset
-            if spec.heap_field_type == HeapFieldType.WORD:
-                # Pack as unsigned short (2 bytes)
-                # Convert string to int if needed
-                if isinstance(value, str):
-                    try:
-                        value = int(value)
-                    except (ValueError, TypeError):
-                        value = 0
-                struct.pack_into('<H', record_buffer, spec.heap_offset, value & 0xFFFF)
-            elif spec.heap_field_type == HeapFieldType.LONGINT:
-                # Pack as signed int (4 bytes)
-                # Convert string to int if needed
-                if isinstance(value, str):
-                    try:
-                        value = int(value)
-                    except (ValueError, TypeError):
-                        value = 0
-                struct.pack_into('<i', record_buffer, spec.heap_offset, value)
-            elif spec.heap_field_type == HeapFieldType.BITFLAGS:
-                # Pack as bit flag (OR into existing byte)
-                # Convert boolean/string to bit value
-                bit_value = 0
-                if isinstance(value, bool):
-                    bit_value = 1 if value else 0
-                elif isinstance(value, str):
-                    # dBASE logical: 'T', 't', 'Y', 'y' = True
-                    bit_value = 1 if value.upper() in ('T', 'Y') else 0
-                elif isinstance(value, int):
-                    bit_value = 1 if value != 0 else 0
-                
-                # OR the bit into the byte
-                if bit_value:
-                    record_buffer[spec.heap_offset] |= spec.bit_mask
-            
-            elif spec.heap_field_type == HeapFieldType.NIBBLE:
-                # Pack as nibble (4 bits, value 0-15)
-                nibble_value = int(value) if isinstance(value, (int, float)) else 0
-                nibble_value = max(0, min(15, nibble_value))  # Clamp to 0-15
-                
-                if spec.nibble_shift == 0:
-                    # Low nibble: clear bits 0-3, set value
-                    record_buffer[spec.heap_offset] = (record_buffer[spec.heap_offset] & 0xF0) | (nibble_value & 0x0F)
-                else:
-                    # High nibble: clear bits 4-7, set value
-                    record_buffer[spec.heap_offset] = (record_buffer[spec.heap_offset] & 0x0F) | ((nibble_value & 0x0F) << 4)
-            
-            elif spec.heap_field_type == HeapFieldType.BYTE:
-                # Pack as byte (8 bits, value 0-255)
-                byte_value = int(value) if isinstance(value, (int, float)) else 0
-                byte_value = max(0, min(255, byte_value))  # Clamp to 0-255
-                record_buffer[spec.heap_offset] = byte_value
-        
-        heap_map.records.append(record_buffer)
-        heap_map.record_count += 1
+    heap_map = HeapMap(target_record_size, layout)
+    heap_map.field_specs = field_specs
+    heap_map.field_count = len(field_specs)
+    
+    # Calculate layout
+    if not calculate_heap_layout(field_specs, target_record_size):
+        if verbose:
+            print("ERROR: Fields don't fit in target record size")
+        return heap_map
+    
+    if verbose:
+        _print_heap_layout(field_specs, target_record_size)
+    
+    # Transpose once: each record is visited a single time, field 0 = RecNo
+    source_columns = list(zip_longest(*(record.values for record in records)))
+    missing = (None,) * len(records)
+    
+    # Convert each field to a typed column (one type dispatch per spec, not per record)
+    columns = [
+        _build_heap_column(source_columns[spec.dbf_field_idx]
+                           if spec.dbf_field_idx < len(source_columns) else missing, spec)
+        for spec in field_specs
+    ]
+    
+    heap_map.record_count = len(records)
+    if layout == 'soa':
+        heap_map.columns = columns
+        return heap_map
+    
+    # Pack every record into one contiguous buffer with a precompiled Struct;
+    # the typed columns are only a staging step and are not kept
+    record_struct, slot_columns = _build_record_packer(field_specs, columns, target_record_size)
+    heap_map.buffer = bytearray(len(records) * target_record_size)
+    pack_into = record_struct.pack_into
+    for base, values in zip(range(0, len(heap_map.buffer), target_record_size), zip(*slot_columns)):
+        pack_into(heap_map.buffer, base, *values)
     
     return heap_map
 
@@ -299,7 +547,9 @@ def heap_get_word(heap_map: HeapMap, record_idx: int, field_idx: int) -> int:
     if spec.heap_field_type != HeapFieldType.WORD:
         return 0
     
-    return struct.unpack_from('<H', heap_map.records[record_idx], spec.heap_offset)[0]
+    if heap_map.columns:
+        return heap_map.columns[field_idx - 1][record_idx]
+    return _heap_read_number(heap_map, record_idx, spec)
 
 
 def heap_get_longint(heap_map: HeapMap, record_idx: int, field_idx: int) -> int:
@@ -311,7 +561,21 @@ def heap_get_longint(heap_map: HeapMap, record_idx: int, field_idx: int) -> int:
     if spec.heap_field_type != HeapFieldType.LONGINT:
         return 0
     
-    return struct.unpack_from('<i', heap_map.records[record_idx], spec.heap_offset)[0]
+    if heap_map.columns:
+        return heap_map.columns[field_idx - 1][record_idx]
+    return _heap_read_number(heap_map, record_idx, spec)
+
+
+def _heap_read_number(heap_map: HeapMap, record_idx: int, spec: HeapFieldSpec) -> int:
+    """Read a Word/LongInt field from the record buffer, undoing range-hint narrowing"""
+    position = record_idx * heap_map.record_size + spec.heap_offset
+    if spec.storage_type == HeapFieldType.WORD:
+        value = _S_U16.unpack_from(heap_map.buffer, position)[0]
+    elif spec.storage_type == HeapFieldType.LONGINT:
+        value = _S_I32.unpack_from(heap_map.buffer, position)[0]
+    else:
+        value = heap_map.buffer[position]
+    return value + spec.bias
 
 
 def heap_get_bitflag(heap_map: HeapMap, record_idx: int, field_idx: int) -> bool:
@@ -323,7 +587,9 @@ def heap_get_bitflag(heap_map: HeapMap, record_idx: int, field_idx: int) -> bool
     if spec.heap_field_type != HeapFieldType.BITFLAGS:
         return False
     
-    byte_value = heap_map.records[record_idx][spec.heap_offset]
+    if heap_map.columns:
+        return heap_map.columns[field_idx - 1][record_idx] != 0
+    byte_value = heap_map.buffer[record_idx * heap_map.record_size + spec.heap_offset]
     return (byte_value & spec.bit_mask) != 0
 
 
@@ -336,7 +602,9 @@ def heap_get_nibble(heap_map: HeapMap, record_idx: int, field_idx: int) -> int:
     if spec.heap_field_type != HeapFieldType.NIBBLE:
         return 0
     
-    byte_value = heap_map.records[record_idx][spec.heap_offset]
+    if heap_map.columns:
+        return heap_map.columns[field_idx - 1][record_idx]
+    byte_value = heap_map.buffer[record_idx * heap_map.record_size + spec.heap_offset]
     
     if spec.nibble_shift == 0:
         # Low nibble
@@ -346,6 +614,35 @@ def heap_get_nibble(heap_map: HeapMap, record_idx: int, field_idx: int) -> int:
         return (byte_value >> 4) & 0x0F
 
 
+def heap_get_nibbles(heap_map: HeapMap, record_idx: int, field_idxs: List[int]) -> List[int]:
+    """
+    Read several nibble fields of one record with a single buffer read.
+    The bytes spanning the fields (e.g. one Word for 4 packed nibbles) are
+    read as one little-endian int and each nibble is shifted out of it.
+    Non-nibble or invalid fields read as 0, like heap_get_nibble.
+    """
+    specs = []
+    for field_idx in field_idxs:
+        if (record_idx >= heap_map.record_count or field_idx < 1 or field_idx > heap_map.field_count or
+                heap_map.field_specs[field_idx - 1].heap_field_type != HeapFieldType.NIBBLE):
+            specs.append(None)
+        else:
+            specs.append(heap_map.field_specs[field_idx - 1])
+    
+    if heap_map.columns:
+        return [heap_map.columns[field_idx - 1][record_idx] if spec else 0
+                for field_idx, spec in zip(field_idxs, specs)]
+    
+    offsets = [spec.heap_offset for spec in specs if spec]
+    if not offsets:
+        return [0] * len(field_idxs)
+    base = min(offsets)
+    position = record_idx * heap_map.record_size + base
+    packed = int.from_bytes(heap_map.buffer[position:position + max(offsets) - base + 1], 'little')
+    return [(packed >> ((spec.heap_offset - base) * 8 + spec.nibble_shift)) & 0x0F if spec else 0
+            for spec in specs]
+
+
 def heap_get_byte(heap_map: HeapMap, record_idx: int, field_idx: int) -> int:
     """Read byte value from heap map (type-safe accessor)"""
     if record_idx >= heap_map.record_count or field_idx < 1 or field_idx > heap_map.field_count:
@@ -355,7 +652,130 @@ def heap_get_byte(heap_map: HeapMap, record_idx: int, field_idx: int) -> int:
     if spec.heap_field_type != HeapFieldType.BYTE:
         return 0
     
-    return heap_map.records[record_idx][spec.heap_offset]
+    if heap_map.columns:
+        return heap_map.columns[field_idx - 1][record_idx]
+    return heap_map.buffer[record_idx * heap_map.record_size + spec.heap_offset]
+
+
+def heap_get_column(heap_map: HeapMap, field_idx: int) -> list:
+    """
+    Read one field for every record at once (bulk accessor).
+    One-byte fields are copied out with a single strided slice of the record
+    buffer; Word/LongInt fields are read through a strided typed memoryview
+    (struct.iter_unpack on big-endian hosts). Either way there is no
+    heap_get_* call per record.
+    Returns values in record order: ints, or bools for BITFLAGS fields.
+    """
+    if field_idx < 1 or field_idx > heap_map.field_count or heap_map.record_count == 0:
+        return []
+    
+    spec = heap_map.field_specs[field_idx - 1]  # Convert to 0-based
+    if heap_map.columns:
+        # Typed SoA column already holds the decoded values
+        column = heap_map.columns[field_idx - 1]
+        if spec.heap_field_type == HeapFieldType.BITFLAGS:
+            return [value != 0 for value in column]
+        return column.tolist()
+    
+    values = _heap_read_buffer_column(heap_map, spec)
+    if spec.bias:
+        bias = spec.bias
+        return [value + bias for value in values]
+    return values
+
+
+def _heap_read_buffer_column(heap_map: HeapMap, spec: HeapFieldSpec) -> list:
+    """Read one field's stored values for every record from the record buffer"""
+    used = heap_map.record_count * heap_map.record_size  # Buffer may be preallocated beyond this
+    if spec.storage_type == HeapFieldType.WORD:
+        code, width = 'H', 2
+    elif spec.storage_type == HeapFieldType.LONGINT:
+        code, width = 'i', 4
+    else:
+        # BITFLAGS, NIBBLE and BYTE live in one byte: strided slice, done in C
+        raw = heap_map.buffer[spec.heap_offset:used:heap_map.record_size]
+        if spec.heap_field_type == HeapFieldType.BITFLAGS:
+            bit_mask = spec.bit_mask
+            return [(value & bit_mask) != 0 for value in raw]
+        if spec.heap_field_type == HeapFieldType.NIBBLE:
+            shift = spec.nibble_shift
+            return list(raw.translate(bytes((b >> shift) & 0x0F for b in range(256))))
+        return list(raw)
+    
+    if sys.byteorder == 'little' and heap_map.record_size % width == 0:
+        # Layout keeps Word/LongInt offsets aligned, so the buffer can be viewed
+        # as an array of that type and the column is every (record_size/width)th lane
+        with memoryview(heap_map.buffer) as raw, raw[:used].cast(code) as lanes:
+            return lanes[spec.heap_offset // width::heap_map.record_size // width].tolist()
+    
+    # One record-sized struct that skips everything but this field
+    padding = heap_map.record_size - spec.heap_offset - width
+    column_struct = struct.Struct(f'<{spec.heap_offset}x{code}{padding}x')
+    with memoryview(heap_map.buffer) as raw:
+        return [value for (value,) in column_struct.iter_unpack(raw[:used])]
+
+
+def heap_filter_eq(heap_map: HeapMap, field_idx: int, value) -> List[int]:
+    """
+    Return the indices of records whose field equals value (whole-column scan).
+    BITFLAGS fields compare as booleans.
+    """
+    if field_idx < 1 or field_idx > heap_map.field_count:
+        return []
+    
+    spec = heap_map.field_specs[field_idx - 1]  # Convert to 0-based
+    if spec.heap_field_type == HeapFieldType.BITFLAGS:
+        value = bool(value)
+    column = _heap_filter_column(heap_map, field_idx)
+    
+    return [i for i, field_value in enumerate(column) if field_value == value]
+
+
+def _heap_filter_column(heap_map: HeapMap, field_idx: int):
+    """Decoded column for filtering: typed SoA column when present (bools for BITFLAGS)"""
+    spec = heap_map.field_specs[field_idx - 1]  # Convert to 0-based
+    if heap_map.columns and spec.heap_field_type != HeapFieldType.BITFLAGS:
+        return heap_map.columns[field_idx - 1]
+    return heap_get_column(heap_map, field_idx)
+
+
+_FILTER_OPS = {
+    '==': operator.eq, '!=': operator.ne,
+    '<': operator.lt, '<=': operator.le,
+    '>': operator.gt, '>=': operator.ge,
+}
+
+
+def heap_compile_filter(heap_map: HeapMap, predicates: List[tuple]) -> Callable[[], List[int]]:
+    """
+    Compile AND-ed (field_idx, op, value) predicates into a reusable filter.
+    Fields and operators are resolved once; equality tests run first. The
+    first predicate scans its whole column, later ones only re-test the
+    surviving record indices, and an empty result stops early.
+    Returns a function giving the matching record indices. An invalid
+    predicate (bad field or operator) compiles to a filter matching nothing.
+    """
+    program = []
+    for field_idx, op, value in predicates:
+        if field_idx < 1 or field_idx > heap_map.field_count or op not in _FILTER_OPS:
+            return lambda: []
+        if heap_map.field_specs[field_idx - 1].heap_field_type == HeapFieldType.BITFLAGS:
+            value = bool(value)
+        program.append((field_idx, _FILTER_OPS[op], value))
+    
+    # Equality is usually the most selective test: run it first (stable otherwise)
+    program.sort(key=lambda step: step[1] is not operator.eq)
+    
+    def run_filter() -> List[int]:
+        matches = range(heap_map.record_count)
+        for field_idx, compare, value in program:
+            column = _heap_filter_column(heap_map, field_idx)
+            matches = [i for i in matches if compare(column[i], value)]
+            if not matches:
+                break
+        return list(matches)
+    
+    return run_filter
 
 
 def test_basic_heap_map():
@@ -381,7 +801,7 @@ def test_basic_heap_map():
     ]
     
     # Build heap map
-    heap_map = build_heap_map(records, field_specs, 16)
+    heap_map = build_heap_map(records, field_specs, 16, verbose=True)
     
     print(f"\nHeap map built: {heap_map.record_count} records")
     
@@ -404,6 +824,14 @@ def test_basic_heap_map():
         if not match:
             all_match = False
     
+    # Bulk column reads agree with the per-record accessor
+    for field_idx in range(1, heap_map.field_count + 1):
+        column = heap_get_column(heap_map, field_idx)
+        expected = [heap_get_word(heap_map, i, field_idx) for i in range(heap_map.record_count)]
+        if column != expected:
+            print(f"  ✗ Column {field_idx} mismatch: {column} != {expected}")
+            all_match = False
+    
     if all_match:
         print("\n✓ SUCCESS: All data matches!")
     else:
@@ -435,7 +863,7 @@ def test_alignment():
     ]
     
     # Build heap map
-    heap_map = build_heap_map(records, field_specs, 16)
+    heap_map = build_heap_map(records, field_specs, 16, verbose=True)
     
     # Verify alignment
     print("\nChecking alignment:")
@@ -449,6 +877,18 @@ def test_alignment():
         field_specs[2].heap_offset == 4
     )
     
+    # Word, LongInt, Word needs 16 bytes in that order; widest-first fits in 8
+    reorder_specs = [
+        HeapFieldSpec(1, HeapFieldType.WORD),     # Year
+        HeapFieldSpec(2, HeapFieldType.LONGINT),  # DateAdded
+        HeapFieldSpec(0, HeapFieldType.WORD),     # RecNo
+    ]
+    reorder_map = build_heap_map(records, reorder_specs, 8)
+    reordered = [spec.heap_offset for spec in reorder_specs]
+    print(f"  Word/LongInt/Word in 8 bytes: offsets {reordered} (expected [4, 0, 6])")
+    if reordered != [4, 0, 6] or heap_get_longint(reorder_map, 2, 2) != 2450000 + 2 * 365:
+        alignment_ok = False
+    
     # Verify data
     print("\nVerifying data (first 3 records):")
     all_match = True
@@ -575,6 +1015,14 @@ def test_different_sizes():
         year = heap_get_word(heap_map, 0, 2)
         print(f"Record 0 Year: {year} (expected 2000)")
     
+    # Cache-aligned sizes: 24 bytes would straddle 64-byte lines, so it becomes 32
+    aligned_sizes = [cache_line_record_size(size) for size in (8, 16, 24, 32, 40, 64, 72)]
+    print(f"\nCache-aligned sizes for 8/16/24/32/40/64/72: {aligned_sizes}")
+    aligned_map = build_heap_map(records, field_specs, 24, cache_align=True)
+    if aligned_sizes != [8, 16, 32, 32, 64, 64, 128] or aligned_map.record_size != 32:
+        print("\n✗ FAILURE: Cache-aligned record sizes are wrong!")
+        return False
+    
     print("\n✓ SUCCESS: All record sizes work!")
     return True
 
@@ -610,7 +1058,7 @@ def test_date_conversion():
     ]
     
     # Build heap map
-    heap_map = build_heap_map(records, field_specs, 16)
+    heap_map = build_heap_map(records, field_specs, 16, verbose=True)
     
     print(f"\nHeap map built: {heap_map.record_count} records")
     print("\nVerifying date conversion:")
@@ -648,6 +1096,16 @@ def test_date_conversion():
         if not match:
             all_match = False
     
+    # Column conversion matches the scalar one, repeats and non-strings included
+    column = [date_str for date_str, _ in test_cases] * 2 + [12345]
+    expected_column = [expected for _, expected in test_cases] * 2 + [12345]
+    result_column = dbf_date_strs_to_jdn(column)
+    match = (result_column == expected_column)
+    status = "✓" if match else "✗"
+    print(f"  {status} Column conversion of {len(column)} values")
+    if not match:
+        all_match = False
+    
     if all_match:
         print("\n✓ SUCCESS: All date conversions correct!")
         return True
@@ -691,7 +1149,7 @@ def test_boolean_packing():
     ]
     
     # Build heap map
-    heap_map = build_heap_map(records, field_specs, 16)
+    heap_map = build_heap_map(records, field_specs, 16, verbose=True)
     
     print(f"\nHeap map built: {heap_map.record_count} records")
     print("\nVerifying bit packing (3 booleans in 1 byte):")
@@ -731,9 +1189,22 @@ def test_boolean_packing():
     # Check actual byte values
     print("\nActual byte values (hex):")
     for i in range(min(5, heap_map.record_count)):
-        byte_val = heap_map.records[i][offset_active]
+        byte_val = heap_map.buffer[i * heap_map.record_size + offset_active]
         print(f"  Record {i}: 0x{byte_val:02X} (binary: {byte_val:08b})")
     
+    # Auto-assigned bits: bit_mask=0 takes the next free bit, 9th flag rolls over
+    print("\nVerifying auto-assigned bit masks:")
+    auto_specs = [HeapFieldSpec(0, HeapFieldType.WORD)]
+    auto_specs += [HeapFieldSpec(1, HeapFieldType.BITFLAGS) for _ in range(9)]
+    calculate_heap_layout(auto_specs, 16)
+    masks = [spec.bit_mask for spec in auto_specs[1:]]
+    offsets = [spec.heap_offset for spec in auto_specs[1:]]
+    if masks == [1 << bit for bit in range(8)] + [0x01] and offsets == [2] * 8 + [3]:
+        print("  ✓ Bits 0-7 share one byte, 9th flag starts a new byte")
+    else:
+        print(f"  ✗ Unexpected masks {masks} / offsets {offsets}")
+        all_match = False
+    
     if all_match:
         print("\n✓ SUCCESS: Boolean bit packing works correctly!")
         return True
@@ -779,7 +1250,7 @@ def test_nibble_packing():
     ]
     
     # Build heap map
-    heap_map = build_heap_map(records, field_specs, 16)
+    heap_map = build_heap_map(records, field_specs, 16, verbose=True)
     
     print(f"\nHeap map built: {heap_map.record_count} records")
     print("\nVerifying nibble packing (4 enums in 2 bytes):")
@@ -802,6 +1273,13 @@ def test_nibble_packing():
         if not match:
             all_match = False
     
+    # All four nibbles of a record from one Word read of the packed bytes
+    grouped_ok = all(heap_get_nibbles(heap_map, i, [3, 4, 5, 6]) == list(expected)
+                     for i, expected in enumerate(test_cases))
+    print(f"\n  {'✓' if grouped_ok else '✗'} heap_get_nibbles reads all 4 enums with one Word read")
+    if not grouped_ok:
+        all_match = False
+    
     # Verify byte sharing
     print("\nVerifying byte sharing:")
     offset_video = field_specs[2].heap_offset
@@ -824,8 +1302,8 @@ def test_nibble_packing():
     # Check actual byte values
     print("\nActual byte values (hex):")
     for i in range(min(5, heap_map.record_count)):
-        byte1 = heap_map.records[i][offset_video]
-        byte2 = heap_map.records[i][offset_priority]
+        byte1 = heap_map.buffer[i * heap_map.record_size + offset_video]
+        byte2 = heap_map.buffer[i * heap_map.record_size + offset_priority]
         print(f"  Record {i}: Byte1=0x{byte1:02X} (Video+Sound), Byte2=0x{byte2:02X} (Priority+Status)")
     
     # Test space savings
@@ -842,8 +1320,156 @@ def test_nibble_packing():
         return False
 
 
-def test_segmented_heap_map():
-    """Test segmented heap map for tables >8K records"""
+def test_soa_layout():
+    """Test the column-only (SoA) layout against the packed (AoS) layout"""
+    print("\n" + "=" * 70)
+    print("Test 9: SoA Layout (columns only)")
+    print("=" * 70)
+    
+    # Create test records
+    records = []
+    for i in range(100):
+        records.append(DBFRecord(
+            rec_no=i,
+            Year=2000 + (i % 10),
+            Active=(i % 3 == 0),
+            Priority=i % 16
+        ))
+    
+    field_specs = [
+        HeapFieldSpec(0, HeapFieldType.WORD),                    # RecNo
+        HeapFieldSpec(1, HeapFieldType.WORD),                    # Year
+        HeapFieldSpec(2, HeapFieldType.BITFLAGS, bit_mask=0x01), # Active
+        HeapFieldSpec(3, HeapFieldType.NIBBLE),                  # Priority
+    ]
+    
+    aos_map = build_heap_map(records, field_specs, 16)
+    soa_map = build_heap_map(records, field_specs, 16, layout='soa')
+    
+    print(f"\nAoS buffer: {len(aos_map.buffer)} bytes, SoA buffer: {len(soa_map.buffer)} bytes")
+    
+    all_match = (len(soa_map.buffer) == 0 and aos_map.columns == [] and
+                 soa_map.record_count == aos_map.record_count)
+    
+    # Columns and filters agree between layouts
+    for field_idx in range(1, len(field_specs) + 1):
+        if heap_get_column(soa_map, field_idx) != heap_get_column(aos_map, field_idx):
+            print(f"  ✗ Column {field_idx} differs between layouts")
+            all_match = False
+    
+    year_matches = heap_filter_eq(soa_map, 2, 2005)
+    active_matches = heap_filter_eq(soa_map, 3, True)
+    expected_years = [i for i in range(100) if 2000 + (i % 10) == 2005]
+    expected_active = [i for i in range(100) if i % 3 == 0]
+    print(f"  Year == 2005: {len(year_matches)} matches (expected {len(expected_years)})")
+    print(f"  Active: {len(active_matches)} matches (expected {len(expected_active)})")
+    if year_matches != expected_years or active_matches != expected_active:
+        all_match = False
+    if heap_filter_eq(aos_map, 2, 2005) != year_matches:
+        all_match = False
+    
+    assert all_match, "SoA layout mismatch!"
+    print("\n✓ SUCCESS: SoA layout matches AoS layout!")
+
+
+def test_range_hint_narrowing():
+    """Test range-hinted Word/LongInt fields stored as biased Byte/Word"""
+    print("\n" + "=" * 70)
+    print("Test 10: Range-Hint Narrowing")
+    print("=" * 70)
+    
+    records = []
+    for i in range(200):
+        records.append(DBFRecord(
+            rec_no=i,
+            Year=1950 + (i % 100),
+            Score=100000 + i * 300,
+            Rating=i % 10
+        ))
+    
+    field_specs = [
+        HeapFieldSpec(0, HeapFieldType.WORD),                                  # RecNo
+        HeapFieldSpec(1, HeapFieldType.WORD, range_hint=(1900, 2100)),         # Year -> Byte
+        HeapFieldSpec(2, HeapFieldType.LONGINT, range_hint=(100000, 160000)),  # Score -> Word
+        HeapFieldSpec(3, HeapFieldType.WORD),                                  # Rating
+    ]
+    
+    heap_map = build_heap_map(records, field_specs, 8, verbose=True)
+    
+    all_match = (heap_map.record_count == 200 and
+                 field_specs[1].storage_type == HeapFieldType.BYTE and field_specs[1].bias == 1900 and
+                 field_specs[2].storage_type == HeapFieldType.WORD and field_specs[2].bias == 100000)
+    if not all_match:
+        print("  ✗ Fields were not narrowed")
+    
+    # Read back through the record buffer (an AoS map keeps no typed columns)
+    for i in (0, 1, 99, 199):
+        year = heap_get_word(heap_map, i, 2)
+        score = heap_get_longint(heap_map, i, 3)
+        rating = heap_get_word(heap_map, i, 4)
+        match = (year == 1950 + (i % 100) and score == 100000 + i * 300 and rating == i % 10)
+        status = "✓" if match else "✗"
+        print(f"  {status} Record {i}: Year={year}, Score={score}, Rating={rating}")
+        if not match:
+            all_match = False
+    
+    if heap_get_column(heap_map, 2) != [record.get_field(1) for record in records]:
+        print("  ✗ Year column mismatch")
+        all_match = False
+    
+    assert all_match, "Range-hint narrowing errors!"
+    print("\n✓ SUCCESS: Range-hinted fields fit in an 8-byte record!")
+
+
+def test_compiled_filter():
+    """Test compiled multi-predicate filters against a per-record scan"""
+    print("\n" + "=" * 70)
+    print("Test 11: Compiled Filters")
+    print("=" * 70)
+    
+    records = []
+    for i in range(500):
+        records.append(DBFRecord(
+            rec_no=i,
+            Year=2000 + (i % 10),
+            Rating=i % 10,
+            Active=(i % 3 == 0)
+        ))
+    
+    field_specs = [
+        HeapFieldSpec(0, HeapFieldType.WORD),      # RecNo
+        HeapFieldSpec(1, HeapFieldType.WORD),      # Year
+        HeapFieldSpec(2, HeapFieldType.WORD),      # Rating
+        HeapFieldSpec(3, HeapFieldType.BITFLAGS),  # Active
+    ]
+    
+    all_match = True
+    for layout in ('aos', 'soa'):
+        heap_map = build_heap_map(records, field_specs, 16, layout=layout)
+        
+        # Year == 2005 AND Rating >= 5 AND Active
+        year_filter = heap_compile_filter(heap_map, [(3, '>=', 5), (2, '==', 2005), (4, '==', True)])
+        expected = [i for i in range(500) if 2000 + (i % 10) == 2005 and i % 10 >= 5 and i % 3 == 0]
+        matches = year_filter()
+        status = "✓" if matches == expected else "✗"
+        print(f"  {status} {layout}: Year == 2005 AND Rating >= 5 AND Active -> {len(matches)} matches "
+              f"(expected {len(expected)})")
+        if matches != expected:
+            all_match = False
+    
+    # No predicates matches everything; a bad field or operator matches nothing
+    if (len(heap_compile_filter(heap_map, [])()) != 500 or
+            heap_compile_filter(heap_map, [(9, '==', 1)])() != [] or
+            heap_compile_filter(heap_map, [(2, '~', 1)])() != []):
+        print("  ✗ Empty/invalid predicate handling is wrong")
+        all_match = False
+    
+    assert all_match, "Compiled filter mismatch!"
+    print("\n✓ SUCCESS: Compiled filters match per-record scans!")
+
+
+def test_segmented_heap_map(verbose: bool = True):
+    """Test segmented heap map for tables >8K records (verbose: per-segment details)"""
     print("\n" + "=" * 70)
     print("Test: Segmented Heap Map (>8K records)")
     print("=" * 70)
@@ -873,20 +1499,35 @@ def test_segmented_heap_map():
     all_results = []
     total_matches = 0
     
+    # One heap map (buffer preallocated for a full segment) reused by every segment
+    heap_map = HeapMap(record_size=16, max_records=MAX_HEAP_RECORDS)
+    heap_map.field_specs = field_specs
+    heap_map.field_count = len(field_specs)
+    
+    # Read the computed offsets once; the segment loop only uses these locals
+    recno_spec, year_spec, active_spec = field_specs
+    recno_offset = recno_spec.heap_offset
+    active_offset, active_mask = active_spec.heap_offset, active_spec.bit_mask
+    record_size = heap_map.record_size
+    if year_spec.heap_offset != recno_offset + 2:
+        print("✗ RecNo and Year are not adjacent Words!")
+        return False
+    pack_recno_year = _S_RECNO_YEAR.pack_into
+    
+    # Filter: Year = 1995 AND Active = True, compiled once and rerun per segment
+    segment_filter = heap_compile_filter(heap_map, [(2, '==', 1995), (3, '==', True)])
+    
     for segment_num in range(segments_needed):
         start_recno = segment_num * MAX_HEAP_RECORDS + 1
         end_recno = min(start_recno + MAX_HEAP_RECORDS - 1, total_records)
         records_in_segment = end_recno - start_recno + 1
         
-        print(f"\nSegment {segment_num + 1}: records {start_recno:,}-{end_recno:,} ({records_in_segment:,} records)")
+        if verbose:
+            print(f"\nSegment {segment_num + 1}: records {start_recno:,}-{end_recno:,} ({records_in_segment:,} records)")
         
-        # Create heap map for this segment
-        heap_map = HeapMap(record_size=16)
-        heap_map.field_specs = field_specs
-        heap_map.field_count = len(field_specs)
+        heap_map.reset()
         
         # Simulate loading records into segment
-        segment_matches = 0
         for i in range(records_in_segment):
             actual_recno = start_recno + i
             
@@ -894,61 +1535,61 @@ def test_segmented_heap_map():
             year = 1990 + (actual_recno % 20)  # Years 1990-2009
             active = (actual_recno % 3) == 0   # Every 3rd record is active
             
-            # Create heap record
-            record = bytearray(16)
+            # Write the heap record in place
+            base = i * record_size
             
-            # Store RecNo (Word at offset 0)
-            struct.pack_into('<H', record, 0, actual_recno)
+            # Store RecNo and Year (adjacent Words) in one call
+            pack_recno_year(heap_map.buffer, base + recno_offset, actual_recno, year)
             
-            # Store Year (Word at offset 2)
-            struct.pack_into('<H', record, 2, year)
-            
-            # Store Active (BitFlag at offset 4)
+            # Store Active (BitFlag)
             if active:
-                record[4] |= 0x01
+                heap_map.buffer[base + active_offset] |= active_mask
             
-            heap_map.records.append(record)
             heap_map.record_count += 1
-            
-            # Filter: Year = 1995 AND Active = True
-            if year == 1995 and active:
-                all_results.append(actual_recno)
-                segment_matches += 1
         
-        print(f"  Matches in segment: {segment_matches}")
+        # Scan the packed segment: whole-column reads, no per-row Python loop
+        recnos = heap_get_column(heap_map, 1)
+        segment_results = [recnos[i] for i in segment_filter()]
+        all_results.extend(segment_results)
+        segment_matches = len(segment_results)
         total_matches += segment_matches
         
-        # Verify segment size
-        memory_used = heap_map.record_count * heap_map.record_size
-        print(f"  Memory used: {memory_used:,} bytes ({memory_used / 1024:.1f} KB)")
+        if verbose:
+            # Active is alone in its byte, so a strided bytes.count counts it in C
+            used = heap_map.record_count * record_size
+            active_count = heap_map.buffer[active_offset:used:record_size].count(active_mask)
+            print(f"  Matches in segment: {segment_matches} (Active records: {active_count:,})")
+            print(f"  Memory used: {used:,} bytes ({used / 1024:.1f} KB)")
+    
+    # Resetting must leave no stale Active bits behind for the next segment
+    heap_map.reset()
+    if heap_map.record_count != 0 or any(heap_map.buffer):
+        print("\n✗ FAILURE: reset() left stale records in the segment buffer")
+        return False
     
     print(f"\n{'=' * 70}")
     print(f"Total matches across all segments: {total_matches}")
     print(f"Total results collected: {len(all_results)}")
     
     # Verify results
-    print("\nFirst 10 matching records:")
-    for i, recno in enumerate(all_results[:10]):
-        year = 1990 + (recno % 20)
-        active = (recno % 3) == 0
-        print(f"  {i+1}. RecNo {recno}: Year={year}, Active={active}")
-    
-    # Calculate expected matches
-    # Year 1995 occurs at RecNo: 6, 26, 46, 66, ... (every 20th starting at 6)
-    # Active occurs at RecNo: 3, 6, 9, 12, 15, 18, 21, 24, 27, 30, ... (every 3rd)
-    # Both conditions: RecNo must be divisible by 3 AND (RecNo % 20) == 6
-    # This means RecNo % 60 must be 6, 66, or 126, ... but simplified: RecNo where (RecNo-6) % 60 == 0
-    expected_matches = 0
-    for recno in range(1, total_records + 1):
-        year = 1990 + (recno % 20)
-        active = (recno % 3) == 0
-        if year == 1995 and active:
-            expected_matches += 1
+    if verbose:
+        print("\nFirst 10 matching records:")
+        for i, recno in enumerate(all_results[:10]):
+            year = 1990 + (recno % 20)
+            active = (recno % 3) == 0
+            print(f"  {i+1}. RecNo {recno}: Year={year}, Active={active}")
+    
+    # Calculate expected matches in closed form
+    # Year 1995 occurs at RecNo % 20 == 5; Active occurs at RecNo % 3 == 0.
+    # Both conditions hold exactly when RecNo % 60 == 45, so the matches are
+    # RecNo 45, 105, 165, ... - no need to re-run the fixture loop.
+    expected_recnos = range(45, total_records + 1, 60)
+    expected_matches = len(expected_recnos)
     
     print(f"\nExpected matches: {expected_matches}")
     print(f"Actual matches: {total_matches}")
     
-    if total_matches == expected_matches:
+    if total_matches == expected_matches and all_results == list(expected_recnos):
         print("\n✓ SUCCESS: Segmented heap map works correctly!")
         return True
     else:
@@ -984,37 +1625,41 @@ def test_segmented_performance():
         
         calculate_heap_layout(field_specs, 16)
         
-        # Time segmented processing
-        start_time = time.time()
+        # Time segmented processing (no output inside the timed region)
+        start_time = time.perf_counter()
         
         total_matches = 0
+        
+        # One segment buffer, reset between segments (peak memory stays constant)
+        heap_map = HeapMap(record_size=16, max_records=MAX_HEAP_RECORDS)
+        heap_map.field_specs = field_specs
+        heap_map.field_count = len(field_specs)
+        
+        # Layout-derived constants, read once outside the segment loop
+        recno_offset = field_specs[0].heap_offset  # Year Word follows at +2
+        record_size = heap_map.record_size
+        pack_recno_year = _S_RECNO_YEAR.pack_into
+        
         for segment_num in range(segments_needed):
             start_recno = segment_num * MAX_HEAP_RECORDS + 1
             end_recno = min(start_recno + MAX_HEAP_RECORDS - 1, total_records)
             records_in_segment = end_recno - start_recno + 1
             
-            # Create segment
-            heap_map = HeapMap(record_size=16)
-            heap_map.field_specs = field_specs
-            heap_map.field_count = len(field_specs)
+            heap_map.reset()
             
-            # Load records
+            # Load records in place (RecNo + Year in one pack call)
             for i in range(records_in_segment):
                 actual_recno = start_recno + i
                 year = 1990 + (actual_recno % 20)
                 
-                record = bytearray(16)
-                struct.pack_into('<H', record, 0, actual_recno)
-                struct.pack_into('<H', record, 2, year)
+                pack_recno_year(heap_map.buffer, i * record_size + recno_offset, actual_recno, year)
                 
-                heap_map.records.append(record)
                 heap_map.record_count += 1
-                
-                # Filter: Year = 1995
-                if year == 1995:
-                    total_matches += 1
+            
+            # Filter: Year = 1995, counted over the whole Year column at once
+            total_matches += heap_get_column(heap_map, 2).count(1995)
         
-        elapsed_time = time.time() - start_time
+        elapsed_time = time.perf_counter() - start_time
         
         print(f"\nResults:")
         print(f"  Total matches: {total_matches:,}")
@@ -1035,6 +1680,16 @@ def test_segmented_performance():
     return True
 
 
+def _passed(test) -> bool:
+    """Run an assert-style test for the summary below (False if an assert fails)"""
+    try:
+        test()
+    except AssertionError as e:
+        print(f"\n✗ FAILURE: {e}")
+        return False
+    return True
+
+
 if __name__ == "__main__":
     print("Heap Map Builder Test")
     print("=" * 70)
@@ -1050,6 +1705,9 @@ if __name__ == "__main__":
     results.append(("Date Conversion", test_date_conversion()))
     results.append(("Boolean Packing", test_boolean_packing()))
     results.append(("Nibble Packing", test_nibble_packing()))
+    results.append(("SoA Layout", _passed(test_soa_layout)))
+    results.append(("Range-Hint Narrowing", _passed(test_range_hint_narrowing)))
+    results.append(("Compiled Filters", _passed(test_compiled_filter)))
     results.append(("Segmented Heap Map", test_segmented_heap_map()))
     results.append(("Segmented Performance", test_segmented_performance()))
     
@@ -6,10 +6,15 @@ This demonstrates the memory efficiency of the Pascal approach vs. Python's
 native dict-based approach for storing DBF query data.
 """
 
+import array
+import mmap
 import struct
 import sys
+import time
+from collections import Counter
 from dataclasses import dataclass
-from typing import List
+from itertools import compress, starmap
+from typing import Callable, List
 
 
 # ==============================================================================
@@ -50,19 +55,51 @@ class PythonHeapMap:
         return results
 
 
+class PyRecord:
+    """Plain Python record with __slots__ (no per-instance dict)."""
+    __slots__ = ('year', 'date_jdn', 'is_active', 'is_deleted', 'flags')
+    
+    def __init__(self, year: int, date_jdn: int, is_active: bool, is_deleted: bool, flags: int):
+        self.year = year
+        self.date_jdn = date_jdn
+        self.is_active = is_active
+        self.is_deleted = is_deleted
+        self.flags = flags
+
+
+class SlotsHeapMap(PythonHeapMap):
+    """Idiomatic Python baseline: RecNo -> __slots__ record objects."""
+    
+    def add_record(self, recno: int, year: int, date_jdn: int,
+                   is_active: bool, is_deleted: bool, flags: int):
+        """Add a record as a PyRecord."""
+        self.records[recno] = PyRecord(year, date_jdn, is_active, is_deleted, flags)
+    
+    def get_memory_usage(self) -> int:
+        """Measured memory usage: record objects, their int values, and the dict."""
+        # bools and small ints (flags) are shared singletons, so not counted
+        return (sys.getsizeof(self.records) +
+                sum(sys.getsizeof(rec) + sys.getsizeof(rec.year) + sys.getsizeof(rec.date_jdn)
+                    for rec in self.records.values()))
+    
+    def filter_records(self, min_year: int, max_year: int) -> List[int]:
+        """Filter records by year range."""
+        return [recno for recno, rec in self.records.items() if min_year <= rec.year <= max_year]
+
+
 # ==============================================================================
-# Pascal-Style Memory-Packed Approach (16-byte records)
+# Pascal-Style Memory-Packed Approach (12-byte records)
 # ==============================================================================
 
 @dataclass
 class PackedRecord:
-    """Represents a single 16-byte heap map record."""
+    """Represents a single 12-byte heap map record."""
     recno: int      # 4 bytes (LongInt for >64K support)
     year: int       # 2 bytes (Word)
     date_jdn: int   # 4 bytes (LongInt)
     bool_flags: int # 1 byte (bit-packed booleans)
     flags: int      # 1 byte (numeric flags)
-    # reserved: 4 bytes (padding to 16 bytes)
+    # Stored as RecNo, DateJDN, Year, BoolFlags, Flags: no padding needed
     
     # Boolean flag bit masks
     BOOL_IS_ACTIVE = 0x01
@@ -94,17 +131,46 @@ class PackedRecord:
 class PackedHeapMap:
     """Pascal-style memory-packed heap map using struct."""
     
-    # Struct format: LongInt(4) + Word(2) + LongInt(4) + Byte(1) + Byte(1) + Reserved(4)
-    # = 16 bytes total
-    RECORD_FORMAT = '<IHIBBxxxx'  # < = little-endian, x = padding byte
-    RECORD_SIZE = struct.calcsize(RECORD_FORMAT)
-    
-    def __init__(self, max_records: int = 100000):
-        """Initialize with pre-allocated byte array."""
+    # Struct format: LongInt(4) + LongInt(4) + Word(2) + Byte(1) + Byte(1)
+    # = 12 bytes total; widest fields first, so every field is naturally aligned
+    RECORD_FORMAT = '<IIHBB'  # < = little-endian, fields in storage order
+    RECORD_STRUCT = struct.Struct(RECORD_FORMAT)  # Compiled once, shared by all maps
+    RECORD_SIZE = RECORD_STRUCT.size
+    
+    # Field name -> (offset within a record, struct code); must match RECORD_FORMAT.
+    # Listed in PackedRecord order (the SoA column order), not storage order.
+    FIELD_LAYOUT = {
+        'recno': (0, 'I'),
+        'year': (8, 'H'),
+        'date_jdn': (4, 'I'),
+        'bool_flags': (10, 'B'),
+        'flags': (11, 'B'),
+    }
+    # Field name -> (offset, compiled single-field Struct) for get_field()
+    FIELD_STRUCTS = {name: (offset, struct.Struct('<' + code))
+                     for name, (offset, code) in FIELD_LAYOUT.items()}
+    
+    def __init__(self, max_records: int = 100000, layout: str = 'aos', backing: str = 'bytearray'):
+        """
+        Initialize with pre-allocated byte array.
+        layout='soa' keeps one typed array per field instead (no packed data),
+        so a scan only touches the columns it tests.
+        backing='mmap' puts the packed data in an anonymous memory map instead
+        of a bytearray: pages are OS-managed and only touched pages use RAM.
+        """
         self.max_records = max_records
         self.record_count = 0
-        # Pre-allocate memory (like Pascal static array)
-        self.data = bytearray(self.RECORD_SIZE * max_records)
+        self.layout = layout
+        if layout == 'soa':
+            self.data = bytearray()
+            self.columns = {name: array.array(code) for name, (_, code) in self.FIELD_LAYOUT.items()}
+        else:
+            # Pre-allocate memory (like Pascal static array)
+            if backing == 'mmap' and max_records > 0:
+                self.data = mmap.mmap(-1, self.RECORD_SIZE * max_records)
+            else:
+                self.data = bytearray(self.RECORD_SIZE * max_records)
+            self.columns = {}
     
     def add_record(self, recno: int, year: int, date_jdn: int,
                    is_active: bool, is_deleted: bool, flags: int):
@@ -119,64 +185,166 @@ class PackedHeapMap:
         if is_deleted:
             bool_flags |= PackedRecord.BOOL_IS_DELETED
         
-        # Pack the record into bytes
-        offset = self.record_count * self.RECORD_SIZE
-        struct.pack_into(self.RECORD_FORMAT, self.data, offset,
-                        recno, year, date_jdn, bool_flags, flags)
+        if self.columns:
+            # SoA: one store per column
+            for column, value in zip(self.columns.values(), (recno, year, date_jdn, bool_flags, flags)):
+                column.append(value)
+        else:
+            # Pack the record into bytes
+            offset = self.record_count * self.RECORD_SIZE
+            self.RECORD_STRUCT.pack_into(self.data, offset,
+                                         recno, date_jdn, year, bool_flags, flags)
         
         self.record_count += 1
     
+    def add_records(self, recnos, years, date_jdns, bool_flags, flags):
+        """
+        Add a batch of records given as parallel columns.
+        bool_flags holds the packed BoolFlags bytes (BOOL_IS_* bits).
+        The whole batch is packed and stored with one slice assignment.
+        """
+        count = len(recnos)
+        if self.record_count + count > self.max_records:
+            raise ValueError(f"Heap map full (max {self.max_records} records)")
+        
+        if self.columns:
+            # SoA: one extend per column
+            for column, values in zip(self.columns.values(), (recnos, years, date_jdns, bool_flags, flags)):
+                column.extend(values)
+        else:
+            pack = self.RECORD_STRUCT.pack
+            start = self.record_count * self.RECORD_SIZE
+            self.data[start:start + count * self.RECORD_SIZE] = b''.join(
+                starmap(pack, zip(recnos, date_jdns, years, bool_flags, flags)))
+        
+        self.record_count += count
+    
     def get_record(self, index: int) -> PackedRecord:
         """Unpack and return a record by index."""
         if index >= self.record_count:
             raise IndexError(f"Record index {index} out of range")
         
+        if self.columns:
+            return PackedRecord(*(column[index] for column in self.columns.values()))
+        
         offset = index * self.RECORD_SIZE
-        recno, year, date_jdn, bool_flags, flags = struct.unpack_from(
-            self.RECORD_FORMAT, self.data, offset)
+        recno, date_jdn, year, bool_flags, flags = self.RECORD_STRUCT.unpack_from(
+            self.data, offset)
         
         return PackedRecord(recno, year, date_jdn, bool_flags, flags)
     
+    def get_field(self, index: int, name: str) -> int:
+        """
+        Read one field (a FIELD_LAYOUT name) of one record, without
+        building a PackedRecord. Use get_record() when all fields are needed.
+        """
+        if index >= self.record_count:
+            raise IndexError(f"Record index {index} out of range")
+        
+        if self.columns:
+            return self.columns[name][index]
+        
+        offset, field_struct = self.FIELD_STRUCTS[name]
+        return field_struct.unpack_from(self.data, index * self.RECORD_SIZE + offset)[0]
+    
     def get_memory_usage(self) -> int:
         """Return actual memory usage in bytes."""
         # Only count allocated records, not the full pre-allocated array
+        if self.columns:
+            return sum(column.itemsize * len(column) for column in self.columns.values())
         return self.record_count * self.RECORD_SIZE
     
     def get_allocated_memory(self) -> int:
         """Return total allocated memory (like Pascal static array)."""
+        if self.columns:
+            return self.get_memory_usage()
         return len(self.data)
     
-    def filter_records(self, min_year: int, max_year: int) -> List[int]:
-        """Filter records by year range (fast sequential scan)."""
-        results = []
-        for i in range(self.record_count):
-            rec = self.get_record(i)
-            if min_year <= rec.year <= max_year:
-                results.append(rec.recno)
-        return results
+    def filter_records(self, min_year: int, max_year: int, out=None) -> List[int]:
+        """
+        Filter records by year range (fast sequential scan).
+        Only the Year column is scanned and RecNo read for the matches;
+        never call get_record() inside a scan loop.
+        out: see filter_with_mask().
+        """
+        return self.filter_with_mask(min_year, max_year, 0, 0, 0, 0, out)
     
-    def filter_records_direct(self, min_year: int, max_year: int) -> List[int]:
-        """Filter using direct memory access (Pascal-style, no unpacking)."""
-        results = []
-        # Year field is at offset 4 (after RecNo LongInt)
-        # It's a Word (2 bytes), little-endian
-        for i in range(self.record_count):
-            offset = i * self.RECORD_SIZE + 4  # Skip RecNo (4 bytes)
-            # Read year directly from memory as 2-byte unsigned int
-            year = self.data[offset] | (self.data[offset + 1] << 8)
-            if min_year <= year <= max_year:
-                # Read RecNo directly (first 4 bytes)
-                recno_offset = i * self.RECORD_SIZE
-                recno = (self.data[recno_offset] | 
-                        (self.data[recno_offset + 1] << 8) |
-                        (self.data[recno_offset + 2] << 16) |
-                        (self.data[recno_offset + 3] << 24))
-                results.append(recno)
-        return results
+    def compile_year_range(self, min_year: int, max_year: int) -> Callable[[], List[int]]:
+        """
+        Compile a year-range query into a reusable scan for repeated queries.
+        The bounds are resolved once into the set of matching Year Words, so
+        each run is a C-level membership map + compress over the columns,
+        with no per-record compare in Python.
+        Returns a function giving the matching RecNos (current records).
+        """
+        in_range = frozenset(range(max(min_year, 0), min(max_year, 0xFFFF) + 1))
+        
+        def run_query() -> List[int]:
+            years = self.field_column('year')
+            recnos = self.field_column('recno')
+            return list(compress(recnos, map(in_range.__contains__, years)))
+        
+        return run_query
+    
+    def count_matches(self, min_year: int, max_year: int) -> int:
+        """
+        Count records in a year range without building a result list.
+        The Year column is tallied once in C (Counter); only the distinct
+        years are then range-tested.
+        """
+        year_counts = Counter(self.field_column('year'))
+        return sum(count for year, count in year_counts.items() if min_year <= year <= max_year)
+    
+    def field_column(self, name: str):
+        """
+        Read one field (a FIELD_LAYOUT name) of every record without unpacking
+        whole records. SoA maps return the typed column itself. Otherwise
+        aligned fields are read through a strided typed view of the data, and
+        others with a single struct.iter_unpack pass.
+        """
+        if self.columns:
+            return self.columns[name]
+        return self._packed_column(*self.FIELD_LAYOUT[name])
+    
+    def _packed_column(self, offset: int, code: str) -> list:
+        """Read the struct-code value at offset from every packed record"""
+        width = struct.calcsize(code)
+        used = self.record_count * self.RECORD_SIZE
+        if width == 1:
+            return list(self.data[offset:used:self.RECORD_SIZE])
+        if (sys.byteorder == 'little' and offset % width == 0 and
+                self.RECORD_SIZE % width == 0):
+            with memoryview(self.data) as raw, raw[:used].cast(code) as lanes:
+                return lanes[offset // width::self.RECORD_SIZE // width].tolist()
+        padding = self.RECORD_SIZE - offset - width
+        column_struct = struct.Struct(f'<{offset}x{code}{padding}x')
+        with memoryview(self.data) as raw:
+            return [value for (value,) in column_struct.iter_unpack(raw[:used])]
+    
+    def _byte_column(self, name: str) -> bytes:
+        """One-byte field of every record as bytes (a strided slice of the packed data)"""
+        if self.columns:
+            return self.columns[name].tobytes()
+        offset = self.FIELD_LAYOUT[name][0]
+        return self.data[offset:self.record_count * self.RECORD_SIZE:self.RECORD_SIZE]
+    
+    def filter_records_direct(self, min_year: int, max_year: int, out=None) -> List[int]:
+        """
+        Filter using direct memory access (Pascal-style, no unpacking).
+        out: see filter_with_mask().
+        """
+        # Only the Year and RecNo columns are read
+        years = self.field_column('year')
+        recnos = self.field_column('recno')
+        matches = (recno for recno, year in zip(recnos, years) if min_year <= year <= max_year)
+        if out is None:
+            return list(matches)
+        out.extend(matches)
+        return out
     
     def filter_with_mask(self, year_min: int, year_max: int, 
                         bool_mask: int, bool_value: int,
-                        flag_mask: int, flag_value: int) -> List[int]:
+                        flag_mask: int, flag_value: int, out=None) -> List[int]:
         """
         Filter using bitwise operations (true Pascal-style).
         
@@ -185,76 +353,84 @@ class PackedHeapMap:
         - Use bitwise AND to check boolean flags
         - Use bitwise AND to check numeric flags
         - All without unpacking the entire record
+        
+        Returns the matching RecNos as a list, or appends them to out (e.g. an
+        array.array('I'), 4 bytes per RecNo) and returns out when it is given.
         """
-        results = []
-        for i in range(self.record_count):
-            offset = i * self.RECORD_SIZE
-            
-            # Struct format: <IHIBBxxxx
-            # RecNo: offset 0 (4 bytes)
-            # Year: offset 4 (2 bytes)
-            # DateJDN: offset 6 (4 bytes)
-            # BoolFlags: offset 10 (1 byte)
-            # Flags: offset 11 (1 byte)
-            # Reserved: offset 12 (4 bytes padding)
-            
-            # Read year (offset 4, 2 bytes)
-            year = self.data[offset + 4] | (self.data[offset + 5] << 8)
-            if not (year_min <= year <= year_max):
-                continue
-            
-            # Read bool_flags (offset 10, 1 byte)
-            if bool_mask != 0:
-                bool_flags = self.data[offset + 10]
-                if (bool_flags & bool_mask) != bool_value:
-                    continue
-            
-            # Read flags (offset 11, 1 byte)
-            if flag_mask != 0:
-                flags = self.data[offset + 11]
-                if (flags & flag_mask) != flag_value:
-                    continue
-            
-            # Match! Read RecNo (offset 0, 4 bytes)
-            recno = (self.data[offset] | 
-                    (self.data[offset + 1] << 8) |
-                    (self.data[offset + 2] << 16) |
-                    (self.data[offset + 3] << 24))
-            results.append(recno)
+        # The single unsigned compare below only holds with both bounds in
+        # Word range, so clamp them like compile_year_range does
+        year_min = max(year_min, 0)
+        year_max = min(year_max, 0xFFFF)
+        if year_min > year_max:
+            return [] if out is None else out
         
-        return results
+        # Flag tests first, entirely in C: each flag byte column is translated
+        # through a 256-entry pass table, and the pass bytes AND-ed as one int
+        count = self.record_count
+        passed = None
+        for name, mask, value in (('bool_flags', bool_mask, bool_value),
+                                  ('flags', flag_mask, flag_value)):
+            if mask != 0:
+                table = bytes((byte & mask) == value for byte in range(256))
+                field_passed = self._byte_column(name).translate(table)
+                if passed is None:
+                    passed = field_passed
+                else:
+                    passed = (int.from_bytes(passed, 'little') &
+                              int.from_bytes(field_passed, 'little')).to_bytes(count, 'little')
+        
+        # Year range as one unsigned compare (bounds clamped above): Years
+        # below year_min wrap around to large Words, so a single test rejects
+        # both ends, with or without flag candidates
+        years = self.field_column('year')
+        span = year_max - year_min
+        if passed is None:
+            matches = [i for i, year in enumerate(years) if (year - year_min) & 0xFFFF <= span]
+        else:
+            matches = [i for i in compress(range(count), passed)
+                       if (years[i] - year_min) & 0xFFFF <= span]
+        
+        # Match! Read RecNo for the survivors
+        recnos = self.field_column('recno')
+        if out is None:
+            return [recnos[i] for i in matches]
+        out.extend(map(recnos.__getitem__, matches))
+        return out
 
 
 # ==============================================================================
 # Comparison and Benchmarking
 # ==============================================================================
 
+# Test-data Flags byte for RecNo % 210 (the %10/%7/%5/%3 pattern repeats every lcm = 210)
+_FLAG_LUT = bytes(
+    (PackedRecord.FLAG_FEATURED if (recno % 10) == 0 else 0) |
+    (PackedRecord.FLAG_VERIFIED if (recno % 7) == 0 else 0) |
+    (PackedRecord.FLAG_ARCHIVED if (recno % 5) == 0 else 0) |
+    (PackedRecord.FLAG_FAVORITE if (recno % 3) == 0 else 0)
+    for recno in range(210)
+)
+
+
 def create_test_data(count: int) -> List[tuple]:
-    """Generate test data for both implementations."""
+    """
+    Generate test data for both implementations.
+    Built column by column: random columns come from one random.choices call
+    each, and the flags from _FLAG_LUT.
+    """
     import random
-    random.seed(42)
-    
-    data = []
-    for recno in range(1, count + 1):
-        year = random.randint(1980, 2025)
-        date_jdn = 2440000 + random.randint(0, 20000)  # ~1968-2022
-        is_active = (recno % 2) == 0
-        is_deleted = (recno % 4) == 0
-        
-        # Generate flags
-        flags = 0
-        if (recno % 10) == 0:
-            flags |= PackedRecord.FLAG_FEATURED
-        if (recno % 7) == 0:
-            flags |= PackedRecord.FLAG_VERIFIED
-        if (recno % 5) == 0:
-            flags |= PackedRecord.FLAG_ARCHIVED
-        if (recno % 3) == 0:
-            flags |= PackedRecord.FLAG_FAVORITE
-        
-        data.append((recno, year, date_jdn, is_active, is_deleted, flags))
+    rng = random.Random(42)
     
-    return data
+    recnos = range(1, count + 1)
+    years = rng.choices(range(1980, 2026), k=count)
+    date_jdns = rng.choices(range(2440000, 2460001), k=count)  # ~1968-2022
+    is_active = [(recno % 2) == 0 for recno in recnos]
+    is_deleted = [(recno % 4) == 0 for recno in recnos]
+    
+    # Generate flags
+    flags = [_FLAG_LUT[recno % 210] for recno in recnos]
+    
+    return list(zip(recnos, years, date_jdns, is_active, is_deleted, flags))
 
 
 def compare_implementations(record_count: int):
@@ -279,18 +455,29 @@ def compare_implementations(record_count: int):
     print(f"   Memory usage:       {python_memory:,} bytes ({python_memory / 1024:.1f} KB)")
     print(f"   Bytes per record:   {python_memory / record_count:.1f}")
     
+    # Fairer Python baseline: __slots__ objects instead of per-record dicts
+    slots_map = SlotsHeapMap()
+    for recno, year, date_jdn, is_active, is_deleted, flags in test_data:
+        slots_map.add_record(recno, year, date_jdn, is_active, is_deleted, flags)
+    
+    slots_memory = slots_map.get_memory_usage()
+    print(f"   __slots__ records:  {slots_memory:,} bytes ({slots_memory / record_count:.1f} per record, measured)")
+    
     # Test packed approach
     print("\n2. Pascal-Style Packed Approach")
     print("-" * 70)
     packed_map = PackedHeapMap(max_records=record_count)
-    for recno, year, date_jdn, is_active, is_deleted, flags in test_data:
-        packed_map.add_record(recno, year, date_jdn, is_active, is_deleted, flags)
+    recnos, years, date_jdns, actives, deleteds, flag_values = zip(*test_data)
+    bool_flag_values = [(PackedRecord.BOOL_IS_ACTIVE if is_active else 0) |
+                        (PackedRecord.BOOL_IS_DELETED if is_deleted else 0)
+                        for is_active, is_deleted in zip(actives, deleteds)]
+    packed_map.add_records(recnos, years, date_jdns, bool_flag_values, flag_values)
     
     packed_memory = packed_map.get_memory_usage()
     print(f"   Records stored:     {packed_map.record_count:,}")
     print(f"   Memory usage:       {packed_memory:,} bytes ({packed_memory / 1024:.1f} KB)")
     print(f"   Bytes per record:   {PackedHeapMap.RECORD_SIZE}")
-    print(f"   Record alignment:   {PackedHeapMap.RECORD_SIZE}-byte (optimal for 8086)")
+    print(f"   Record layout:      {PackedHeapMap.RECORD_FORMAT} (aligned fields, no padding)")
     
     # Comparison
     print("\n3. Comparison")
@@ -301,6 +488,7 @@ def compare_implementations(record_count: int):
     print(f"   Savings:            {savings_pct:.1f}%")
     print(f"   Efficiency:         {record_count / (packed_memory / 1024):.0f} records per KB (packed)")
     print(f"                       {record_count / (python_memory / 1024):.0f} records per KB (dict)")
+    print(f"                       {record_count / (slots_memory / 1024):.0f} records per KB (__slots__)")
     
     # Verify data integrity
     print("\n4. Data Integrity Check")
@@ -331,14 +519,17 @@ def compare_implementations(record_count: int):
     print("-" * 70)
     print("   Filtering records where year >= 2000 and year <= 2010...")
     
-    import time
-    
     # Python dict
     start = time.perf_counter()
     python_results = python_map.filter_records(2000, 2010)
     python_time = time.perf_counter() - start
     
-    # Packed (with unpacking)
+    # Python __slots__ records
+    start = time.perf_counter()
+    slots_results = slots_map.filter_records(2000, 2010)
+    slots_time = time.perf_counter() - start
+    
+    # Packed (Year column only)
     start = time.perf_counter()
     packed_results = packed_map.filter_records(2000, 2010)
     packed_time = time.perf_counter() - start
@@ -348,16 +539,54 @@ def compare_implementations(record_count: int):
     packed_direct_results = packed_map.filter_records_direct(2000, 2010)
     packed_direct_time = time.perf_counter() - start
     
+    # Columnar (SoA): the scan touches only the 2-byte Year column (+ RecNo for matches)
+    soa_map = PackedHeapMap(max_records=record_count, layout='soa')
+    soa_map.add_records(recnos, years, date_jdns, bool_flag_values, flag_values)
+    start = time.perf_counter()
+    soa_results = soa_map.filter_records_direct(2000, 2010, out=array.array('I'))
+    soa_time = time.perf_counter() - start
+    
+    # Same packed layout backed by an anonymous mmap (zero-copy views, OS paging)
+    mmap_map = PackedHeapMap(max_records=record_count, backing='mmap')
+    mmap_map.add_records(recnos, years, date_jdns, bool_flag_values, flag_values)
+    start = time.perf_counter()
+    mmap_results = mmap_map.filter_records(2000, 2010)
+    mmap_time = time.perf_counter() - start
+    
+    # Compiled query (bounds resolved once, outside the timer)
+    year_query = packed_map.compile_year_range(2000, 2010)
+    start = time.perf_counter()
+    compiled_results = year_query()
+    compiled_time = time.perf_counter() - start
+    
+    # Count only: no result list, just the scan
+    start = time.perf_counter()
+    packed_count = packed_map.count_matches(2000, 2010)
+    packed_count_time = time.perf_counter() - start
+    
     print(f"   Python dict:        {len(python_results):,} matches in {python_time*1000:.2f} ms")
-    print(f"   Packed (unpack):    {len(packed_results):,} matches in {packed_time*1000:.2f} ms")
+    print(f"   Python __slots__:   {len(slots_results):,} matches in {slots_time*1000:.2f} ms")
+    print(f"   Packed (columns):   {len(packed_results):,} matches in {packed_time*1000:.2f} ms")
     print(f"   Packed (direct):    {len(packed_direct_results):,} matches in {packed_direct_time*1000:.2f} ms")
+    print(f"   Columnar (SoA):     {len(soa_results):,} matches in {soa_time*1000:.2f} ms")
+    print(f"   Packed (mmap):      {len(mmap_results):,} matches in {mmap_time*1000:.2f} ms")
+    print(f"   Packed (compiled):  {len(compiled_results):,} matches in {compiled_time*1000:.2f} ms")
+    print(f"   Packed (count):     {packed_count:,} matches in {packed_count_time*1000:.2f} ms")
     
     if packed_direct_time > 0:
         speedup = python_time / packed_direct_time
         print(f"   Speedup (direct):   {speedup:.2f}x {'faster' if speedup > 1 else 'slower'}")
     
     # Verify all methods return same results
-    assert set(python_results) == set(packed_results) == set(packed_direct_results), "Results mismatch!"
+    # All scans return load (RecNo) order, so sorted() is a linear C pass - no hashing
+    assert sorted(python_results) == sorted(packed_results) == sorted(packed_direct_results), "Results mismatch!"
+    assert soa_results.tolist() == packed_direct_results, "SoA results mismatch!"
+    assert packed_count == len(packed_direct_results), "Match count mismatch!"
+    assert compiled_results == packed_results, "Compiled query results mismatch!"
+    assert slots_results == python_results, "__slots__ results mismatch!"
+    assert soa_map.get_record(sample_idx) == packed_rec, "SoA record mismatch!"
+    assert mmap_results == packed_results, "mmap results mismatch!"
+    assert mmap_map.get_record(sample_idx) == packed_rec, "mmap record mismatch!"
     
     # DOS memory constraints
     print("\n6. DOS Memory Constraints (440 KB available)")
@@ -393,49 +622,55 @@ def demonstrate_or_filtering():
     for recno, year, jdn, active, deleted, flags in test_records:
         packed_map.add_record(recno, year, jdn, active, deleted, flags)
     
-    print("Test Dataset:")
-    for i in range(packed_map.record_count):
-        rec = packed_map.get_record(i)
-        print(f"  Record {rec.recno}: Year={rec.year}, Active={rec.is_active}")
+    # Build the listing first, then print it in one call
+    rows = [packed_map.get_record(i) for i in range(packed_map.record_count)]
+    print("Test Dataset:\n" + "\n".join(
+        f"  Record {rec.recno}: Year={rec.year}, Active={rec.is_active}" for rec in rows))
     
     # Query: (Year=2005) OR (Year=2010)
     print("\nQuery: (Year=2005) OR (Year=2010)")
     print("  Strategy: Build separate bitmaps, then OR them together")
     
+    # Typed column views of the packed data, shared by both passes
+    years = packed_map.field_column('year')
+    recnos = packed_map.field_column('recno')
+    bitmap_size = (max(recnos, default=0) >> 3) + 1  # 1 bit per RecNo
+    
+    def year_bitmap(target_year: int) -> bytearray:
+        """One pass: set bit RecNo for every record with Year = target_year."""
+        bitmap = bytearray(bitmap_size)
+        for recno, year in zip(recnos, years):
+            if year == target_year:
+                bitmap[recno >> 3] |= 1 << (recno & 7)
+        return bitmap
+    
+    def bitmap_recnos(bitmap) -> List[int]:
+        """RecNos of the set bits (all-zero bytes are skipped whole)."""
+        return [(index << 3) | bit for index, byte in enumerate(bitmap) if byte
+                for bit in range(8) if (byte >> bit) & 1]
+    
+    # Scan silently (timed), report afterwards
+    start = time.perf_counter_ns()
+    
     # Pass 1: Find Year=2005
-    bitmap1 = set()
-    for i in range(packed_map.record_count):
-        offset = i * packed_map.RECORD_SIZE
-        year = packed_map.data[offset + 4] | (packed_map.data[offset + 5] << 8)
-        if year == 2005:
-            recno = (packed_map.data[offset] | 
-                    (packed_map.data[offset + 1] << 8) |
-                    (packed_map.data[offset + 2] << 16) |
-                    (packed_map.data[offset + 3] << 24))
-            bitmap1.add(recno)
-    
-    print(f"  Pass 1 (Year=2005): {sorted(bitmap1)}")
+    bitmap1 = year_bitmap(2005)
     
     # Pass 2: Find Year=2010
-    bitmap2 = set()
-    for i in range(packed_map.record_count):
-        offset = i * packed_map.RECORD_SIZE
-        year = packed_map.data[offset + 4] | (packed_map.data[offset + 5] << 8)
-        if year == 2010:
-            recno = (packed_map.data[offset] | 
-                    (packed_map.data[offset + 1] << 8) |
-                    (packed_map.data[offset + 2] << 16) |
-                    (packed_map.data[offset + 3] << 24))
-            bitmap2.add(recno)
-    
-    print(f"  Pass 2 (Year=2010): {sorted(bitmap2)}")
-    
-    # OR the bitmaps
-    result = bitmap1 | bitmap2
-    print(f"  Result (OR):        {sorted(result)}")
+    bitmap2 = year_bitmap(2010)
+    
+    # OR the bitmaps: whole bitmaps as ints, so the OR runs a machine word at a time
+    result_bitmap = (int.from_bytes(bitmap1, 'little') |
+                     int.from_bytes(bitmap2, 'little')).to_bytes(bitmap_size, 'little')
+    result = bitmap_recnos(result_bitmap)
+    
+    elapsed_ns = time.perf_counter_ns() - start
+    
+    print(f"  Pass 1 (Year=2005): {bitmap_recnos(bitmap1)}")
+    print(f"  Pass 2 (Year=2010): {bitmap_recnos(bitmap2)}")
+    print(f"  Result (OR):        {result}  ({elapsed_ns / 1000:.1f} us)")
     print(f"  Expected:           [1, 3, 4, 5]")
     
-    assert sorted(result) == [1, 3, 4, 5], f"Expected [1, 3, 4, 5], got {sorted(result)}"
+    assert result == [1, 3, 4, 5], f"Expected [1, 3, 4, 5], got {result}"
     print("  [OK] Correct!")
     
     # Show Pascal equivalent
@@ -492,18 +727,19 @@ def demonstrate_bitwise_filtering():
     for recno, year, jdn, active, deleted, flags in test_records:
         packed_map.add_record(recno, year, jdn, active, deleted, flags)
     
-    print("Test Dataset:")
-    for i in range(packed_map.record_count):
-        rec = packed_map.get_record(i)
-        print(f"  Record {rec.recno}: Year={rec.year}, Active={rec.is_active}, "
-              f"Deleted={rec.is_deleted}, Flags=0x{rec.flags:02X}")
+    # Build the listing first, then print it in one call
+    rows = [packed_map.get_record(i) for i in range(packed_map.record_count)]
+    print("Test Dataset:\n" + "\n".join(
+        f"  Record {rec.recno}: Year={rec.year}, Active={rec.is_active}, "
+        f"Deleted={rec.is_deleted}, Flags=0x{rec.flags:02X}" for rec in rows))
     
     # Debug: Check what's in memory
     print("\nDebug: Memory layout for record 0:")
     offset = 0
-    print(f"  Offset 0-3 (RecNo):     {packed_map.data[offset:offset+4].hex()}")
-    print(f"  Offset 4-5 (Year):      {packed_map.data[offset+4:offset+6].hex()}")
-    print(f"  Offset 6-9 (DateJDN):   {packed_map.data[offset+6:offset+10].hex()}")
+    with memoryview(packed_map.data) as raw:  # Zero-copy slices of the packed data
+        print(f"  Offset 0-3 (RecNo):     {raw[offset:offset+4].hex()}")
+        print(f"  Offset 4-7 (DateJDN):   {raw[offset+4:offset+8].hex()}")
+        print(f"  Offset 8-9 (Year):      {raw[offset+8:offset+10].hex()}")
     print(f"  Offset 10 (BoolFlags):  {packed_map.data[offset+10]:02x}")
     print(f"  Offset 11 (Flags):      {packed_map.data[offset+11]:02x}")
     
@@ -511,6 +747,7 @@ def demonstrate_bitwise_filtering():
     print("\nQuery: Year=2005 AND Active=True AND Featured=True")
     print("  Using bitwise filter (Pascal-style)...")
     
+    start = time.perf_counter_ns()
     results = packed_map.filter_with_mask(
         year_min=2005,
         year_max=2005,
@@ -519,8 +756,9 @@ def demonstrate_bitwise_filtering():
         flag_mask=PackedRecord.FLAG_FEATURED,       # Check Featured bit
         flag_value=PackedRecord.FLAG_FEATURED       # Must be set
     )
+    elapsed_ns = time.perf_counter_ns() - start
     
-    print(f"  Matches: {results}")
+    print(f"  Matches: {results}  ({elapsed_ns / 1000:.1f} us)")
     print(f"  Expected: [1, 3] (records with Year=2005, Active, Featured)")
     
     # Verify
@@ -561,6 +799,39 @@ def demonstrate_bitwise_filtering():
     print("               Result = bitmap1 OR bitmap2")
 
 
+def _open_range_maps() -> List[PackedHeapMap]:
+    """Years 1980/1985/1995/2005 as RecNos 1-4 (Active on even RecNos), in each layout"""
+    maps = [PackedHeapMap(max_records=10), PackedHeapMap(max_records=10, layout='soa')]
+    for packed_map in maps:
+        for recno, year in enumerate([1980, 1985, 1995, 2005], start=1):
+            packed_map.add_record(recno, year, 2450000 + recno, recno % 2 == 0, False, 0)
+    return maps
+
+
+def test_open_ended_year_range():
+    """Year bounds outside the Word range must not wrap the unsigned compare."""
+    for packed_map in _open_range_maps():
+        for year_min, year_max in [(1990, 99999), (1990, 70000), (-5, 1985),
+                                   (-70000, 99999), (70000, 99999), (2005, 2005)]:
+            expected = packed_map.filter_records_direct(year_min, year_max)
+            results = packed_map.filter_with_mask(year_min, year_max, 0, 0, 0, 0)
+            assert results == expected, f"({year_min}, {year_max}): {results} != {expected}"
+            # Flag candidates take the compress() path: same range, Active only
+            active = PackedRecord.BOOL_IS_ACTIVE
+            results = packed_map.filter_with_mask(year_min, year_max, active, active, 0, 0)
+            assert results == [recno for recno in expected if recno % 2 == 0], \
+                f"({year_min}, {year_max}) Active: {results}"
+            results = packed_map.filter_records(year_min, year_max)
+            assert results == expected, f"({year_min}, {year_max}) filter_records: {results}"
+            count = packed_map.count_matches(year_min, year_max)
+            assert count == len(expected), f"({year_min}, {year_max}) count: {count}"
+        assert packed_map.filter_with_mask(1990, 99999, 0, 0, 0, 0) == [3, 4]
+        assert packed_map.count_matches(1990, 99999) == 2
+        assert packed_map.filter_records(1990, 99999) == [3, 4]
+        assert packed_map.filter_with_mask(1990, 99999, PackedRecord.BOOL_IS_ACTIVE,
+                                           PackedRecord.BOOL_IS_ACTIVE, 0, 0) == [4]
+
+
 def demonstrate_bit_packing():
     """Demonstrate bit-packing of boolean and flag fields."""
     print(f"\n{'='*70}")
@@ -614,6 +885,9 @@ def main():
     # Demonstrate bit-packing
     demonstrate_bit_packing()
     
+    # Open-ended year ranges
+    test_open_ended_year_range()
+    
     # Compare implementations with different record counts
     for count in [1000, 10000, 27500]:
         compare_implementations(count)
@@ -622,14 +896,18 @@ def main():
     print("Summary")
     print(f"{'='*70}")
     print("\nKey Findings:")
-    print("  • Packed records use 16 bytes vs. 310 bytes (95% savings)")
-    print("  • 27,500 records fit in 440 KB (packed) vs. 1,419 records (dict)")
-    print("  • 16-byte alignment optimal for 8086 architecture")
+    record_size = PackedHeapMap.RECORD_SIZE
+    dos_memory = 440 * 1024
+    print(f"  • Packed records use {record_size} bytes vs. 310 bytes "
+          f"({(1 - record_size / 310) * 100:.0f}% savings)")
+    print(f"  • {dos_memory // record_size:,} records fit in 440 KB (packed) "
+          f"vs. {dos_memory // 310:,} records (dict)")
+    print("  • Widest fields first: every field aligned with no padding bytes")
     print("  • Bit-packing stores 6 flags in 2 bytes (67% savings)")
     print("  • Sequential scanning is cache-friendly and fast")
     print("\nConclusion:")
     print("  The Pascal memory-packed approach is viable for DOS!")
-    print("  It enables 19x more records in the same memory footprint.")
+    print(f"  It enables {310 // record_size}x more records in the same memory footprint.")
     print()
 
 
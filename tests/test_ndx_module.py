@@ -7,21 +7,82 @@ to validate that our Python implementation reads them correctly.
 
 import unittest
 import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from ndx_module import (
     ndx_read_header, ndx_dump_first_entries,
     ndx_find_exact, ndx_find_prefix, 
     ndx_find_number_exact, ndx_find_number_range,
     ndx_find_date_exact, ndx_find_date_range,
+    ndx_file_open, ndx_file_close,
     NDXHeader
 )
 
+# Sample files live in <repo>/samples; resolved once so tests run from any directory
+SAMPLES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "samples")
+
+# Diagnostic output is only printed when VERBOSE_TESTS is set
+VERBOSE = bool(os.environ.get('VERBOSE_TESTS'))
+
+
+def vprint(*args, **kwargs):
+    """print() that is a no-op unless VERBOSE_TESTS is set."""
+    if VERBOSE:
+        print(*args, **kwargs)
+
 
 class TestNDXReading(unittest.TestCase):
     """Test NDX file reading functionality."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Set up fixtures shared by all tests (sample NDX headers are cached by ndx_module)."""
+        cls.samples_dir = SAMPLES_DIR
+        
+        # DEVNAME3.NDX stays open for the exact/prefix tests that query it back to back
+        cls.devname3 = ndx_file_open(os.path.join(cls.samples_dir, "DEVNAME3.NDX"))
+        
+        # Build the YEARP/DATEADDP indexes once; the exact and range tests share them
+        from ndx_module import ndx_create_index
+        
+        dbf_filename = os.path.join(cls.samples_dir, "GAMES3.DBF")
+        cls.yearp_path = os.path.join(cls.samples_dir, "YEARP.NDX")
+        cls.dateaddp_path = os.path.join(cls.samples_dir, "DATEADDP.NDX")
+        
+        try:
+            # The builds are independent and CPU-bound: overlap them in worker
+            # processes when there is more than one core
+            fields = ("year", "dateadd")
+            paths = (cls.yearp_path, cls.dateaddp_path)
+            workers = min(len(fields), os.cpu_count() or 1)
+            if workers > 1:
+                with ProcessPoolExecutor(max_workers=workers) as ex:
+                    built = list(ex.map(ndx_create_index, [dbf_filename] * len(fields), fields, paths))
+            else:
+                built = [ndx_create_index(dbf_filename, f, p) for f, p in zip(fields, paths)]
+            cls.yearp_built, cls.dateaddp_built = built
+        except Exception:
+            # tearDownClass is not called when setUpClass fails
+            cls.tearDownClass()
+            raise
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the shared indexes built in setUpClass (unless KEEP_TEST_FILES is set)."""
+        ndx_file_close(cls.devname3)
+        
+        if os.environ.get('KEEP_TEST_FILES'):
+            return
+        
+        for filename in (cls.yearp_path, cls.dateaddp_path):
+            try:
+                os.unlink(filename)
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                print(f"⚠️  Could not remove {filename}: {e}")
+    
     def setUp(self):
         """Set up test fixtures."""
-        self.samples_dir = "samples"
         # Track created NDX files for cleanup
         self.created_files = []
     
@@ -29,17 +90,19 @@ class TestNDXReading(unittest.TestCase):
         """Clean up created test files (unless KEEP_TEST_FILES is set)."""
         # Check if we should keep test files for debugging
         if os.environ.get('KEEP_TEST_FILES'):
-            print("\n📁 Keeping test files for inspection (KEEP_TEST_FILES is set)")
+            vprint("\n📁 Keeping test files for inspection (KEEP_TEST_FILES is set)")
             return
         
         # Only delete files we created (not sample files)
         for filename in self.created_files:
-            if os.path.exists(filename):
-                try:
-                    os.remove(filename)
-                    print(f"🗑️  Cleaned up: {filename}")
-                except Exception as e:
-                    print(f"⚠️  Could not remove {filename}: {e}")
+            try:
+                os.unlink(filename)
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                print(f"⚠️  Could not remove {filename}: {e}")
+            else:
+                vprint(f"🗑️  Cleaned up: {filename}")
         
     def test_devname3_header(self):
         """Test reading DEVNAME3.NDX header."""
@@ -48,20 +111,20 @@ class TestNDXReading(unittest.TestCase):
         header = ndx_read_header(filename)
         
         self.assertIsNotNone(header, "Should read header successfully")
-        self.assertGreater(header.root_block, 0, "Root block should be positive")
-        self.assertGreater(header.eof_block, 0, "EOF block should be positive")
-        self.assertGreater(header.key_len, 0, "Key length should be positive")
-        self.assertGreater(header.keys_max, 0, "Keys max should be positive")
-        self.assertGreater(header.group_len, 0, "Group length should be positive")
+        # Root/EOF block, key length, keys max and group length are all positive;
+        # the header itself is the failure message (only formatted on failure)
+        fields = (header.root_block, header.eof_block, header.key_len,
+                  header.keys_max, header.group_len)
+        self.assertTrue(all(v > 0 for v in fields), header)
         
         # Print header info for manual verification
-        print(f"\nDEVNAME3.NDX Header:")
-        print(f"  Expression: {header.expr}")
-        print(f"  Key length: {header.key_len}")
-        print(f"  Keys max: {header.keys_max}")
-        print(f"  Group length: {header.group_len}")
-        print(f"  Root block: {header.root_block}")
-        print(f"  EOF block: {header.eof_block}")
+        vprint(f"\nDEVNAME3.NDX Header:")
+        vprint(f"  Expression: {header.expr}")
+        vprint(f"  Key length: {header.key_len}")
+        vprint(f"  Keys max: {header.keys_max}")
+        vprint(f"  Group length: {header.group_len}")
+        vprint(f"  Root block: {header.root_block}")
+        vprint(f"  EOF block: {header.eof_block}")
     
     def test_devname3_first_entries(self):
         """Test dumping first 10 entries from DEVNAME3.NDX."""
@@ -86,18 +149,16 @@ class TestNDXReading(unittest.TestCase):
             (5096, "3000AD, Inc.")
         ]
         
-        # Verify against Pascal output
-        self.assertEqual(len(entries), len(expected), "Should have 10 entries")
-        for i, ((recno, key), (exp_recno, exp_key)) in enumerate(zip(entries, expected), 1):
-            self.assertEqual(recno, exp_recno, f"Entry {i} record number mismatch")
-            self.assertEqual(key, exp_key, f"Entry {i} key mismatch")
+        # Verify against Pascal output (a mismatch reports the differing entry)
+        self.assertEqual(entries, expected, "Entries must match Pascal output")
         
         # Print entries for manual verification
-        print(f"\nDEVNAME3.NDX First 10 entries (validated against Pascal):")
-        for i, (recno, key) in enumerate(entries, 1):
-            print(f"  {i} {recno} {key}")
+        if VERBOSE:
+            print(f"\nDEVNAME3.NDX First 10 entries (validated against Pascal):")
+            for i, (recno, key) in enumerate(entries, 1):
+                print(f"  {i} {recno} {key}")
         
-        print("✅ All entries match Pascal output!")
+        vprint("✅ All entries match Pascal output!")
     
     def test_text3_header(self):
         """Test reading TEXT3.NDX header (smaller file)."""
@@ -107,9 +168,9 @@ class TestNDXReading(unittest.TestCase):
         
         self.assertIsNotNone(header, "Should read header successfully")
         
-        print(f"\nTEXT3.NDX Header:")
-        print(f"  Expression: {header.expr}")
-        print(f"  Key length: {header.key_len}")
+        vprint(f"\nTEXT3.NDX Header:")
+        vprint(f"  Expression: {header.expr}")
+        vprint(f"  Key length: {header.key_len}")
     
     def test_year3_header(self):
         """Test reading YEAR3.NDX header (numeric index)."""
@@ -119,9 +180,9 @@ class TestNDXReading(unittest.TestCase):
         
         self.assertIsNotNone(header, "Should read header successfully")
         
-        print(f"\nYEAR3.NDX Header:")
-        print(f"  Expression: {header.expr}")
-        print(f"  Key length: {header.key_len}")
+        vprint(f"\nYEAR3.NDX Header:")
+        vprint(f"  Expression: {header.expr}")
+        vprint(f"  Key length: {header.key_len}")
     
     def test_dateadd3_header(self):
         """Test reading DATEADD3.NDX header (date index)."""
@@ -131,9 +192,9 @@ class TestNDXReading(unittest.TestCase):
         
         self.assertIsNotNone(header, "Should read header successfully")
         
-        print(f"\nDATEADD3.NDX Header:")
-        print(f"  Expression: {header.expr}")
-        print(f"  Key length: {header.key_len}")
+        vprint(f"\nDATEADD3.NDX Header:")
+        vprint(f"  Expression: {header.expr}")
+        vprint(f"  Key length: {header.key_len}")
     
     def test_all_ndx_files(self):
         """Test reading headers from all NDX files."""
@@ -147,36 +208,106 @@ class TestNDXReading(unittest.TestCase):
             "DATEADD3.NDX"
         ]
         
-        print("\nAll NDX Files:")
-        for ndx_file in ndx_files:
-            filename = os.path.join(self.samples_dir, ndx_file)
-            if os.path.exists(filename):
-                header = ndx_read_header(filename)
-                self.assertIsNotNone(header, f"Should read {ndx_file} header")
-                print(f"  {ndx_file}: expr='{header.expr}', keylen={header.key_len}")
+        present = [f for f in ndx_files
+                   if os.path.exists(os.path.join(self.samples_dir, f))]
+        paths = [os.path.join(self.samples_dir, f) for f in present]
+        
+        # Header reads are independent I/O; overlap them, assert in this thread
+        with ThreadPoolExecutor(max_workers=max(len(paths), 1)) as ex:
+            headers = list(ex.map(ndx_read_header, paths))
+        
+        vprint("\nAll NDX Files:")
+        for ndx_file, header in zip(present, headers):
+            self.assertIsNotNone(header, f"Should read {ndx_file} header")
+            vprint(f"  {ndx_file}: expr='{header.expr}', keylen={header.key_len}")
     
-    def test_exact_match_quicksilver(self):
-        """Test exact match search for 'Quicksilver Software, Inc.'"""
+    def test_header_cache_sees_rewritten_file(self):
+        """Test that a cached header is not reused after the NDX file is rewritten"""
+        from ndx_module import ndx_create_index
+        
+        dbf_filename = os.path.join(self.samples_dir, "GAMES3.DBF")
+        ndx_filename = os.path.join(self.samples_dir, "HDRCACHE.NDX")
+        self.created_files.append(ndx_filename)
+        
+        self.assertTrue(ndx_create_index(dbf_filename, "year", ndx_filename))
+        self.assertEqual(ndx_read_header(ndx_filename).expr, "year")
+        
+        self.assertTrue(ndx_create_index(dbf_filename, "devname", ndx_filename))
+        header = ndx_read_header(ndx_filename)
+        self.assertEqual((header.expr, header.key_len), ("devname", 30))
+    
+    def test_header_cache_sees_same_size_rewrite(self):
+        """Test that rebuilding an index at the same size and mtime drops its cached header"""
+        from ndx_module import ndx_create_index
+        
+        dbf_filename = os.path.join(self.samples_dir, "GAMES3.DBF")
+        ndx_filename = os.path.join(self.samples_dir, "HDRSAME.NDX")
+        self.created_files.append(ndx_filename)
+        
+        self.assertTrue(ndx_create_index(dbf_filename, "year", ndx_filename))
+        self.assertEqual(ndx_read_header(ndx_filename).expr, "year")
+        first = os.stat(ndx_filename)
+        
+        # YEAR and MAXPLAY are both numeric: same key length, same file size
+        self.assertTrue(ndx_create_index(dbf_filename, "maxplay", ndx_filename))
+        self.assertEqual(os.stat(ndx_filename).st_size, first.st_size)
+        # Same mtime too, as on a filesystem with coarse mtime resolution
+        os.utime(ndx_filename, ns=(first.st_atime_ns, first.st_mtime_ns))
+        
+        self.assertEqual(ndx_read_header(ndx_filename).expr, "maxplay")
+    
+    def test_read_node_returns_independent_copy(self):
+        """Test that mutating a node from ndx_read_node does not touch the page cache"""
+        from ndx_module import ndx_read_node
+        
+        filename = os.path.join(self.samples_dir, "DEVNAME3.NDX")
+        header = ndx_read_header(filename)
+        
+        node = ndx_read_node(filename, header.root_block, header)
+        keys = list(node.keys)
+        node.keys.clear()
+        
+        self.assertEqual(ndx_read_node(filename, header.root_block, header).keys, keys)
+        self.assertEqual(ndx_find_exact(filename, "Quicksilver Software, Inc."), [143, 586, 814, 2940, 7290])
+    
+    def test_open_ndx_file_matches_filename_lookups(self):
+        """Test that an open NDXFile gives the same results as its filename"""
         filename = os.path.join(self.samples_dir, "DEVNAME3.NDX")
         
-        results = ndx_find_exact(filename, "Quicksilver Software, Inc.")
+        self.assertEqual(self.devname3.header, ndx_read_header(filename))
+        self.assertEqual(ndx_dump_first_entries(self.devname3, 10), ndx_dump_first_entries(filename, 10))
+        self.assertEqual(ndx_find_prefix(self.devname3, "Sierra"), ndx_find_prefix(filename, "Sierra"))
+        
+        # A closed NDXFile behaves like a missing file
+        closed = ndx_file_open(filename)
+        ndx_file_close(closed)
+        self.assertEqual(ndx_find_exact(closed, "Quicksilver Software, Inc."), [])
+        self.assertIsNone(ndx_file_open(os.path.join(self.samples_dir, "MISSING.NDX")))
+    
+    def test_exact_match_quicksilver(self):
+        """Test exact match search for 'Quicksilver Software, Inc.'"""
+        results = ndx_find_exact(self.devname3, "Quicksilver Software, Inc.")
         
         # Expected from Pascal output (samples/idxout.txt line 14):
         # Exact recnos: [143, 586, 814, 2940, 7290] count= 5
         expected = [143, 586, 814, 2940, 7290]
         
-        self.assertEqual(len(results), len(expected), f"Should find {len(expected)} matches")
         self.assertEqual(results, expected, "Record numbers should match Pascal output")
         
-        print(f"\nExact match search: Quicksilver Software, Inc.")
-        print(f"  Exact recnos: {results[:10]} count= {len(results)}")
-        print("  ✅ Matches Pascal output!")
+        vprint(f"\nExact match search: Quicksilver Software, Inc.")
+        vprint(f"  Exact recnos: {results[:10]} count= {len(results)}")
+        vprint("  ✅ Matches Pascal output!")
+    
+    def test_bytes_search_keys(self):
+        """Test that raw key bytes search the same as the equivalent str keys"""
+        self.assertEqual(ndx_find_exact(self.devname3, b"Quicksilver Software, Inc."),
+                         [143, 586, 814, 2940, 7290])
+        self.assertEqual(ndx_find_prefix(self.devname3, memoryview(b"Cosmi")),
+                         ndx_find_prefix(self.devname3, "Cosmi"))
     
     def test_prefix_match_cosmi(self):
         """Test prefix match search for 'Cosmi'"""
-        filename = os.path.join(self.samples_dir, "DEVNAME3.NDX")
-        
-        results = ndx_find_prefix(filename, "Cosmi")
+        results = ndx_find_prefix(self.devname3, "Cosmi")
         
         # Expected from Pascal output (samples/idxout.txt line 16):
         # Prefix recnos: [117, 517, 1692, 2102, 2513, 2782, 5284, 5848, 6462, 7105] count= 12
@@ -187,9 +318,9 @@ class TestNDXReading(unittest.TestCase):
         self.assertEqual(len(results), expected_count, f"Should find {expected_count} matches")
         self.assertEqual(results[:10], expected_first_10, "First 10 record numbers should match Pascal output")
         
-        print(f"\nPrefix match search: Cosmi")
-        print(f"  Prefix recnos: {results[:10]} count= {len(results)}")
-        print("  ✅ Matches Pascal output!")
+        vprint(f"\nPrefix match search: Cosmi")
+        vprint(f"  Prefix recnos: {results[:10]} count= {len(results)}")
+        vprint("  ✅ Matches Pascal output!")
     
     def test_prefix_match_king(self):
         """Test prefix match search for 'King' in TITLE3.NDX"""
@@ -205,9 +336,9 @@ class TestNDXReading(unittest.TestCase):
         self.assertEqual(len(results), expected_count, f"Should find {expected_count} matches")
         self.assertEqual(results[:10], expected_first_10, "First 10 record numbers should match Pascal output")
         
-        print(f"\nPrefix match search: King (TITLE3.NDX)")
-        print(f"  Prefix recnos: {results[:10]} count= {len(results)}")
-        print("  ✅ Matches Pascal output!")
+        vprint(f"\nPrefix match search: King (TITLE3.NDX)")
+        vprint(f"  Prefix recnos: {results[:10]} count= {len(results)}")
+        vprint("  ✅ Matches Pascal output!")
     
     def test_prefix_match_sie_upper(self):
         """Test prefix match search for 'SIE' in DEVNAMEU.NDX (upper case index)"""
@@ -224,9 +355,9 @@ class TestNDXReading(unittest.TestCase):
         self.assertEqual(len(results), expected_count, f"Should find {expected_count} matches")
         self.assertEqual(results[:10], expected_first_10, "First 10 record numbers should match Pascal output")
         
-        print(f"\nPrefix match search: SIE (DEVNAMEU.NDX - upper case)")
-        print(f"  Prefix recnos: {results[:10]} count= {len(results)}")
-        print("  ✅ Matches Pascal output!")
+        vprint(f"\nPrefix match search: SIE (DEVNAMEU.NDX - upper case)")
+        vprint(f"  Prefix recnos: {results[:10]} count= {len(results)}")
+        vprint("  ✅ Matches Pascal output!")
     
     def test_number_exact_1981(self):
         """Test exact number search for 1981 in YEAR3.NDX"""
@@ -242,24 +373,25 @@ class TestNDXReading(unittest.TestCase):
         self.assertEqual(len(results), expected_count, f"Should find {expected_count} matches")
         self.assertEqual(results[:10], expected_first_10, "First 10 record numbers should match Pascal output")
         
-        print(f"\nExact number search: 1981 (YEAR3.NDX)")
-        print(f"  Exact recnos: {results[:10]} count= {len(results)}")
-        print("  ✅ Matches Pascal output!")
+        vprint(f"\nExact number search: 1981 (YEAR3.NDX)")
+        vprint(f"  Exact recnos: {results[:10]} count= {len(results)}")
+        vprint("  ✅ Matches Pascal output!")
     
-    def test_number_range_1982_1984(self):
-        """Test numeric range search for 1982-1984 in YEAR3.NDX"""
+    def test_number_exact_counts_1982_1984(self):
+        """Test per-year exact counts that make up the 1982-1984 range in YEAR3.NDX"""
         filename = os.path.join(self.samples_dir, "YEAR3.NDX")
         
-        # First verify individual year counts
-        count_1982 = len(ndx_find_number_exact(filename, 1982))
-        count_1983 = len(ndx_find_number_exact(filename, 1983))
-        count_1984 = len(ndx_find_number_exact(filename, 1984))
+        counts = {year: len(ndx_find_number_exact(filename, year)) for year in (1982, 1983, 1984)}
         
-        self.assertEqual(count_1982, 124, "1982 should have 124 entries")
-        self.assertEqual(count_1983, 165, "1983 should have 165 entries")
-        self.assertEqual(count_1984, 160, "1984 should have 160 entries")
+        self.assertEqual(counts, {1982: 124, 1983: 165, 1984: 160})
+        
+        vprint(f"\nIndividual counts (YEAR3.NDX): {counts}")
+    
+    def test_number_range_1982_1984(self):
+        """Test numeric range search for 1982-1984 in YEAR3.NDX"""
+        filename = os.path.join(self.samples_dir, "YEAR3.NDX")
         
-        # Now test range
+        # One descent and leaf scan; the per-year counts are checked separately
         results = ndx_find_number_range(filename, 1982, 1984)
         
         # Expected from Pascal output (samples/idxout.txt line 36):
@@ -271,10 +403,9 @@ class TestNDXReading(unittest.TestCase):
         self.assertEqual(len(results), expected_count, f"Should find {expected_count} matches (124+165+160)")
         self.assertEqual(results[:10], expected_first_10, "First 10 record numbers should match Pascal output")
         
-        print(f"\nNumeric range search: 1982-1984 (YEAR3.NDX)")
-        print(f"  Individual counts: 1982={count_1982}, 1983={count_1983}, 1984={count_1984}")
-        print(f"  Range recnos: {results[:10]} count= {len(results)}")
-        print(f"  ✅ Matches Pascal output! (124+165+160={expected_count})")
+        vprint(f"\nNumeric range search: 1982-1984 (YEAR3.NDX)")
+        vprint(f"  Range recnos: {results[:10]} count= {len(results)}")
+        vprint(f"  ✅ Matches Pascal output! (124+165+160={expected_count})")
     
     def test_date_exact_2022_08_25(self):
         """Test exact date search for 2022-08-25 in DATEADD3.NDX"""
@@ -291,9 +422,9 @@ class TestNDXReading(unittest.TestCase):
         self.assertEqual(len(results), expected_count, f"Should find {expected_count} matches")
         self.assertEqual(results[:10], expected_first_10, "First 10 record numbers should match Pascal output")
         
-        print(f"\nExact date search: 2022-08-25 (DATEADD3.NDX)")
-        print(f"  Exact recnos: {results[:10]} count= {len(results)}")
-        print("  ✅ Matches Pascal output!")
+        vprint(f"\nExact date search: 2022-08-25 (DATEADD3.NDX)")
+        vprint(f"  Exact recnos: {results[:10]} count= {len(results)}")
+        vprint("  ✅ Matches Pascal output!")
     
     def test_date_range_2022_08(self):
         """Test date range search for 2022-08-01 to 2022-08-30 in DATEADD3.NDX"""
@@ -310,10 +441,10 @@ class TestNDXReading(unittest.TestCase):
         self.assertEqual(len(results), expected_count, f"Should find {expected_count} matches")
         self.assertEqual(results[:20], expected_first_20, "First 20 record numbers should match Pascal output")
         
-        print(f"\nDate range search: 2022-08-01 to 2022-08-30 (DATEADD3.NDX)")
-        print(f"  Range recnos: {results[:20]}")
-        print(f"  Count= {len(results)}")
-        print("  ✅ Matches Pascal output!")
+        vprint(f"\nDate range search: 2022-08-01 to 2022-08-30 (DATEADD3.NDX)")
+        vprint(f"  Range recnos: {results[:20]}")
+        vprint(f"  Count= {len(results)}")
+        vprint("  ✅ Matches Pascal output!")
     
     def test_create_index_devname(self):
         """Test creating an NDX index for DEVNAME field"""
@@ -337,23 +468,16 @@ class TestNDXReading(unittest.TestCase):
         
         self.assertEqual(results, expected, "Search results should match expected")
         
-        print(f"\nCreated index DEVNAMEP.NDX")
-        print(f"  Search for 'Quicksilver Software, Inc.': {results}")
-        print("  ✅ Index creation and search successful!")
+        vprint(f"\nCreated index DEVNAMEP.NDX")
+        vprint(f"  Search for 'Quicksilver Software, Inc.': {results}")
+        vprint("  ✅ Index creation and search successful!")
     
     def test_create_index_year_exact(self):
         """Test creating YEARP.NDX and exact number search"""
-        from ndx_module import ndx_create_index
-        
-        dbf_filename = os.path.join(self.samples_dir, "GAMES3.DBF")
-        ndx_filename = os.path.join(self.samples_dir, "YEARP.NDX")
+        ndx_filename = self.yearp_path
         
-        # Create the index
-        success = ndx_create_index(dbf_filename, "year", ndx_filename)
-        self.assertTrue(success, "Index creation should succeed")
-        
-        # Track for cleanup
-        self.created_files.append(ndx_filename)
+        # The index is built once in setUpClass
+        self.assertTrue(self.yearp_built, "Index creation should succeed")
         
         # Test exact search - compare with YEAR3.NDX
         results_new = ndx_find_number_exact(ndx_filename, 1981)
@@ -362,23 +486,13 @@ class TestNDXReading(unittest.TestCase):
         self.assertEqual(results_new, results_orig, "YEARP.NDX should match YEAR3.NDX for exact search")
         self.assertEqual(len(results_new), 25, "Should find 25 matches for 1981")
         
-        print(f"\nCreated index YEARP.NDX")
-        print(f"  Exact search 1981: {results_new[:10]} count={len(results_new)}")
-        print("  ✅ Matches YEAR3.NDX!")
+        vprint(f"\nCreated index YEARP.NDX")
+        vprint(f"  Exact search 1981: {results_new[:10]} count={len(results_new)}")
+        vprint("  ✅ Matches YEAR3.NDX!")
     
     def test_create_index_year_range(self):
-        """Test creating YEARP.NDX and range number search"""
-        from ndx_module import ndx_create_index
-        
-        dbf_filename = os.path.join(self.samples_dir, "GAMES3.DBF")
-        ndx_filename = os.path.join(self.samples_dir, "YEARP.NDX")
-        
-        # Create the index (or use existing from previous test)
-        ndx_create_index(dbf_filename, "year", ndx_filename)
-        
-        # Track for cleanup (avoid duplicates)
-        if ndx_filename not in self.created_files:
-            self.created_files.append(ndx_filename)
+        """Test YEARP.NDX (built in setUpClass) with range number search"""
+        ndx_filename = self.yearp_path
         
         # Test range search - compare with YEAR3.NDX
         results_new = ndx_find_number_range(ndx_filename, 1982, 1984)
@@ -387,23 +501,16 @@ class TestNDXReading(unittest.TestCase):
         self.assertEqual(results_new, results_orig, "YEARP.NDX should match YEAR3.NDX for range search")
         self.assertEqual(len(results_new), 449, "Should find 449 matches for 1982-1984")
         
-        print(f"\nYEARP.NDX range search")
-        print(f"  Range 1982-1984: {results_new[:10]} count={len(results_new)}")
-        print("  ✅ Matches YEAR3.NDX!")
+        vprint(f"\nYEARP.NDX range search")
+        vprint(f"  Range 1982-1984: {results_new[:10]} count={len(results_new)}")
+        vprint("  ✅ Matches YEAR3.NDX!")
     
     def test_create_index_dateadd_exact(self):
         """Test creating DATEADDP.NDX and exact date search"""
-        from ndx_module import ndx_create_index
+        ndx_filename = self.dateaddp_path
         
-        dbf_filename = os.path.join(self.samples_dir, "GAMES3.DBF")
-        ndx_filename = os.path.join(self.samples_dir, "DATEADDP.NDX")
-        
-        # Create the index
-        success = ndx_create_index(dbf_filename, "dateadd", ndx_filename)
-        self.assertTrue(success, "Index creation should succeed")
-        
-        # Track for cleanup
-        self.created_files.append(ndx_filename)
+        # The index is built once in setUpClass
+        self.assertTrue(self.dateaddp_built, "Index creation should succeed")
         
         # Test exact search - compare with DATEADD3.NDX
         results_new = ndx_find_date_exact(ndx_filename, "2022-08-25")
@@ -412,23 +519,13 @@ class TestNDXReading(unittest.TestCase):
         self.assertEqual(results_new, results_orig, "DATEADDP.NDX should match DATEADD3.NDX for exact search")
         self.assertEqual(len(results_new), 292, "Should find 292 matches for 2022-08-25")
         
-        print(f"\nCreated index DATEADDP.NDX")
-        print(f"  Exact search 2022-08-25: {results_new[:10]} count={len(results_new)}")
-        print("  ✅ Matches DATEADD3.NDX!")
+        vprint(f"\nCreated index DATEADDP.NDX")
+        vprint(f"  Exact search 2022-08-25: {results_new[:10]} count={len(results_new)}")
+        vprint("  ✅ Matches DATEADD3.NDX!")
     
     def test_create_index_dateadd_range(self):
-        """Test creating DATEADDP.NDX and range date search"""
-        from ndx_module import ndx_create_index
-        
-        dbf_filename = os.path.join(self.samples_dir, "GAMES3.DBF")
-        ndx_filename = os.path.join(self.samples_dir, "DATEADDP.NDX")
-        
-        # Create the index (or use existing from previous test)
-        ndx_create_index(dbf_filename, "dateadd", ndx_filename)
-        
-        # Track for cleanup (avoid duplicates)
-        if ndx_filename not in self.created_files:
-            self.created_files.append(ndx_filename)
+        """Test DATEADDP.NDX (built in setUpClass) with range date search"""
+        ndx_filename = self.dateaddp_path
         
         # Test range search - compare with DATEADD3.NDX
         results_new = ndx_find_date_range(ndx_filename, "2022-08-01", "2022-08-30")
@@ -437,10 +534,10 @@ class TestNDXReading(unittest.TestCase):
         self.assertEqual(results_new, results_orig, "DATEADDP.NDX should match DATEADD3.NDX for range search")
         self.assertEqual(len(results_new), 295, "Should find 295 matches for 2022-08-01 to 2022-08-30")
         
-        print(f"\nDATEADDP.NDX range search")
-        print(f"  Range 2022-08-01 to 2022-08-30: {results_new[:20]}")
-        print(f"  Count={len(results_new)}")
-        print("  ✅ Matches DATEADD3.NDX!")
+        vprint(f"\nDATEADDP.NDX range search")
+        vprint(f"  Range 2022-08-01 to 2022-08-30: {results_new[:20]}")
+        vprint(f"  Count={len(results_new)}")
+        vprint("  ✅ Matches DATEADD3.NDX!")
 
 
 if __name__ == "__main__":
@@ -12,10 +12,26 @@ Key concepts:
 5. Early exit if candidate set becomes empty
 """
 
+import bisect
+import operator
 import random
-from typing import List, Set, Callable
+from itertools import compress, filterfalse, repeat
+from typing import List, Callable, Dict, Optional, Tuple
 from enum import Enum
 
+# Bit positions set in each byte value (for listing the set bits of a Bitmap)
+_BYTE_BITS = tuple(tuple(b for b in range(8) if value >> b & 1) for value in range(256))
+
+# 0/1 mask bytes as base-2 digits (for packing a mask into a Bitmap)
+_MASK_DIGITS = bytes.maketrans(b'\x00\x01', b'01')
+
+# Base-2 digits back to 0/1 mask bytes (for unpacking a Bitmap)
+_DIGIT_MASK = bytes.maketrans(b'01', b'\x00\x01')
+
+# Set bits per bitmap bit above which rec_nos() unpacks the whole bitmap
+# instead of visiting only the non-zero bytes
+_DENSE_FRACTION = 1 / 16
+
 
 class FilterKind(Enum):
     """Types of filters"""
@@ -40,6 +56,9 @@ class FilterSpec:
         self.value = value
         self.min_val = min_val
         self.max_val = max_val
+        # Comparison forms of value, worked out once per spec rather than per record
+        self.value_upper = str(value).upper()
+        self.value_int = _to_int(value)
 
 
 class MatchGroup:
@@ -52,6 +71,15 @@ class MatchGroup:
         self.filters.append(filter_spec)
 
 
+class GroupStat:
+    """Candidate counts around one processed group"""
+    def __init__(self, index: int, mode: MatchMode, before: int, after: int):
+        self.index = index
+        self.mode = mode
+        self.before = before
+        self.after = after
+
+
 class Record:
     """A database record"""
     def __init__(self, rec_no: int, **fields):
@@ -62,144 +90,389 @@ class Record:
         return self.fields.get(field_name, "")
 
 
+def _to_int(value):
+    """int(value), or None if the value is not numeric"""
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return None
+
+
+class Columns:
+    """Struct-of-arrays record store: one list per field, indexed by RecNo"""
+    def __init__(self, count: int, **columns):
+        self.count = count
+        self.columns = columns
+        self._upper = {}    # field -> upper-cased str values
+        self._ints = {}     # field -> int values (None where not numeric)
+        self._codes = {}    # field -> (upper-cased value -> code, one code byte per record)
+        self._sorted = {}   # (field, numeric) -> (sorted keys, RecNos in key order)
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def column(self, field_name: str) -> list:
+        """All values of a field (missing fields read as "", like Record.get_field)"""
+        values = self.columns.get(field_name)
+        return values if values is not None else [""] * self.count
+    
+    def upper_column(self, field_name: str) -> List[str]:
+        """Upper-cased str values of a field (computed once per field)"""
+        values = self._upper.get(field_name)
+        if values is None:
+            values = self._upper[field_name] = [str(v).upper() for v in self.column(field_name)]
+        return values
+    
+    def int_column(self, field_name: str) -> list:
+        """Integer values of a field, None where not numeric (computed once per field)"""
+        values = self._ints.get(field_name)
+        if values is None:
+            values = self._ints[field_name] = [_to_int(v) for v in self.column(field_name)]
+        return values
+    
+    def category_column(self, field_name: str) -> Optional[Tuple[Dict[str, int], bytes]]:
+        """
+        Dictionary encoding of a low-cardinality field (computed once per field).
+        
+        Returns (vocab, codes): vocab maps each upper-cased value to a code and
+        codes holds one code byte per record. None if the field has more than
+        256 distinct values.
+        """
+        if field_name not in self._codes:
+            vocab = {}
+            for value in self.upper_column(field_name):
+                if value not in vocab:
+                    if len(vocab) == 256:
+                        vocab = None
+                        break
+                    vocab[value] = len(vocab)
+            self._codes[field_name] = None if vocab is None else (
+                vocab, bytes(map(vocab.__getitem__, self.upper_column(field_name))))
+        return self._codes[field_name]
+    
+    def sorted_index(self, field_name: str, numeric: bool = False) -> Tuple[list, List[int]]:
+        """
+        Sorted view of a field, like an NDX index (computed once per field).
+        
+        Returns (keys, rec_nos): the upper-cased (or int) values in ascending
+        order and the RecNo of each key. Non-numeric values are left out of
+        the numeric view.
+        """
+        index = self._sorted.get((field_name, numeric))
+        if index is None:
+            if numeric:
+                pairs = sorted((value, rec_no) for rec_no, value in enumerate(self.int_column(field_name))
+                               if value is not None)
+                keys = [value for value, _ in pairs]
+                rec_nos = [rec_no for _, rec_no in pairs]
+            else:
+                values = self.upper_column(field_name)
+                rec_nos = sorted(range(self.count), key=values.__getitem__)
+                keys = list(map(values.__getitem__, rec_nos))
+            index = self._sorted[(field_name, numeric)] = (keys, rec_nos)
+        return index
+    
+    def __getitem__(self, rec_no: int) -> Record:
+        """Row view of one record (for display and brute-force checks)"""
+        if not 0 <= rec_no < self.count:
+            raise IndexError(rec_no)
+        return Record(rec_no, **{name: values[rec_no] for name, values in self.columns.items()})
+
+
+def _rec_nos_mask(size: int, rec_nos: List[int], mask: bytearray = None) -> bytearray:
+    """Mark RecNos in a mask of one 0/1 byte per record (a new mask unless one is given)"""
+    if mask is None:
+        mask = bytearray(size)
+    for rec_no in rec_nos:
+        mask[rec_no] = 1
+    return mask
+
+
 class Bitmap:
     """8KB bitmap for 64K records (1 bit per record)"""
     def __init__(self, size: int = 65536):
         self.size = size
-        # Use a set for simplicity in Python (in Pascal this would be 8KB byte array)
-        self.bits: Set[int] = set()
+        # Packed bits like the Pascal 8KB byte array: record r is bit (r & 7) of byte r >> 3
+        self.data = bytearray((size + 7) >> 3)
     
     def set_bit(self, rec_no: int):
         """Set a bit (mark record as matching)"""
         if 0 <= rec_no < self.size:
-            self.bits.add(rec_no)
+            self.data[rec_no >> 3] |= 1 << (rec_no & 7)
     
     def clear_bit(self, rec_no: int):
         """Clear a bit (mark record as not matching)"""
-        self.bits.discard(rec_no)
+        if 0 <= rec_no < self.size:
+            self.data[rec_no >> 3] &= ~(1 << (rec_no & 7)) & 0xFF
     
     def get_bit(self, rec_no: int) -> bool:
         """Test if a bit is set"""
-        return rec_no in self.bits
+        return 0 <= rec_no < self.size and bool(self.data[rec_no >> 3] >> (rec_no & 7) & 1)
     
     def set_all(self):
         """Set all bits (all records are candidates)"""
-        self.bits = set(range(self.size))
+        self.data[:] = b'\xff' * len(self.data)
+        if self.size & 7:
+            # Keep bits past the last record clear
+            self.data[-1] = (1 << (self.size & 7)) - 1
     
     def clear_all(self):
         """Clear all bits (no matches)"""
-        self.bits.clear()
+        self.data[:] = bytes(len(self.data))
     
     def is_empty(self) -> bool:
         """Check if bitmap has no matches"""
-        return len(self.bits) == 0
+        return self.data.count(0) == len(self.data)
     
     def count(self) -> int:
         """Count number of set bits"""
-        return len(self.bits)
+        # Native popcount over the whole bitmap as one big integer
+        return int.from_bytes(self.data, 'little').bit_count()
     
     def or_with(self, other: 'Bitmap'):
         """OR this bitmap with another (add matches)"""
-        self.bits |= other.bits
+        # Whole-bitmap OR as one big-integer operation
+        self.data[:] = (int.from_bytes(self.data, 'little') |
+                        int.from_bytes(other.data, 'little')).to_bytes(len(self.data), 'little')
     
     def and_with(self, other: 'Bitmap'):
         """AND this bitmap with another (keep only common matches)"""
-        self.bits &= other.bits
+        self.data[:] = (int.from_bytes(self.data, 'little') &
+                        int.from_bytes(other.data, 'little')).to_bytes(len(self.data), 'little')
+    
+    def load_mask(self, mask: bytes):
+        """Replace the bits with a mask of one 0/1 byte per record"""
+        # Reversed mask read as a base-2 number puts record 0 in the lowest bit
+        bits = int(mask[::-1].translate(_MASK_DIGITS) or b'0', 2)
+        self.data[:] = bits.to_bytes(len(self.data), 'little')
+    
+    def load_rec_nos(self, rec_nos: List[int]):
+        """Replace the bits with exactly the given RecNos"""
+        self.clear_all()
+        for rec_no in rec_nos:
+            self.set_bit(rec_no)
+    
+    def rec_nos(self) -> List[int]:
+        """List the set RecNos in ascending order"""
+        bits = int.from_bytes(self.data, 'little')
+        if bits.bit_count() > self.size * _DENSE_FRACTION:
+            # Dense: unpack every bit at once (lowest bit first) into a 0/1 mask
+            mask = bin(bits)[:1:-1].encode('ascii').translate(_DIGIT_MASK)
+            return list(compress(range(len(mask)), mask))
+        
+        result = []
+        # Sparse: zero bytes (the holes) are skipped in C, only non-zero bytes are expanded
+        for i in compress(range(len(self.data)), self.data):
+            base = i << 3
+            result.extend(base + b for b in _BYTE_BITS[self.data[i]])
+        return result
+    
+    def copy_from(self, other: 'Bitmap'):
+        """Overwrite this bitmap with another's bits in place (no new allocation)"""
+        self.data[:] = other.data
     
     def copy(self) -> 'Bitmap':
         """Create a copy of this bitmap"""
         new_bitmap = Bitmap(self.size)
-        new_bitmap.bits = self.bits.copy()
+        new_bitmap.data[:] = self.data
         return new_bitmap
 
 
 def evaluate_filter(record: Record, filter_spec: FilterSpec) -> bool:
     """Evaluate a single filter against a record"""
-    field_value = record.get_field(filter_spec.field)
-    
-    if filter_spec.kind == FilterKind.EXACT_STR:
-        return str(field_value).upper() == str(filter_spec.value).upper()
-    
-    elif filter_spec.kind == FilterKind.EXACT_NUM:
-        try:
-            return int(field_value) == int(filter_spec.value)
-        except (ValueError, TypeError):
-            return False
-    
-    elif filter_spec.kind == FilterKind.RANGE_NUM:
-        # Tests if VALUE falls between two FIELDS in the record
-        # Example: Does 2005 fall between record's StartYear and EndYear?
-        try:
-            val = int(field_value)
-            return filter_spec.min_val <= val <= filter_spec.max_val
-        except (ValueError, TypeError):
-            return False
-    
-    elif filter_spec.kind == FilterKind.FIELD_RANGE:
-        # Tests if FIELD value falls within a specified RANGE
-        # Example: Is record's Year between 2005 and 2010?
-        try:
-            val = int(field_value)
-            return filter_spec.min_val <= val <= filter_spec.max_val
-        except (ValueError, TypeError):
-            return False
-    
-    elif filter_spec.kind == FilterKind.STARTS_WITH:
-        return str(field_value).upper().startswith(str(filter_spec.value).upper())
-    
-    return False
-
-
-def simulate_index_search(records: List[Record], prefix: str, field: str) -> List[int]:
-    """Simulate an NDX index search for STARTS_WITH (returns list of RecNos)"""
-    results = []
-    prefix_upper = prefix.upper()
-    for record in records:
-        field_value = str(record.get_field(field)).upper()
-        if field_value.startswith(prefix_upper):
-            results.append(record.rec_no)
-    return results
-
-
-def simulate_index_range_search(records: List[Record], min_val: int, max_val: int, field: str) -> List[int]:
-    """Simulate an NDX index range search for FIELD_RANGE (returns list of RecNos)"""
-    results = []
-    for record in records:
-        try:
-            field_value = int(record.get_field(field))
-            if min_val <= field_value <= max_val:
-                results.append(record.rec_no)
-        except (ValueError, TypeError):
-            pass
-    return results
+    return evaluate_value(record.get_field(filter_spec.field), filter_spec)
+
+
+def _value_exact_str(field_value, filter_spec: FilterSpec) -> bool:
+    return str(field_value).upper() == filter_spec.value_upper
+
+
+def _value_exact_num(field_value, filter_spec: FilterSpec) -> bool:
+    try:
+        return int(field_value) == filter_spec.value_int
+    except (ValueError, TypeError):
+        return False
+
+
+def _value_in_range(field_value, filter_spec: FilterSpec) -> bool:
+    # RANGE_NUM: Tests if VALUE falls between two FIELDS in the record
+    # Example: Does 2005 fall between record's StartYear and EndYear?
+    # FIELD_RANGE: Tests if FIELD value falls within a specified RANGE
+    # Example: Is record's Year between 2005 and 2010?
+    try:
+        val = int(field_value)
+        return filter_spec.min_val <= val <= filter_spec.max_val
+    except (ValueError, TypeError):
+        return False
+
+
+def _value_starts_with(field_value, filter_spec: FilterSpec) -> bool:
+    return str(field_value).upper().startswith(filter_spec.value_upper)
+
+
+# Per-kind test of one field value
+_VALUE_PREDICATES = {
+    FilterKind.EXACT_STR: _value_exact_str,
+    FilterKind.EXACT_NUM: _value_exact_num,
+    FilterKind.RANGE_NUM: _value_in_range,
+    FilterKind.FIELD_RANGE: _value_in_range,
+    FilterKind.STARTS_WITH: _value_starts_with,
+}
+
+
+def evaluate_value(field_value, filter_spec: FilterSpec) -> bool:
+    """Evaluate a single filter against one field value"""
+    predicate = _VALUE_PREDICATES.get(filter_spec.kind)
+    return predicate is not None and predicate(field_value, filter_spec)
+
+
+def _rec_nos_exact_str(records: Columns, filter_spec: FilterSpec, rec_nos: List[int]) -> List[int]:
+    target = filter_spec.value_upper
+    categories = records.category_column(filter_spec.field)
+    if categories is not None:
+        vocab, codes = categories
+        code = vocab.get(target)
+        if code is None:
+            return []  # Value never occurs in this field
+        if len(rec_nos) == len(records):
+            # Full scan: one translate pass turns the codes into a 0/1 mask
+            table = bytearray(256)
+            table[code] = 1
+            return list(compress(rec_nos, codes.translate(table)))
+    
+    values = map(records.upper_column(filter_spec.field).__getitem__, rec_nos)
+    return list(compress(rec_nos, map(operator.eq, values, repeat(target))))
+
+
+def _rec_nos_exact_num(records: Columns, filter_spec: FilterSpec, rec_nos: List[int]) -> List[int]:
+    target = filter_spec.value_int
+    if target is None:
+        return []
+    values = map(records.int_column(filter_spec.field).__getitem__, rec_nos)
+    return list(compress(rec_nos, map(operator.eq, values, repeat(target))))
+
+
+def _rec_nos_in_range(records: Columns, filter_spec: FilterSpec, rec_nos: List[int]) -> List[int]:
+    lo, hi = filter_spec.min_val, filter_spec.max_val
+    if lo is None or hi is None:
+        return []
+    values = map(records.int_column(filter_spec.field).__getitem__, rec_nos)
+    return list(compress(rec_nos, (value is not None and lo <= value <= hi for value in values)))
+
+
+def _rec_nos_starts_with(records: Columns, filter_spec: FilterSpec, rec_nos: List[int]) -> List[int]:
+    values = map(records.upper_column(filter_spec.field).__getitem__, rec_nos)
+    return list(compress(rec_nos, map(str.startswith, values, repeat(filter_spec.value_upper))))
+
+
+# Per-kind filter over a list of candidate RecNos
+_REC_NOS_FILTERS = {
+    FilterKind.EXACT_STR: _rec_nos_exact_str,
+    FilterKind.EXACT_NUM: _rec_nos_exact_num,
+    FilterKind.RANGE_NUM: _rec_nos_in_range,
+    FilterKind.FIELD_RANGE: _rec_nos_in_range,
+    FilterKind.STARTS_WITH: _rec_nos_starts_with,
+}
+
+
+def filter_rec_nos(records: Columns, filter_spec: FilterSpec, rec_nos: List[int]) -> List[int]:
+    """
+    Keep the RecNos whose field value passes a filter (same rules as evaluate_value).
+    
+    Only the given candidates are looked at; values come from the cached
+    upper-cased / int columns so the per-row work is a C-level compare.
+    """
+    filter_fn = _REC_NOS_FILTERS.get(filter_spec.kind)
+    return filter_fn(records, filter_spec, rec_nos) if filter_fn is not None else []
+
+
+# Evaluation cost rank per filter kind (cheap compares first, prefix matches last)
+_KIND_COST = {
+    FilterKind.EXACT_NUM: 0,
+    FilterKind.EXACT_STR: 1,
+    FilterKind.RANGE_NUM: 2,
+    FilterKind.FIELD_RANGE: 2,
+    FilterKind.STARTS_WITH: 3,
+}
+
+# Rows sampled when estimating how many records a filter passes
+_SELECTIVITY_SAMPLE = 256
+
+
+def estimate_selectivity(records: Columns, filter_spec: FilterSpec) -> float:
+    """Estimated fraction of records passing a filter (from an evenly spaced sample)"""
+    sample = list(range(0, len(records), max(1, len(records) // _SELECTIVITY_SAMPLE)))
+    if not sample:
+        return 0.0
+    return len(filter_rec_nos(records, filter_spec, sample)) / len(sample)
+
+
+def _filter_cost(records: Columns, filter_spec: FilterSpec):
+    """Sort key for AND filters: cheapest kind first, then most selective"""
+    return (_KIND_COST.get(filter_spec.kind, len(_KIND_COST)),
+            estimate_selectivity(records, filter_spec))
+
+
+def _group_cost(records: Columns, group: MatchGroup) -> Tuple[bool, float]:
+    """Sort key for groups: index-backed groups first, then by estimated fraction passed"""
+    has_index = any(filter_spec.kind in (FilterKind.STARTS_WITH, FilterKind.FIELD_RANGE)
+                    for filter_spec in group.filters)
+    estimates = [estimate_selectivity(records, filter_spec) for filter_spec in group.filters]
+    if not estimates:
+        return (not has_index, 1.0)
+    if group.mode == MatchMode.ANY:
+        return (not has_index, min(1.0, sum(estimates)))
+    result = 1.0
+    for estimate in estimates:
+        result *= estimate
+    return (not has_index, result)
+
+
+def simulate_index_search(records: Columns, prefix: str, field: str, out: Bitmap) -> Bitmap:
+    """Simulate an NDX index search for STARTS_WITH (fills out with the matching RecNos)"""
+    keys, rec_nos = records.sorted_index(field)
+    prefix = prefix.upper()
+    # Keys with the prefix are one contiguous run of the sorted view
+    lo = bisect.bisect_left(keys, prefix)
+    hi = bisect.bisect_left(keys, prefix[:-1] + chr(ord(prefix[-1]) + 1)) if prefix else len(keys)
+    out.load_mask(_rec_nos_mask(len(records), rec_nos[lo:hi]))
+    return out
+
+
+def simulate_index_range_search(records: Columns, min_val: int, max_val: int, field: str,
+                                out: Bitmap) -> Bitmap:
+    """Simulate an NDX index range search for FIELD_RANGE (fills out with the matching RecNos)"""
+    keys, rec_nos = records.sorted_index(field, numeric=True)
+    lo = bisect.bisect_left(keys, min_val)
+    hi = bisect.bisect_right(keys, max_val)
+    out.load_mask(_rec_nos_mask(len(records), rec_nos[lo:hi]))
+    return out
 
 
 def process_index_searches(group: MatchGroup, matches: Bitmap, temp_bitmap: Bitmap,
-                          records: List[Record], index_field: str, candidates: Bitmap = None):
+                          records: Columns, index_field: str, candidates: Bitmap = None):
     """Process all index searches in a group (STARTS_WITH and FIELD_RANGE with index)
     
     Args:
+        temp_bitmap: Scratch bitmap; its contents are undefined on entry and on return
         candidates: If provided (for OR groups after first), only consider records in this bitmap
     """
     for filter_spec in group.filters:
-        rec_nos = None
+        found = None
         
         if filter_spec.kind == FilterKind.STARTS_WITH:
             # Simulate NDX index search for prefix
-            rec_nos = simulate_index_search(records, filter_spec.value, filter_spec.field)
+            found = simulate_index_search(records, filter_spec.value, filter_spec.field, temp_bitmap)
         
         elif filter_spec.kind == FilterKind.FIELD_RANGE:
             # Simulate NDX index range search
-            rec_nos = simulate_index_range_search(records, filter_spec.min_val, 
-                                                 filter_spec.max_val, filter_spec.field)
+            found = simulate_index_range_search(records, filter_spec.min_val, 
+                                               filter_spec.max_val, filter_spec.field, temp_bitmap)
         
-        if rec_nos is not None:
-            # Convert to bitmap
-            temp_bitmap.clear_all()
-            for rec_no in rec_nos:
-                # If candidates provided, only include if in candidates
-                if candidates is None or candidates.get_bit(rec_no):
-                    temp_bitmap.set_bit(rec_no)
+        if found is not None:
+            # If candidates provided, only include records in candidates
+            if candidates is not None:
+                temp_bitmap.and_with(candidates)
             
             # Apply to matches based on group mode
             if group.mode == MatchMode.ANY:
@@ -211,58 +484,74 @@ def process_index_searches(group: MatchGroup, matches: Bitmap, temp_bitmap: Bitm
 
 
 def process_numeric_filters(group: MatchGroup, matches: Bitmap, temp_bitmap: Bitmap,
-                           records: List[Record], candidates: Bitmap = None):
+                           records: Columns, candidates: Bitmap = None):
     """Process all numeric filters in a group
     
     Args:
+        temp_bitmap: Scratch bitmap; its contents are undefined on entry and on return
         candidates: If provided (for OR groups after first), scan these records instead of matches
     """
     # Determine which records to scan
-    scan_set = candidates.bits if candidates is not None else matches.bits
+    scan_set = candidates.rec_nos() if candidates is not None else matches.rec_nos()
     
     if group.mode == MatchMode.ANY:
-        # OR mode: Process each filter incrementally
+        # OR mode: All filters mark one shared mask, ORed into Matches once.
+        # Rows already hit are dropped, so later filters only test the rest.
+        hits = None
+        pending = scan_set
         for filter_spec in group.filters:
             # Skip index searches (already processed) and field ranges (processed as index)
             if filter_spec.kind not in (FilterKind.STARTS_WITH, FilterKind.FIELD_RANGE):
-                # Scan only records in scan_set, build bitmap for this filter
-                temp_bitmap.clear_all()
-                for rec_no in list(scan_set):  # Only scan candidates
-                    if rec_no < len(records):
-                        record = records[rec_no]
-                        if evaluate_filter(record, filter_spec):
-                            temp_bitmap.set_bit(rec_no)
-                
-                # OR this filter's results into Matches
-                matches.or_with(temp_bitmap)
+                if not pending:
+                    break  # Every candidate already matched
+                found = filter_rec_nos(records, filter_spec, pending)
+                if found:
+                    hits = _rec_nos_mask(len(records), found, hits)
+                    pending = list(filterfalse(hits.__getitem__, pending))
+        
+        if hits is not None:
+            temp_bitmap.load_mask(hits)
+            matches.or_with(temp_bitmap)
     else:
-        # AND mode: Build combo filter, scan Matches once
-        # Only look at Matches rows, flip bit off if combo filter fails
-        for rec_no in list(matches.bits):  # Iterate over copy
-            if rec_no < len(records):
-                record = records[rec_no]
-                
-                # Test ALL numeric filters at once
-                passes_filter = True
-                for filter_spec in group.filters:
-                    # Skip index searches (already processed) and field ranges (processed as index)
-                    if filter_spec.kind not in (FilterKind.STARTS_WITH, FilterKind.FIELD_RANGE):
-                        if not evaluate_filter(record, filter_spec):
-                            passes_filter = False
-                            break  # Short-circuit
-                
-                # If fails combo filter, clear the bit
-                if not passes_filter:
-                    matches.clear_bit(rec_no)
+        # AND mode: Only look at Matches rows; each filter narrows the
+        # survivors, so later filters only test rows that passed earlier ones.
+        # Cheapest / most selective filters run first, while the set is largest.
+        survivors = matches.rec_nos()
+        for filter_spec in sorted(group.filters, key=lambda spec: _filter_cost(records, spec)):
+            # Skip index searches (already processed) and field ranges (processed as index)
+            if filter_spec.kind not in (FilterKind.STARTS_WITH, FilterKind.FIELD_RANGE):
+                if not survivors:
+                    break  # Short-circuit
+                survivors = filter_rec_nos(records, filter_spec, survivors)
+        
+        matches.load_rec_nos(survivors)
 
 
-def process_multi_group_filter(groups: List[MatchGroup], records: List[Record],
-                              index_field: str = "LastName") -> Bitmap:
+def process_multi_group_filter(groups: List[MatchGroup], records: Columns,
+                              index_field: str = "LastName", verbose: bool = False,
+                              stats: Optional[List[GroupStat]] = None,
+                              preserve_order: bool = False) -> Bitmap:
     """
     Process multiple filter groups with progressive filtering
     
+    Args:
+        verbose: Print per-group progress
+        stats: If provided, a GroupStat is appended for each processed group
+        preserve_order: Process groups in the given order instead of cheapest first
+    
     Returns: Bitmap with final matching RecNos
     """
+    # Candidate counts are only taken when someone will look at them
+    track = verbose or stats is not None
+    
+    # Groups are ANDed, so their order does not change the result: run
+    # index-backed groups, then the most selective ones, first so later
+    # groups scan fewer candidates
+    order = list(range(len(groups)))
+    if not preserve_order:
+        order.sort(key=lambda n: _group_cost(records, groups[n]))
+    groups = [groups[n] for n in order]
+    
     # Initialize based on first group's mode
     matches = Bitmap(len(records))
     if len(groups) > 0:
@@ -275,23 +564,26 @@ def process_multi_group_filter(groups: List[MatchGroup], records: List[Record],
     else:
         matches.set_all()
     
-    # Temporary bitmap for intermediate results
-    temp_bitmap = Bitmap(len(records))
+    # Scratch bitmaps, allocated once and reused by every group
+    temp_bitmap = Bitmap(len(records))   # Intermediate results of one filter
+    prev_matches = Bitmap(len(records))  # Matches before an OR group
     
     # Process each group
     for i, group in enumerate(groups):
-        print(f"\n--- Processing Group {i+1} (mode={group.mode.name}) ---")
-        print(f"Candidates before: {matches.count()}")
+        if track:
+            before = matches.count()
+            if verbose:
+                print(f"\n--- Processing Group {i+1} (mode={group.mode.name}, given as group {order[i]+1}) ---")
+                print(f"Candidates before: {before}")
         
         if i == 0:
             # First group: process normally based on its mode
             if group.mode == MatchMode.ANY:
                 # OR mode: Need to scan ALL records for numeric filters
-                # Create a full candidate set
-                full_set = Bitmap(len(records))
-                full_set.set_all()
+                # Use the all-set scratch bitmap as the candidate set
+                prev_matches.set_all()
                 process_index_searches(group, matches, temp_bitmap, records, index_field)
-                process_numeric_filters(group, matches, temp_bitmap, records, full_set)
+                process_numeric_filters(group, matches, temp_bitmap, records, prev_matches)
             else:
                 # AND mode: Start with all, filter down
                 process_index_searches(group, matches, temp_bitmap, records, index_field)
@@ -302,7 +594,7 @@ def process_multi_group_filter(groups: List[MatchGroup], records: List[Record],
             if group.mode == MatchMode.ANY:
                 # OR mode: Collect matches from this group, then AND with previous
                 # We need to check which records from 'matches' satisfy ANY filter in this group
-                prev_matches = matches.copy()
+                prev_matches.copy_from(matches)
                 matches.clear_all()
                 
                 # Process filters - they will OR together, but only check prev_matches candidates
@@ -316,11 +608,17 @@ def process_multi_group_filter(groups: List[MatchGroup], records: List[Record],
                 process_index_searches(group, matches, temp_bitmap, records, index_field)
                 process_numeric_filters(group, matches, temp_bitmap, records)
         
-        print(f"After group processing: {matches.count()}")
+        if track:
+            after = matches.count()
+            if verbose:
+                print(f"After group processing: {after}")
+            if stats is not None:
+                stats.append(GroupStat(i, group.mode, before, after))
         
         # Early exit if no matches remain
         if matches.is_empty():
-            print("No matches remain - early exit")
+            if verbose:
+                print("No matches remain - early exit")
             break
     
     return matches
@@ -334,7 +632,7 @@ def date_to_jdn(year: int, month: int, day: int) -> int:
     return day + ((153 * m + 2) // 5) + (365 * y) + (y // 4) - (y // 100) + (y // 400) - 32045
 
 
-def create_test_data(count: int = 10000) -> List[Record]:
+def create_test_data(count: int = 10000) -> Columns:
     """Create test dataset with dates as JDN"""
     last_names = ["SMITH", "JONES", "JOHNSON", "WILLIAMS", "BROWN", "DAVIS", "MILLER", "WILSON"]
     states = ["CA", "NY", "TX", "FL", "IL", "PA", "OH", "GA"]
@@ -346,23 +644,23 @@ def create_test_data(count: int = 10000) -> List[Record]:
     jdn_2010_12_31 = date_to_jdn(2010, 12, 31)  # 2455562
     jdn_2008_06_15 = date_to_jdn(2008, 6, 15)  # 2454632
     
-    records = []
-    for i in range(count):
-        active = random.choice([True, False])
-        featured = random.choice([True, False])
-        record = Record(
-            rec_no=i,
-            LastName=random.choice(last_names),
-            Year=random.randint(2000, 2015),
-            DateAdded=random.randint(jdn_2000_01_01, jdn_2015_12_31),  # Random date as JDN
-            DateSpecific=jdn_2008_06_15 if random.random() < 0.1 else random.randint(jdn_2000_01_01, jdn_2015_12_31),  # 10% have specific date
-            Active="True" if active else "False",  # Store as string for consistency
-            Featured="True" if featured else "False",  # Store as string for consistency
-            State=random.choice(states)
-        )
-        records.append(record)
-    
-    return records
+    # Uniform draws over a range via random.choices (one C loop per column)
+    # rather than one random.randint call per row
+    jdn_range = range(jdn_2000_01_01, jdn_2015_12_31 + 1)
+    
+    # Built column by column (struct of arrays) rather than one Record per row
+    return Columns(
+        count,
+        LastName=random.choices(last_names, k=count),
+        Year=random.choices(range(2000, 2016), k=count),
+        DateAdded=random.choices(jdn_range, k=count),  # Random date as JDN
+        DateSpecific=[jdn_2008_06_15 if specific else jdn
+                      for specific, jdn in zip(random.choices((True, False), (1, 9), k=count),
+                                               random.choices(jdn_range, k=count))],  # 10% have specific date
+        Active=random.choices(["True", "False"], k=count),  # Store as string for consistency
+        Featured=random.choices(["True", "False"], k=count),  # Store as string for consistency
+        State=random.choices(states, k=count)
+    )
 
 
 def test_progressive_filtering():
@@ -419,66 +717,54 @@ def test_progressive_filtering():
     print("Running Progressive Filtering Algorithm")
     print("=" * 70)
     
-    result_bitmap = process_multi_group_filter(groups, records)
+    result_bitmap = process_multi_group_filter(groups, records, verbose=True)
     
     # Display results
     print("\n" + "=" * 70)
     print("Final Results")
     print("=" * 70)
     print(f"Total matching records: {result_bitmap.count()}")
-    print(f"\nFirst 10 matching RecNos: {sorted(list(result_bitmap.bits))[:10]}")
+    print(f"\nFirst 10 matching RecNos: {result_bitmap.rec_nos()[:10]}")
     
     # Verify results by brute force
     print("\n" + "=" * 70)
     print("Verification (Brute Force)")
     print("=" * 70)
     
-    brute_force_matches = []
-    debug_count = 0
-    for record in records:
-        # Group 1: OR - using FIELD_RANGE
-        year = record.get_field("Year")
-        group1_match = (
-            record.get_field("LastName").upper().startswith("SMITH") or
-            record.get_field("LastName").upper().startswith("JONES") or
-            (2005 <= year <= 2010)  # FIELD_RANGE: Year BETWEEN 2005 AND 2010
-        )
-        
+    # Walk the raw columns side by side (no Record per row, none of the
+    # algorithm's cached views); all groups must match (AND between groups)
+    columns = zip(records.column("LastName"), records.column("Year"), records.column("Active"),
+                  records.column("Featured"), records.column("State"), records.column("DateAdded"),
+                  records.column("DateSpecific"))
+    brute_force_matches = [
+        rec_no
+        for rec_no, (last_name, year, active, featured, state, date_added, date_specific) in enumerate(columns)
+        # Group 1: OR - using FIELD_RANGE (Year BETWEEN 2005 AND 2010)
+        if (last_name.upper().startswith("SMITH") or last_name.upper().startswith("JONES") or
+            2005 <= year <= 2010)
         # Group 2: AND
-        group2_match = (
-            record.get_field("Active").upper() == "TRUE" and
-            record.get_field("Featured").upper() == "TRUE"
-        )
-        
+        and active.upper() == "TRUE" and featured.upper() == "TRUE"
         # Group 3: OR
-        group3_match = (
-            record.get_field("State") == "CA" or
-            record.get_field("State") == "NY"
-        )
-        
+        and (state == "CA" or state == "NY")
         # Group 4: AND - Date range using JDN
-        date_added = record.get_field("DateAdded")
-        group4_match = (jdn_2005_01_01 <= date_added <= jdn_2010_12_31)
-        
+        and jdn_2005_01_01 <= date_added <= jdn_2010_12_31
         # Group 5: OR - Exact date match using JDN
-        date_specific = record.get_field("DateSpecific")
-        group5_match = (date_specific == jdn_2008_06_15)
-        
-        # All groups must match (AND between groups)
-        if group1_match and group2_match and group3_match and group4_match and group5_match:
-            brute_force_matches.append(record.rec_no)
-            if debug_count < 3:
-                print(f"  Match {debug_count+1}: RecNo={record.rec_no}, LastName={record.get_field('LastName')}, "
-                      f"Year={record.get_field('Year')}, DateAdded={date_added} (JDN), "
-                      f"DateSpecific={date_specific} (JDN), Active={record.get_field('Active')}, "
-                      f"Featured={record.get_field('Featured')}, State={record.get_field('State')}")
-                debug_count += 1
+        and date_specific == jdn_2008_06_15
+    ]
+    
+    # Show the first few matches once the scan is done
+    for n, rec_no in enumerate(brute_force_matches[:3]):
+        record = records[rec_no]
+        print(f"  Match {n+1}: RecNo={record.rec_no}, LastName={record.get_field('LastName')}, "
+              f"Year={record.get_field('Year')}, DateAdded={record.get_field('DateAdded')} (JDN), "
+              f"DateSpecific={record.get_field('DateSpecific')} (JDN), Active={record.get_field('Active')}, "
+              f"Featured={record.get_field('Featured')}, State={record.get_field('State')}")
     
     print(f"Brute force matches: {len(brute_force_matches)}")
     print(f"Algorithm matches: {result_bitmap.count()}")
     
     # Compare results
-    algorithm_set = result_bitmap.bits
+    algorithm_set = set(result_bitmap.rec_nos())
     brute_force_set = set(brute_force_matches)
     
     if algorithm_set == brute_force_set: